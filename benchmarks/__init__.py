@@ -0,0 +1,6 @@
+from pathlib import Path
+
+project_root_dir = Path(__file__).parent.joinpath('..').resolve()
+benchmarks_dir = project_root_dir.joinpath('benchmarks')
+build_dir = project_root_dir.joinpath('build')
+baseline_file_path = benchmarks_dir.joinpath('baseline.json')
@@ -0,0 +1,292 @@
+import argparse
+import json
+import platform
+import sys
+import timeit
+from collections.abc import Callable, Iterator
+from io import BytesIO
+from pathlib import Path
+
+from benchmarks import baseline_file_path, build_dir
+from benchmarks.synthetic import FIRST_CODE_POINT, build_synthetic_font
+from sfnttools.font import SfntFont
+from sfnttools.directory import TABLE_RECORD_SCHEMA
+from sfnttools.subset import subset_font
+from sfnttools.utils.checksum import calculate_checksum
+from sfnttools.utils.fixed import encode_f2dot14_many, encode_fixed_many
+from sfnttools.utils.math import round_half_up, round_half_up_many
+from sfnttools.utils.stream import Stream, BufferStream, BufferedStream
+from sfnttools.woff.decoder import decode_woff
+from sfnttools.woff.encoder import WoffEncoder
+from sfnttools.woff2.decoder import decode_woff2
+from sfnttools.woff2.encoder import Woff2Encoder
+
+PRIMITIVE_COUNT = 1000
+
+SCALAR_VALUES = {
+    'uint8': 200,
+    'int8': -100,
+    'uint16': 60000,
+    'int16': -30000,
+    'uint24': 0xABCDEF,
+    'uint32': 0xDEADBEEF,
+    'int32': -0x12345678,
+    'fixed': -12.5,
+    'fword': -300,
+    'ufword': 1000,
+    'f2dot14': -0.75,
+    'long_datetime': 3786912000,
+    'tag': 'glyf',
+    'offset8': 0x12,
+    'offset16': 0x1234,
+    'offset24': 0x123456,
+    'offset32': 0x12345678,
+    'version_16dot16': (1, 0),
+    '255uint16': 1000,
+    'uint_base128': 0x12345678,
+}
+
+ARRAY_VALUES = {
+    'uint8': [200] * PRIMITIVE_COUNT,
+    'int8': [-100] * PRIMITIVE_COUNT,
+    'uint16': [60000] * PRIMITIVE_COUNT,
+    'int16': [-30000] * PRIMITIVE_COUNT,
+    'uint32': [0xDEADBEEF] * PRIMITIVE_COUNT,
+    'int32': [-0x12345678] * PRIMITIVE_COUNT,
+    'fixed': [-12.5] * PRIMITIVE_COUNT,
+    'f2dot14': [-0.75] * PRIMITIVE_COUNT,
+}
+
+MANY_VALUES = {
+    '255uint16': [(value * 37) % 0x10000 for value in range(PRIMITIVE_COUNT)],
+    'uint_base128': [(value * 0x10001) % 0x100000000 for value in range(PRIMITIVE_COUNT)],
+}
+
+CHECKSUM_SIZES = [1024, 1024 * 64, 1024 * 1024, 1024 * 1024 * 16, 1024 * 1024 * 100]
+QUICK_CHECKSUM_SIZE_LIMIT = 1024 * 1024
+
+Case = tuple[str, Callable[[], object]]
+
+
+def _new_read_stream(stream_class: type[Stream], data: bytes) -> Stream:
+    return stream_class(data) if stream_class is BufferStream else Stream(BytesIO(data))
+
+
+def _iter_scalar_cases() -> Iterator[Case]:
+    for name, value in SCALAR_VALUES.items():
+        data = Stream()
+        for _ in range(PRIMITIVE_COUNT):
+            getattr(data, f'write_{name}')(value)
+        data = data.get_value()
+
+        for stream_class in (Stream, BufferedStream):
+            def write(stream_class=stream_class, name=name, value=value):
+                writer = getattr(stream_class(), f'write_{name}')
+                for _ in range(PRIMITIVE_COUNT):
+                    writer(value)
+            yield f'{stream_class.__name__}.write_{name}', write
+
+        for stream_class in (Stream, BufferStream):
+            def read(stream_class=stream_class, name=name, data=data):
+                reader = getattr(_new_read_stream(stream_class, data), f'read_{name}')
+                for _ in range(PRIMITIVE_COUNT):
+                    reader()
+            yield f'{stream_class.__name__}.read_{name}', read
+
+
+def _iter_bulk_cases() -> Iterator[Case]:
+    for suffix, values_map in (('array', ARRAY_VALUES), ('many', MANY_VALUES)):
+        for name, values in values_map.items():
+            data = Stream()
+            getattr(data, f'write_{name}_{suffix}')(values)
+            data = data.get_value()
+
+            for stream_class in (Stream, BufferedStream):
+                def write(stream_class=stream_class, name=name, suffix=suffix, values=values):
+                    getattr(stream_class(), f'write_{name}_{suffix}')(values)
+                yield f'{stream_class.__name__}.write_{name}_{suffix}', write
+
+            for stream_class in (Stream, BufferStream):
+                def read(stream_class=stream_class, name=name, suffix=suffix, data=data):
+                    getattr(_new_read_stream(stream_class, data), f'read_{name}_{suffix}')(PRIMITIVE_COUNT)
+                yield f'{stream_class.__name__}.read_{name}_{suffix}', read
+
+
+def _iter_misc_stream_cases() -> Iterator[Case]:
+    records = [TABLE_RECORD_SCHEMA.new_record('glyf', 0xDEADBEEF, 0x1000, 0x2000)] * PRIMITIVE_COUNT
+    record_data = TABLE_RECORD_SCHEMA.pack_many(records)
+    binary_string = '01010101' * PRIMITIVE_COUNT
+    payload = bytes(PRIMITIVE_COUNT * 16)
+
+    for stream_class in (Stream, BufferedStream):
+        yield f'{stream_class.__name__}.write', lambda stream_class=stream_class: stream_class().write(payload)
+        yield f'{stream_class.__name__}.write_nulls', lambda stream_class=stream_class: stream_class().write_nulls(len(payload))
+        yield f'{stream_class.__name__}.write_record', lambda stream_class=stream_class: stream_class().write_record(TABLE_RECORD_SCHEMA, records[0])
+        yield f'{stream_class.__name__}.write_records', lambda stream_class=stream_class: stream_class().write_records(TABLE_RECORD_SCHEMA, records)
+        yield f'{stream_class.__name__}.write_binary_string', lambda stream_class=stream_class: stream_class().write_binary_string(binary_string)
+
+    for stream_class in (Stream, BufferStream):
+        yield f'{stream_class.__name__}.read', lambda stream_class=stream_class: _new_read_stream(stream_class, payload).read(len(payload))
+        yield f'{stream_class.__name__}.read_view', lambda stream_class=stream_class: _new_read_stream(stream_class, payload).read_view(len(payload))
+        yield f'{stream_class.__name__}.read_record', lambda stream_class=stream_class: _new_read_stream(stream_class, record_data).read_record(TABLE_RECORD_SCHEMA)
+        yield f'{stream_class.__name__}.read_records', lambda stream_class=stream_class: _new_read_stream(stream_class, record_data).read_records(TABLE_RECORD_SCHEMA, PRIMITIVE_COUNT)
+        yield f'{stream_class.__name__}.read_binary_string', lambda stream_class=stream_class: _new_read_stream(stream_class, payload).read_binary_string(PRIMITIVE_COUNT)
+
+
+def _iter_varint_cases() -> Iterator[Case]:
+    for name, values in MANY_VALUES.items():
+        data = Stream()
+        data.write_255uint16_many(values) if name == '255uint16' else data.write_uint_base128_many(values)
+        data = data.get_value()
+
+        def scalar_round_trip(name=name, values=values):
+            stream = Stream()
+            writer = getattr(stream, f'write_{name}')
+            for value in values:
+                writer(value)
+            reader = getattr(BufferStream(stream.get_value()), f'read_{name}')
+            for _ in values:
+                reader()
+
+        def batch_round_trip(name=name, values=values):
+            stream = BufferedStream()
+            getattr(stream, f'write_{name}_many')(values)
+            getattr(BufferStream(stream.get_value()), f'read_{name}_many')(len(values))
+
+        yield f'varint.{name}.scalar_round_trip', scalar_round_trip
+        yield f'varint.{name}.batch_round_trip', batch_round_trip
+
+
+def _iter_fixed_point_cases() -> Iterator[Case]:
+    values = [index / 7 - 50 for index in range(PRIMITIVE_COUNT)]
+    yield 'math.round_half_up', lambda: [round_half_up(value * 0x10000) for value in values]
+    yield 'math.round_half_up.n_digits', lambda: [round_half_up(value, 4) for value in values]
+    yield 'math.round_half_up_many', lambda: round_half_up_many(value * 0x10000 for value in values)
+    yield 'fixed.encode_fixed_many', lambda: encode_fixed_many(values)
+    yield 'fixed.encode_f2dot14_many', lambda: encode_f2dot14_many(value / 100 for value in values)
+
+
+def _iter_checksum_cases(quick: bool) -> Iterator[Case]:
+    for size in CHECKSUM_SIZES:
+        if quick and size > QUICK_CHECKSUM_SIZE_LIMIT:
+            continue
+        data = bytes(range(256)) * (size // 256)
+        yield f'checksum.{size // 1024}KiB', lambda data=data: calculate_checksum(data)
+
+
+def _iter_codec_cases(num_glyphs: int) -> Iterator[Case]:
+    font_data = build_synthetic_font(num_glyphs)
+    woff_encoder = WoffEncoder(max_workers=1)
+    woff2_encoder = Woff2Encoder(quality=5)
+    woff_data = woff_encoder.encode(font_data)
+    woff2_data = woff2_encoder.encode(font_data)
+    code_points = range(FIRST_CODE_POINT + 1, FIRST_CODE_POINT + min(num_glyphs, 500))
+
+    def parse_font():
+        font = SfntFont.parse(font_data)
+        for tag in ('head', 'hhea', 'maxp', 'name', 'post'):
+            font.get_table(tag)
+
+    def decode_glyphs():
+        glyf = SfntFont.parse(font_data).glyf
+        for glyph_index in range(len(glyf)):
+            glyf.get_glyph(glyph_index)
+
+    yield 'font.parse', parse_font
+    yield 'font.decode_glyphs', decode_glyphs
+    yield 'cmap.map_many', lambda: SfntFont.parse(font_data).cmap.get_index().map_many(code_points)
+    yield 'subset.500', lambda: subset_font(SfntFont.parse(font_data), code_points)
+    yield 'woff.encode', lambda: woff_encoder.encode(font_data)
+    yield 'woff.decode', lambda: decode_woff(woff_data)
+    yield 'woff2.encode', lambda: woff2_encoder.encode(font_data)
+    yield 'woff2.decode', lambda: decode_woff2(woff2_data)
+
+
+def collect_cases(quick: bool = False, num_glyphs: int = 2000) -> list[Case]:
+    return [
+        *_iter_scalar_cases(),
+        *_iter_bulk_cases(),
+        *_iter_misc_stream_cases(),
+        *_iter_varint_cases(),
+        *_iter_fixed_point_cases(),
+        *_iter_checksum_cases(quick),
+        *_iter_codec_cases(num_glyphs),
+    ]
+
+
+def find_uncovered_primitives(cases: list[Case]) -> list[str]:
+    covered = {name.split('.', 1)[1] for name, _ in cases if name.startswith(('Stream.', 'BufferStream.', 'BufferedStream.'))}
+    return sorted(name for name in dir(Stream) if name.startswith(('read_', 'write_')) and name not in covered)
+
+
+def measure(func: Callable[[], object], repeat: int, min_time: float) -> dict[str, float | int]:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(repeat, number)) / number
+    return {'seconds': best, 'number': number, 'repeat': repeat}
+
+
+def compare_results(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[tuple[str, float]]:
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['seconds'] / baseline[name]['seconds']
+        if ratio > threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark sfnttools primitives and codecs.')
+    parser.add_argument('-o', '--output', type=Path, default=build_dir.joinpath('benchmarks.json'), help='result JSON file')
+    parser.add_argument('-b', '--baseline', type=Path, default=baseline_file_path, help='baseline JSON file to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='write the results to the baseline file')
+    parser.add_argument('-t', '--threshold', type=float, default=1.25, help='slowdown ratio reported as a regression')
+    parser.add_argument('-k', '--filter', default=None, help='only run cases whose name contains this string')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.2, help='approximate seconds per repeat')
+    parser.add_argument('--quick', action='store_true', help='skip checksum sizes above 1 MiB')
+    parser.add_argument('--glyphs', type=int, default=2000, help='glyph count of the synthetic font')
+    args = parser.parse_args(argv)
+
+    cases = collect_cases(args.quick, args.glyphs)
+    uncovered = find_uncovered_primitives(cases)
+    if len(uncovered) > 0:
+        print(f'stream primitives without benchmark: {", ".join(uncovered)}', file=sys.stderr)
+        return 2
+
+    results = {}
+    for name, func in cases:
+        if args.filter is not None and args.filter not in name:
+            continue
+        results[name] = measure(func, args.repeat, args.min_time)
+        print(f'{name:<48} {results[name]["seconds"] * 1e6:>12.2f} us', flush=True)
+
+    report = {
+        'metadata': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'machine': platform.machine(),
+            'system': platform.system(),
+        },
+        'results': results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), 'utf-8')
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), 'utf-8')
+        return 0
+
+    if not args.baseline.is_file():
+        return 0
+    baseline = json.loads(args.baseline.read_text('utf-8'))['results']
+    regressions = compare_results(results, baseline, args.threshold)
+    for name, ratio in regressions:
+        print(f'regression: {name} is {ratio:.2f}x slower than baseline', file=sys.stderr)
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
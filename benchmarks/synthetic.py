@@ -0,0 +1,81 @@
+import random
+from array import array
+
+from sfnttools.directory import SFNT_VERSION_TRUETYPE
+from sfnttools.tables.cmap import build_cmap_table
+from sfnttools.tables.glyf import SimpleGlyph, CompositeGlyph, GlyfTable, dump_glyf_table
+from sfnttools.tables.head import HEAD_MAGIC_NUMBER, HEAD_TABLE_SCHEMA, dump_head_table
+from sfnttools.tables.hhea import HHEA_TABLE_SCHEMA, dump_hhea_table
+from sfnttools.tables.hmtx import HmtxTable, dump_hmtx_table
+from sfnttools.tables.maxp import MAXP_VERSION_1_0, MAXP_TABLE_SCHEMA, dump_maxp_table
+from sfnttools.tables.name import NameRecord, NameTable, dump_name_table
+from sfnttools.tables.post import POST_VERSION_3_0, POST_HEADER_SCHEMA, PostTable, dump_post_table
+from sfnttools.writer import dump_sfnt
+
+FIRST_CODE_POINT = 0x4E00
+
+
+def _build_simple_glyph(rng: random.Random) -> SimpleGlyph:
+    end_points = array('H')
+    x_coordinates = array('h')
+    y_coordinates = array('h')
+    for _ in range(rng.randint(1, 4)):
+        for _ in range(rng.randint(4, 24)):
+            x_coordinates.append(rng.randint(0, 1000))
+            y_coordinates.append(rng.randint(-200, 800))
+        end_points.append(len(x_coordinates) - 1)
+    on_curves = bytearray(rng.randint(0, 1) for _ in range(len(x_coordinates)))
+    glyph = SimpleGlyph(0, 0, 0, 0, end_points, b'', on_curves, x_coordinates, y_coordinates)
+    glyph.recalculate_bounds()
+    return glyph
+
+
+def _build_composite_glyph(rng: random.Random, num_glyphs: int) -> CompositeGlyph:
+    data = bytearray()
+    data += (0x0001 | 0x0002 | 0x0020).to_bytes(2, 'big')
+    data += rng.randrange(1, num_glyphs).to_bytes(2, 'big')
+    data += bytes(4)
+    data += (0x0001 | 0x0002).to_bytes(2, 'big')
+    data += rng.randrange(1, num_glyphs).to_bytes(2, 'big')
+    data += rng.randint(0, 300).to_bytes(2, 'big', signed=True)
+    data += rng.randint(0, 300).to_bytes(2, 'big', signed=True)
+    return CompositeGlyph(0, -200, 1300, 800, bytes(data))
+
+
+def build_synthetic_font(num_glyphs: int = 2000, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+
+    glyf = GlyfTable(b'', array('I', [0]) * (num_glyphs + 1))
+    hmtx = HmtxTable()
+    for glyph_index in range(num_glyphs):
+        if glyph_index > 0 and glyph_index % 10 == 0:
+            glyph = _build_composite_glyph(rng, num_glyphs)
+        else:
+            glyph = _build_simple_glyph(rng)
+        glyf.set_glyph(glyph_index, glyph)
+        hmtx.advance_widths.append(1000)
+        hmtx.lsbs.append(glyph.x_min)
+    glyf_data, loca_data = dump_glyf_table(glyf, 1)
+
+    head = HEAD_TABLE_SCHEMA.new_record(1, 0, 1.0, 0, HEAD_MAGIC_NUMBER, 0x000B, 1000, 0, 0, 0, -200, 1300, 800, 0, 8, 2, 1, 0)
+    hhea = HHEA_TABLE_SCHEMA.new_record(1, 0, 800, -200, 0, 1000, 0, 0, 1300, 1, 0, 0, 0, 0, 0, 0, 0, hmtx.num_h_metrics)
+    maxp = MAXP_TABLE_SCHEMA.new_record(MAXP_VERSION_1_0, num_glyphs, 96, 4, 96, 4, 2, 0, 0, 0, 0, 0, 0, 2, 1)
+    name = NameTable([NameRecord(3, 1, 0x0409, name_id, value.encode('utf-16-be')) for name_id, value in [
+        (1, 'Synthetic Sans'),
+        (2, 'Regular'),
+        (4, 'Synthetic Sans Regular'),
+        (6, 'SyntheticSans-Regular'),
+    ]])
+    post = PostTable(POST_HEADER_SCHEMA.new_record(POST_VERSION_3_0, 0, -100, 50, 0, 0, 0, 0, 0))
+
+    return dump_sfnt({
+        'cmap': build_cmap_table({FIRST_CODE_POINT + glyph_index: glyph_index for glyph_index in range(1, num_glyphs)}),
+        'glyf': glyf_data,
+        'head': dump_head_table(head),
+        'hhea': dump_hhea_table(hhea),
+        'hmtx': dump_hmtx_table(hmtx),
+        'loca': loca_data,
+        'maxp': dump_maxp_table(maxp),
+        'name': dump_name_table(name),
+        'post': dump_post_table(post),
+    }, SFNT_VERSION_TRUETYPE)
@@ -0,0 +1,5 @@
+import sys
+
+from sfnttools.cli import main
+
+sys.exit(main())
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from sfnttools.directory import SFNT_VERSIONS, OFFSET_TABLE_SCHEMA, TABLE_RECORD_SCHEMA
+from sfnttools.font import TABLE_PARSERS
+from sfnttools.utils.async_stream import AsyncStream
+
+
+class AsyncSfntFont:
+    stream: AsyncStream
+    sfnt_version: str
+    table_records: dict[str, Any]
+    _table_datas: dict[str, bytes]
+    _tables: dict[str, Any]
+
+    @staticmethod
+    async def open(stream: AsyncStream, offset: int = 0) -> AsyncSfntFont:
+        await stream.seek(offset)
+        offset_table = await stream.read_record(OFFSET_TABLE_SCHEMA)
+        if offset_table.sfnt_version not in SFNT_VERSIONS:
+            raise ValueError(f'unknown sfnt version: {offset_table.sfnt_version!r}')
+        table_records = await stream.read_records(TABLE_RECORD_SCHEMA, offset_table.num_tables)
+        return AsyncSfntFont(stream, offset_table.sfnt_version, table_records)
+
+    def __init__(self, stream: AsyncStream, sfnt_version: str, table_records: Iterable[Any]):
+        self.stream = stream
+        self.sfnt_version = sfnt_version
+        self.table_records = {table_record.tag: table_record for table_record in table_records}
+        self._table_datas = {}
+        self._tables = {}
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self.table_records
+
+    @property
+    def tags(self) -> list[str]:
+        return sorted(self.table_records)
+
+    async def get_table_data(self, tag: str) -> bytes:
+        if tag not in self._table_datas:
+            table_record = self.table_records[tag]
+            await self.stream.seek(table_record.offset)
+            self._table_datas[tag] = await self.stream.readexactly(table_record.length)
+        return self._table_datas[tag]
+
+    async def get_table_datas(self, tags: Iterable[str]) -> dict[str, bytes]:
+        tags = list(tags)
+        for tag in sorted(set(tags), key=lambda tag: self.table_records[tag].offset):
+            await self.get_table_data(tag)
+        return {tag: self._table_datas[tag] for tag in tags}
+
+    async def get_table(self, tag: str) -> Any:
+        if tag not in self._tables:
+            if tag not in TABLE_PARSERS:
+                raise ValueError(f'unsupported table: {tag!r}')
+            self._tables[tag] = TABLE_PARSERS[tag](memoryview(await self.get_table_data(tag)))
+        return self._tables[tag]
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from sfnttools.font import SfntFont
+from sfnttools.subset import subset_font
+from sfnttools.woff.encoder import WoffEncoder
+from sfnttools.woff2.encoder import Woff2Encoder
+
+OUTPUT_FORMATS = ('ttf', 'woff', 'woff2')
+
+
+def calculate_font_hash(font: SfntFont) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(font.sfnt_version.encode('latin-1'))
+    for tag in font.tags:
+        data = font.get_table_data(tag)
+        hasher.update(tag.encode('latin-1'))
+        hasher.update(len(data).to_bytes(4, 'big', signed=False))
+        hasher.update(data)
+    return hasher.hexdigest()
+
+
+def normalize_code_points(code_points: Iterable[int]) -> list[tuple[int, int]]:
+    ranges = []
+    for code_point in sorted(set(code_points)):
+        if len(ranges) > 0 and ranges[-1][1] == code_point - 1:
+            ranges[-1][1] = code_point
+        else:
+            ranges.append([code_point, code_point])
+    return [(start, end) for start, end in ranges]
+
+
+def make_subset_key(font_hash: str, code_points: Iterable[int], output_format: str, glyph_indices: Iterable[int] = ()) -> str:
+    hasher = hashlib.sha256()
+    hasher.update(font_hash.encode('ascii'))
+    hasher.update(output_format.encode('ascii'))
+    for start, end in normalize_code_points(code_points):
+        hasher.update(b'u%x-%x' % (start, end))
+    for start, end in normalize_code_points(glyph_indices):
+        hasher.update(b'g%x-%x' % (start, end))
+    return hasher.hexdigest()
+
+
+class SubsetCache:
+    max_size: int
+    cache_dir: Path | None
+    woff_encoder: WoffEncoder
+    woff2_encoder: Woff2Encoder
+    size: int
+    hits: int
+    misses: int
+    _entries: OrderedDict[str, bytes]
+    _font_hashes: weakref.WeakKeyDictionary[SfntFont, str]
+    _lock: threading.Lock
+
+    def __init__(
+            self,
+            max_size: int = 1024 * 1024 * 64,
+            cache_dir: str | os.PathLike[str] | None = None,
+            woff_encoder: WoffEncoder | None = None,
+            woff2_encoder: Woff2Encoder | None = None,
+    ):
+        self.max_size = max_size
+        self.cache_dir = None if cache_dir is None else Path(cache_dir)
+        self.woff_encoder = WoffEncoder() if woff_encoder is None else woff_encoder
+        self.woff2_encoder = Woff2Encoder() if woff2_encoder is None else woff2_encoder
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._font_hashes = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def _get_file_path(self, key: str) -> Path:
+        return self.cache_dir.joinpath(key[:2], key)
+
+    def _store_in_memory(self, key: str, data: bytes):
+        with self._lock:
+            if key in self._entries:
+                self.size -= len(self._entries.pop(key))
+            if len(data) > self.max_size:
+                return
+            self._entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_size:
+                _, evicted_data = self._entries.popitem(last=False)
+                self.size -= len(evicted_data)
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        if self.cache_dir is not None:
+            file_path = self._get_file_path(key)
+            if file_path.is_file():
+                data = file_path.read_bytes()
+                self._store_in_memory(key, data)
+                with self._lock:
+                    self.hits += 1
+                return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, data: bytes):
+        self._store_in_memory(key, data)
+        if self.cache_dir is not None:
+            file_path = self._get_file_path(key)
+            file_path.parent.mkdir(exist_ok=True)
+            fd, temp_file_path = tempfile.mkstemp(dir=file_path.parent)
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    file.write(data)
+                os.replace(temp_file_path, file_path)
+            except BaseException:
+                os.unlink(temp_file_path)
+                raise
+
+    def get_or_create(self, key: str, factory: Callable[[], bytes]) -> bytes:
+        data = self.get(key)
+        if data is None:
+            data = factory()
+            self.put(key, data)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def get_font_hash(self, font: SfntFont) -> str:
+        font_hash = self._font_hashes.get(font)
+        if font_hash is None:
+            font_hash = calculate_font_hash(font)
+            self._font_hashes[font] = font_hash
+        return font_hash
+
+    def _get_format_key(self, output_format: str) -> str:
+        if output_format == 'woff':
+            return f'woff:{self.woff_encoder.level}'
+        elif output_format == 'woff2':
+            return f'woff2:{self.woff2_encoder.quality}:{self.woff2_encoder.window_bits}:{int(self.woff2_encoder.transform_glyf)}'
+        return output_format
+
+    def _build_subset(self, font: SfntFont, code_points: list[int], output_format: str, glyph_indices: list[int]) -> bytes:
+        data = subset_font(font, code_points, glyph_indices)
+        if output_format == 'woff':
+            return self.woff_encoder.encode(data)
+        elif output_format == 'woff2':
+            return self.woff2_encoder.encode(data)
+        return data
+
+    def get_subset(self, font: SfntFont, code_points: Iterable[int], output_format: str = 'woff2', glyph_indices: Iterable[int] = ()) -> bytes:
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f'unknown output format: {output_format!r}')
+        code_points = list(code_points)
+        glyph_indices = list(glyph_indices)
+        key = make_subset_key(self.get_font_hash(font), code_points, self._get_format_key(output_format), glyph_indices)
+        return self.get_or_create(key, lambda: self._build_subset(font, code_points, output_format, glyph_indices))
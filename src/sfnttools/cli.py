@@ -0,0 +1,248 @@
+import argparse
+import json
+import os
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from sfnttools.collection import TTC_TAG
+from sfnttools.directory import HEAD_CHECKSUM_ADJUSTMENT_OFFSET
+from sfnttools.font import SfntFont
+from sfnttools.utils.checksum import calculate_checksum
+from sfnttools.utils.stream import BufferStream
+from sfnttools.validator import validate_sfnt
+from sfnttools.woff.decoder import WoffDecoder, decode_woff
+from sfnttools.woff.directory import WOFF_SIGNATURE
+from sfnttools.woff.encoder import WoffEncoder
+from sfnttools.woff2.decoder import Woff2Decoder, decode_woff2
+from sfnttools.woff2.directory import WOFF2_SIGNATURE
+from sfnttools.woff2.encoder import Woff2Encoder
+
+FONT_FILE_SUFFIXES = {'.ttf', '.otf', '.woff', '.woff2'}
+
+OUTPUT_FORMAT_SUFFIXES = {
+    'ttf': '.ttf',
+    'woff': '.woff',
+    'woff2': '.woff2',
+}
+
+
+def detect_font_format(data: bytes | bytearray | memoryview) -> str:
+    signature = bytes(data[:4]).decode('latin-1')
+    if signature == WOFF_SIGNATURE:
+        return 'woff'
+    elif signature == WOFF2_SIGNATURE:
+        return 'woff2'
+    elif signature == TTC_TAG:
+        return 'ttc'
+    return 'sfnt'
+
+
+def find_font_files(paths: Iterable[str | os.PathLike[str]]) -> list[tuple[Path, Path]]:
+    file_paths = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            for file_dir, _, file_names in os.walk(path):
+                for file_name in sorted(file_names):
+                    file_path = Path(file_dir, file_name)
+                    if file_path.suffix.lower() in FONT_FILE_SUFFIXES:
+                        file_paths.append((file_path, file_path.relative_to(path)))
+        else:
+            file_paths.append((path, Path(path.name)))
+    return file_paths
+
+
+def validate_font_data(data: bytes | bytearray | memoryview) -> list[str]:
+    font_format = detect_font_format(data)
+    if font_format == 'ttc':
+        raise ValueError('font collections are not supported')
+    elif font_format == 'woff2':
+        decode_woff2(data)
+        return []
+
+    elif font_format == 'woff':
+        problems = []
+        decoder = WoffDecoder(BufferStream(data))
+        for tag, table_entry in decoder.table_entries.items():
+            table_data = decoder.get_table_data(tag)
+            if tag == 'head':
+                table_data = bytearray(table_data)
+                table_data[HEAD_CHECKSUM_ADJUSTMENT_OFFSET:HEAD_CHECKSUM_ADJUSTMENT_OFFSET + 4] = bytes(4)
+            checksum = calculate_checksum(table_data)
+            if checksum != table_entry.orig_checksum:
+                problems.append(f'{tag!r} checksum mismatch: expected {table_entry.orig_checksum:08X}, got {checksum:08X}')
+        return problems
+
+    return validate_sfnt(data)
+
+
+def load_sfnt_data(data: bytes | bytearray | memoryview) -> bytes | bytearray | memoryview:
+    font_format = detect_font_format(data)
+    if font_format == 'woff':
+        return decode_woff(data)
+    elif font_format == 'woff2':
+        return decode_woff2(data)
+    elif font_format == 'ttc':
+        raise ValueError('font collections are not supported')
+    return data
+
+
+def convert_font_data(data: bytes | bytearray | memoryview, output_format: str) -> bytes:
+    data = load_sfnt_data(data)
+    if output_format == 'woff':
+        return WoffEncoder().encode(data)
+    elif output_format == 'woff2':
+        return Woff2Encoder().encode(data)
+    return bytes(data)
+
+
+def dump_font_data(data: bytes | bytearray | memoryview) -> dict[str, Any]:
+    font_format = detect_font_format(data)
+    if font_format == 'woff':
+        decoder = WoffDecoder(BufferStream(data))
+        tables = [{
+            'tag': table_entry.tag,
+            'checksum': table_entry.orig_checksum,
+            'offset': table_entry.offset,
+            'length': table_entry.orig_length,
+            'compressed_length': table_entry.comp_length,
+        } for table_entry in decoder.table_entries.values()]
+        return {'format': font_format, 'flavor': decoder.header.flavor, 'tables': tables}
+    elif font_format == 'woff2':
+        decoder = Woff2Decoder(BufferStream(data))
+        tables = [{
+            'tag': table_entry.tag,
+            'length': table_entry.orig_length,
+            'transform_version': table_entry.transform_version,
+            'transform_length': table_entry.transform_length,
+        } for table_entry in decoder.table_entries]
+        return {'format': font_format, 'flavor': decoder.header.flavor, 'tables': tables}
+    elif font_format == 'ttc':
+        raise ValueError('font collections are not supported')
+
+    font = SfntFont.parse(data)
+    tables = [{
+        'tag': table_record.tag,
+        'checksum': table_record.checksum,
+        'offset': table_record.offset,
+        'length': table_record.length,
+    } for table_record in font.table_records.values()]
+    return {'format': font_format, 'flavor': font.sfnt_version, 'tables': tables}
+
+
+def format_dump(dump: dict[str, Any]) -> str:
+    lines = [f'format={dump["format"]} flavor={dump["flavor"]!r} num_tables={len(dump["tables"])}']
+    for table in dump['tables']:
+        fields = ' '.join(f'{key}={value:08X}' if key == 'checksum' else f'{key}={value}' for key, value in table.items() if key != 'tag')
+        lines.append(f'  {table["tag"]!r} {fields}')
+    return '\n'.join(lines)
+
+
+def _read_file(file_path: Path) -> bytes:
+    with open(file_path, 'rb') as file:
+        return file.read()
+
+
+def validate_file(file_path: Path) -> tuple[bool, str]:
+    with BufferStream.from_file(file_path) as stream:
+        problems = validate_font_data(stream.buffer)
+    if len(problems) > 0:
+        return False, '; '.join(problems)
+    return True, ''
+
+
+def convert_file(file_path: Path, output_file_path: Path, output_format: str) -> tuple[bool, str]:
+    data = convert_font_data(_read_file(file_path), output_format)
+    output_file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file_path, 'wb') as file:
+        file.write(data)
+    return True, str(output_file_path)
+
+
+def dump_file(file_path: Path, as_json: bool) -> tuple[bool, str]:
+    dump = dump_font_data(_read_file(file_path))
+    if as_json:
+        return True, json.dumps({'file': str(file_path), **dump})
+    return True, f'{file_path}\n{format_dump(dump)}'
+
+
+def _run_job(job: Callable[[], tuple[bool, str]]) -> tuple[bool, str]:
+    try:
+        return job()
+    except Exception as e:
+        return False, f'{type(e).__name__}: {e}'
+
+
+def run_jobs(jobs: Iterable[tuple[Path, Callable[[], tuple[bool, str]]]], max_workers: int | None = None) -> Iterator[tuple[Path, bool, str]]:
+    jobs = sorted(jobs, key=lambda job: job[0].stat().st_size if job[0].is_file() else 0, reverse=True)
+    if max_workers == 1 or len(jobs) <= 1:
+        for file_path, job in jobs:
+            yield file_path, *_run_job(job)
+        return
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = {executor.submit(_run_job, job): file_path for file_path, job in jobs}
+        for future in as_completed(futures):
+            yield futures[future], *future.result()
+
+
+def _build_jobs(args: argparse.Namespace) -> list[tuple[Path, Callable[[], tuple[bool, str]]]]:
+    jobs = []
+    for file_path, relative_path in find_font_files(args.paths):
+        if args.command == 'validate':
+            job = partial(validate_file, file_path)
+        elif args.command == 'convert':
+            if args.output_dir is None:
+                output_file_path = file_path.with_suffix(OUTPUT_FORMAT_SUFFIXES[args.format])
+            else:
+                output_file_path = args.output_dir.joinpath(relative_path).with_suffix(OUTPUT_FORMAT_SUFFIXES[args.format])
+            if output_file_path.resolve() == file_path.resolve():
+                continue
+            job = partial(convert_file, file_path, output_file_path, args.format)
+        else:
+            job = partial(dump_file, file_path, args.json)
+        jobs.append((file_path, job))
+    return jobs
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='sfnttools', description='Batch processing for SFNT, WOFF and WOFF2 fonts.')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='number of worker processes, 1 disables the process pool')
+    parser.add_argument('-q', '--quiet', action='store_true', help='do not report progress')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    validate_parser = subparsers.add_parser('validate', help='verify table checksums and checkSumAdjustment')
+    validate_parser.add_argument('paths', nargs='+', type=Path)
+
+    convert_parser = subparsers.add_parser('convert', help='convert between TTF, WOFF and WOFF2')
+    convert_parser.add_argument('paths', nargs='+', type=Path)
+    convert_parser.add_argument('-f', '--format', choices=sorted(OUTPUT_FORMAT_SUFFIXES), required=True)
+    convert_parser.add_argument('-o', '--output-dir', type=Path, default=None, help='output directory, defaults to next to each input')
+
+    dump_parser = subparsers.add_parser('dump', help='print table directories')
+    dump_parser.add_argument('paths', nargs='+', type=Path)
+    dump_parser.add_argument('--json', action='store_true', help='print one JSON object per line')
+
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    jobs = _build_jobs(args)
+    failures = 0
+    for index, (file_path, ok, message) in enumerate(run_jobs(jobs, args.jobs), 1):
+        if not ok:
+            failures += 1
+        if args.command == 'dump' and ok:
+            print(message, flush=True)
+        if not args.quiet or not ok:
+            detail = '' if message == '' or (args.command == 'dump' and ok) else f': {message}'
+            print(f'[{index}/{len(jobs)}] {"ok" if ok else "FAILED"} {file_path}{detail}', file=sys.stderr, flush=True)
+    return 0 if failures == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Mapping, Sequence
+from io import BytesIO
+from mmap import mmap
+from typing import Any, BinaryIO
+
+from sfnttools.directory import OFFSET_TABLE_SCHEMA, TABLE_RECORD_SCHEMA, HEAD_CHECKSUM_ADJUSTMENT_OFFSET, new_offset_table
+from sfnttools.font import SfntFont
+from sfnttools.utils.checksum import calculate_checksum, calculate_checksum_adjustment
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+TTC_TAG = 'ttcf'
+
+TTC_HEADER_SCHEMA = RecordSchema('TtcHeader', [
+    ('ttc_tag', 'tag'),
+    ('major_version', 'uint16'),
+    ('minor_version', 'uint16'),
+    ('num_fonts', 'uint32'),
+])
+
+
+class SfntCollection:
+    stream: BufferStream
+    header: Any
+    table_offsets: list[int]
+    fonts: list[SfntFont]
+    table_records: list[Any]
+
+    @staticmethod
+    def load(file_path: str | os.PathLike[str]) -> SfntCollection:
+        return SfntCollection(BufferStream.from_file(file_path))
+
+    @staticmethod
+    def parse(data: bytes | bytearray | memoryview | mmap) -> SfntCollection:
+        return SfntCollection(BufferStream(data))
+
+    def __init__(self, stream: BufferStream):
+        header = stream.read_record(TTC_HEADER_SCHEMA)
+        if header.ttc_tag != TTC_TAG:
+            raise ValueError('bad font collection tag')
+        if header.major_version not in (1, 2):
+            raise ValueError(f'unsupported font collection version: {header.major_version}.{header.minor_version}')
+        self.stream = stream
+        self.header = header
+        self.table_offsets = stream.read_uint32_array(header.num_fonts)
+
+        self.fonts = []
+        shared_table_records = {}
+        for table_offset in self.table_offsets:
+            font = SfntFont(stream, table_offset)
+            for tag, table_record in font.table_records.items():
+                key = table_record.offset, table_record.length, table_record.checksum
+                font.table_records[tag] = shared_table_records.setdefault(key, table_record)
+            self.fonts.append(font)
+        self.table_records = list(shared_table_records.values())
+
+    def __enter__(self) -> SfntCollection:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.fonts)
+
+    def __getitem__(self, index: int) -> SfntFont:
+        return self.fonts[index]
+
+    def close(self):
+        for font in self.fonts:
+            font._tables.clear()
+        self.stream.close()
+
+
+def write_collection(target: BinaryIO, fonts: Sequence[tuple[str, Mapping[str, bytes | bytearray | memoryview]]]):
+    unique_tables = {}
+    font_table_keys = []
+    for _, tables in fonts:
+        table_keys = {}
+        for tag in sorted(tables):
+            data = tables[tag]
+            if tag == 'head':
+                data = bytearray(data)
+                data[HEAD_CHECKSUM_ADJUSTMENT_OFFSET:HEAD_CHECKSUM_ADJUSTMENT_OFFSET + 4] = bytes(4)
+            key = hashlib.sha256(data).digest(), len(data)
+            if key not in unique_tables:
+                unique_tables[key] = data
+            table_keys[tag] = key
+        font_table_keys.append(table_keys)
+
+    stream = BufferedStream(target)
+    stream.write_record(TTC_HEADER_SCHEMA, TTC_HEADER_SCHEMA.new_record(TTC_TAG, 1, 0, len(fonts)))
+    offset = stream.tell() + 4 * len(fonts)
+    table_offsets = []
+    for table_keys in font_table_keys:
+        table_offsets.append(offset)
+        offset += OFFSET_TABLE_SCHEMA.size + TABLE_RECORD_SCHEMA.size * len(table_keys)
+    stream.write_uint32_array(table_offsets)
+    stream.reserve(offset - stream.tell())
+
+    table_layouts = {}
+    for key, data in unique_tables.items():
+        table_layouts[key] = calculate_checksum(data), stream.tell(), len(data)
+        stream.write(data)
+        stream.align_to_4_byte_with_nulls()
+
+    head_usages = {}
+    for table_keys in font_table_keys:
+        if 'head' in table_keys:
+            head_usages[table_keys['head']] = head_usages.get(table_keys['head'], 0) + 1
+
+    for (sfnt_version, _), table_keys, table_offset in zip(fonts, font_table_keys, table_offsets):
+        font_table_records = []
+        for tag, key in table_keys.items():
+            font_table_records.append(TABLE_RECORD_SCHEMA.new_record(tag, *table_layouts[key]))
+        header_data = OFFSET_TABLE_SCHEMA.pack(new_offset_table(sfnt_version, len(table_keys))) + TABLE_RECORD_SCHEMA.pack_many(font_table_records)
+        stream.patch(table_offset, header_data)
+
+        # A head table shared by several fonts cannot carry a valid adjustment for each of them, so it is left zeroed.
+        if 'head' in table_keys and head_usages[table_keys['head']] == 1:
+            checksum_adjustment = calculate_checksum_adjustment([
+                calculate_checksum(header_data),
+                *(table_record.checksum for table_record in font_table_records),
+            ])
+            stream.patch_uint32(table_layouts[table_keys['head']][1] + HEAD_CHECKSUM_ADJUSTMENT_OFFSET, checksum_adjustment)
+    stream.flush()
+
+
+def dump_collection(fonts: Sequence[tuple[str, Mapping[str, bytes | bytearray | memoryview]]]) -> bytes:
+    target = BytesIO()
+    write_collection(target, fonts)
+    return target.getvalue()
@@ -0,0 +1,50 @@
+from typing import Any
+
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import Stream
+
+SFNT_VERSION_TRUETYPE = '\x00\x01\x00\x00'
+SFNT_VERSION_OPENTYPE = 'OTTO'
+SFNT_VERSION_APPLE_TRUETYPE = 'true'
+SFNT_VERSION_POSTSCRIPT = 'typ1'
+
+SFNT_VERSIONS = {SFNT_VERSION_TRUETYPE, SFNT_VERSION_OPENTYPE, SFNT_VERSION_APPLE_TRUETYPE, SFNT_VERSION_POSTSCRIPT}
+
+OFFSET_TABLE_SCHEMA = RecordSchema('OffsetTable', [
+    ('sfnt_version', 'tag'),
+    ('num_tables', 'uint16'),
+    ('search_range', 'uint16'),
+    ('entry_selector', 'uint16'),
+    ('range_shift', 'uint16'),
+])
+
+TABLE_RECORD_SCHEMA = RecordSchema('TableRecord', [
+    ('tag', 'tag'),
+    ('checksum', 'uint32'),
+    ('offset', 'offset32'),
+    ('length', 'uint32'),
+])
+
+HEAD_CHECKSUM_ADJUSTMENT_OFFSET = 8
+
+
+def calculate_search_params(count: int, unit_size: int = 16) -> tuple[int, int, int]:
+    if count == 0:
+        return 0, 0, 0
+    entry_selector = count.bit_length() - 1
+    search_range = (1 << entry_selector) * unit_size
+    range_shift = count * unit_size - search_range
+    return search_range, entry_selector, range_shift
+
+
+def new_offset_table(sfnt_version: str, num_tables: int) -> Any:
+    search_range, entry_selector, range_shift = calculate_search_params(num_tables)
+    return OFFSET_TABLE_SCHEMA.new_record(sfnt_version, num_tables, search_range, entry_selector, range_shift)
+
+
+def read_table_directory(stream: Stream) -> tuple[Any, list[Any]]:
+    offset_table = stream.read_record(OFFSET_TABLE_SCHEMA)
+    if offset_table.sfnt_version not in SFNT_VERSIONS:
+        raise ValueError(f'unknown sfnt version: {offset_table.sfnt_version!r}')
+    table_records = stream.read_records(TABLE_RECORD_SCHEMA, offset_table.num_tables)
+    return offset_table, table_records
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from mmap import mmap
+from typing import Any
+
+from sfnttools.directory import read_table_directory
+from sfnttools.tables.avar import AvarTable, parse_avar_table
+from sfnttools.tables.cmap import CmapTable, parse_cmap_table
+from sfnttools.tables.fvar import FvarTable, parse_fvar_table
+from sfnttools.tables.glyf import GlyfTable, parse_glyf_table
+from sfnttools.tables.gvar import GvarTable, parse_gvar_table
+from sfnttools.tables.head import parse_head_table
+from sfnttools.tables.hhea import parse_hhea_table
+from sfnttools.tables.maxp import parse_maxp_table
+from sfnttools.tables.name import NameTable, parse_name_table
+from sfnttools.tables.os2 import parse_os2_table
+from sfnttools.tables.post import PostTable, parse_post_table
+from sfnttools.utils.profiler import profile_table
+from sfnttools.utils.stream import BufferStream
+
+TABLE_PARSERS: dict[str, Callable[[memoryview], Any]] = {
+    'avar': parse_avar_table,
+    'cmap': parse_cmap_table,
+    'fvar': parse_fvar_table,
+    'gvar': parse_gvar_table,
+    'head': parse_head_table,
+    'hhea': parse_hhea_table,
+    'maxp': parse_maxp_table,
+    'name': parse_name_table,
+    'OS/2': parse_os2_table,
+    'post': parse_post_table,
+}
+
+
+class SfntFont:
+    stream: BufferStream
+    sfnt_version: str
+    table_records: dict[str, Any]
+    _tables: dict[str, Any]
+
+    @staticmethod
+    def load(file_path: str | os.PathLike[str]) -> SfntFont:
+        return SfntFont(BufferStream.from_file(file_path))
+
+    @staticmethod
+    def parse(data: bytes | bytearray | memoryview | mmap) -> SfntFont:
+        return SfntFont(BufferStream(data))
+
+    def __init__(self, stream: BufferStream, offset: int = 0):
+        stream.seek(offset)
+        offset_table, table_records = read_table_directory(stream)
+        self.stream = stream
+        self.sfnt_version = offset_table.sfnt_version
+        self.table_records = {table_record.tag: table_record for table_record in table_records}
+        self._tables = {}
+
+    def __enter__(self) -> SfntFont:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self.table_records
+
+    def close(self):
+        self._tables.clear()
+        self.stream.close()
+
+    @property
+    def tags(self) -> list[str]:
+        return sorted(self.table_records)
+
+    def get_table_data(self, tag: str) -> memoryview:
+        table_record = self.table_records[tag]
+        return self.stream.slice(table_record.offset, table_record.length).buffer
+
+    def get_table(self, tag: str) -> Any:
+        if tag not in self._tables:
+            if tag not in TABLE_PARSERS:
+                raise ValueError(f'unsupported table: {tag!r}')
+            data = self.get_table_data(tag)
+            with profile_table(tag, len(data)):
+                self._tables[tag] = TABLE_PARSERS[tag](data)
+        return self._tables[tag]
+
+    def _get_table_or_none(self, tag: str) -> Any:
+        return self.get_table(tag) if tag in self.table_records else None
+
+    @property
+    def avar(self) -> AvarTable | None:
+        return self._get_table_or_none('avar')
+
+    @property
+    def cmap(self) -> CmapTable | None:
+        return self._get_table_or_none('cmap')
+
+    @property
+    def fvar(self) -> FvarTable | None:
+        return self._get_table_or_none('fvar')
+
+    @property
+    def glyf(self) -> GlyfTable | None:
+        if 'glyf' not in self._tables:
+            if 'glyf' not in self.table_records or 'loca' not in self.table_records:
+                return None
+            head = self.head
+            maxp = self.maxp
+            data = self.get_table_data('glyf')
+            with profile_table('glyf', len(data)):
+                self._tables['glyf'] = parse_glyf_table(data, self.get_table_data('loca'), head.index_to_loc_format, maxp.num_glyphs)
+        return self._tables['glyf']
+
+    @property
+    def gvar(self) -> GvarTable | None:
+        return self._get_table_or_none('gvar')
+
+    @property
+    def head(self) -> Any:
+        return self._get_table_or_none('head')
+
+    @property
+    def hhea(self) -> Any:
+        return self._get_table_or_none('hhea')
+
+    @property
+    def maxp(self) -> Any:
+        return self._get_table_or_none('maxp')
+
+    @property
+    def name(self) -> NameTable | None:
+        return self._get_table_or_none('name')
+
+    @property
+    def os2(self) -> Any:
+        return self._get_table_or_none('OS/2')
+
+    @property
+    def post(self) -> PostTable | None:
+        return self._get_table_or_none('post')
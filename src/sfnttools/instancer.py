@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import dataclasses
+import warnings
+from array import array
+from collections.abc import Mapping, Sequence
+from itertools import chain, compress
+from operator import add
+from typing import Any
+
+from sfnttools.font import SfntFont
+from sfnttools.tables.avar import AvarTable
+from sfnttools.tables.fvar import FvarTable
+from sfnttools.tables.glyf import (
+    COMPONENT_FLAG_ARG_1_AND_2_ARE_WORDS,
+    COMPONENT_FLAG_ARGS_ARE_XY_VALUES,
+    COMPONENT_FLAG_MORE_COMPONENTS,
+    COMPONENT_FLAG_WE_HAVE_A_SCALE,
+    COMPONENT_FLAG_WE_HAVE_A_TWO_BY_TWO,
+    COMPONENT_FLAG_WE_HAVE_AN_X_AND_Y_SCALE,
+    GLYPH_HEADER_SCHEMA,
+    CompositeGlyph,
+    GlyfTable,
+    SimpleGlyph,
+    dump_glyf_table,
+    read_loca_offsets,
+)
+from sfnttools.tables.gvar import GvarTable
+from sfnttools.tables.head import dump_head_table
+from sfnttools.tables.hhea import dump_hhea_table
+from sfnttools.tables.hmtx import HmtxTable, parse_hmtx_table, dump_hmtx_table
+from sfnttools.tables.os2 import dump_os2_table
+from sfnttools.utils.fixed import decode_f2dot14_many, encode_f2dot14_many
+from sfnttools.utils.math import round_half_up_integer, round_half_up_many
+from sfnttools.utils.stream import BufferStream, BufferedStream
+from sfnttools.writer import dump_sfnt
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+VARIATION_TAGS = {'avar', 'cvar', 'fvar', 'gvar', 'HVAR', 'MVAR', 'STAT', 'VVAR'}
+
+PHANTOM_POINT_COUNT = 4
+
+GDEF_ITEM_VAR_STORE_OFFSET = 14
+FEATURE_VARIATIONS_OFFSET = 10
+
+_MAX_COMPONENT_DEPTH = 64
+
+
+def normalize_location(fvar: FvarTable, avar: AvarTable | None, location: Mapping[str, float]) -> list[float]:
+    coordinates = fvar.normalize_location(location)
+    if avar is not None:
+        coordinates = avar.map_coordinates(coordinates)
+    return list(decode_f2dot14_many(encode_f2dot14_many(coordinates)))
+
+
+def _new_point_array(values: Sequence[float]) -> Any:
+    if numpy is not None:
+        return numpy.array(values, dtype=numpy.float64)
+    return array('d', values)
+
+
+def _add_scaled_deltas(target: Any, deltas: Any, scalar: float) -> Any:
+    if numpy is not None:
+        target += numpy.asarray(deltas, dtype=numpy.float64) * scalar
+        return target
+    if scalar == 1.0:
+        return array('d', map(add, target, deltas))
+    return array('d', map(add, target, map(scalar.__mul__, deltas)))
+
+
+def _scatter_deltas(point_numbers: Sequence[int], deltas: Sequence[int], point_count: int) -> Any:
+    if numpy is not None:
+        indices = numpy.asarray(point_numbers, dtype=numpy.intp)
+        values = numpy.asarray(deltas, dtype=numpy.float64)
+        mask = indices < point_count
+        result = numpy.zeros(point_count, dtype=numpy.float64)
+        result[indices[mask]] = values[mask]
+        return result
+    result = array('d', bytes(8 * point_count))
+    for point_number, delta in zip(point_numbers, deltas):
+        if point_number < point_count:
+            result[point_number] = delta
+    return result
+
+
+def _interpolate_gap(coordinates: Any, deltas: Any, first: int, last: int, gap: list[int]):
+    c1, c2 = coordinates[first], coordinates[last]
+    d1, d2 = deltas[first], deltas[last]
+    if c1 == c2:
+        value = d1 if d1 == d2 else 0.0
+        for index in gap:
+            deltas[index] = value
+        return
+    if c1 > c2:
+        c1, c2 = c2, c1
+        d1, d2 = d2, d1
+    if numpy is not None:
+        deltas[gap] = numpy.interp(coordinates[gap], (c1, c2), (d1, d2))
+        return
+    scale = (d2 - d1) / (c2 - c1)
+    for index in gap:
+        coordinate = coordinates[index]
+        if coordinate <= c1:
+            deltas[index] = d1
+        elif coordinate >= c2:
+            deltas[index] = d2
+        else:
+            deltas[index] = d1 + (coordinate - c1) * scale
+
+
+def interpolate_untouched_deltas(coordinates: Any, end_points: Sequence[int], point_numbers: Sequence[int], deltas: Sequence[int], point_count: int) -> Any:
+    result = _scatter_deltas(point_numbers, deltas, point_count)
+    touched = bytearray(point_count)
+    for point_number in point_numbers:
+        if point_number < point_count:
+            touched[point_number] = 1
+    start = 0
+    for end in end_points:
+        touched_indices = list(compress(range(start, end + 1), touched[start:end + 1]))
+        if 0 < len(touched_indices) < end + 1 - start:
+            for first, last in zip(touched_indices, touched_indices[1:] + touched_indices[:1]):
+                if last > first:
+                    gap = list(range(first + 1, last))
+                else:
+                    gap = list(chain(range(first + 1, end + 1), range(start, last)))
+                if len(gap) > 0:
+                    _interpolate_gap(coordinates, result, first, last, gap)
+        start = end + 1
+    return result
+
+
+def _decode_components(data: bytes) -> tuple[list[list[Any]], bytes]:
+    stream = BufferStream(data)
+    components = []
+    while True:
+        flags = stream.read_uint16()
+        glyph_index = stream.read_uint16()
+        if flags & COMPONENT_FLAG_ARG_1_AND_2_ARE_WORDS:
+            if flags & COMPONENT_FLAG_ARGS_ARE_XY_VALUES:
+                arg1, arg2 = stream.read_int16(), stream.read_int16()
+            else:
+                arg1, arg2 = stream.read_uint16(), stream.read_uint16()
+        elif flags & COMPONENT_FLAG_ARGS_ARE_XY_VALUES:
+            arg1, arg2 = stream.read_int8(), stream.read_int8()
+        else:
+            arg1, arg2 = stream.read_uint8(), stream.read_uint8()
+        if flags & COMPONENT_FLAG_WE_HAVE_A_SCALE:
+            scale = stream.read_f2dot14()
+            transform = (scale, 0.0, 0.0, scale)
+        elif flags & COMPONENT_FLAG_WE_HAVE_AN_X_AND_Y_SCALE:
+            x_scale = stream.read_f2dot14()
+            y_scale = stream.read_f2dot14()
+            transform = (x_scale, 0.0, 0.0, y_scale)
+        elif flags & COMPONENT_FLAG_WE_HAVE_A_TWO_BY_TWO:
+            transform = stream.read_f2dot14_array(4, as_tuple=True)
+        else:
+            transform = (1.0, 0.0, 0.0, 1.0)
+        components.append([flags, glyph_index, arg1, arg2, transform])
+        if not flags & COMPONENT_FLAG_MORE_COMPONENTS:
+            break
+    return components, bytes(data[stream.tell():])
+
+
+def _encode_components(components: list[list[Any]], instructions: bytes) -> bytes:
+    stream = BufferedStream()
+    for flags, glyph_index, arg1, arg2, transform in components:
+        if flags & COMPONENT_FLAG_ARGS_ARE_XY_VALUES:
+            words = not (-0x80 <= arg1 <= 0x7F and -0x80 <= arg2 <= 0x7F)
+        else:
+            words = arg1 > 0xFF or arg2 > 0xFF
+        if words:
+            flags |= COMPONENT_FLAG_ARG_1_AND_2_ARE_WORDS
+        else:
+            flags &= ~COMPONENT_FLAG_ARG_1_AND_2_ARE_WORDS
+        stream.write_uint16(flags)
+        stream.write_uint16(glyph_index)
+        if words:
+            if flags & COMPONENT_FLAG_ARGS_ARE_XY_VALUES:
+                stream.write_int16(arg1)
+                stream.write_int16(arg2)
+            else:
+                stream.write_uint16(arg1)
+                stream.write_uint16(arg2)
+        elif flags & COMPONENT_FLAG_ARGS_ARE_XY_VALUES:
+            stream.write_int8(arg1)
+            stream.write_int8(arg2)
+        else:
+            stream.write_uint8(arg1)
+            stream.write_uint8(arg2)
+        if flags & COMPONENT_FLAG_WE_HAVE_A_SCALE:
+            stream.write_f2dot14(transform[0])
+        elif flags & COMPONENT_FLAG_WE_HAVE_AN_X_AND_Y_SCALE:
+            stream.write_f2dot14(transform[0])
+            stream.write_f2dot14(transform[3])
+        elif flags & COMPONENT_FLAG_WE_HAVE_A_TWO_BY_TWO:
+            stream.write_f2dot14_array(transform)
+    stream.write(instructions)
+    return stream.get_value()
+
+
+def _get_glyph_points(glyf: GlyfTable, glyph_index: int, cache: dict[int, list[tuple[float, float]]], depth: int = 0) -> list[tuple[float, float]]:
+    if glyph_index in cache:
+        return cache[glyph_index]
+    if depth > _MAX_COMPONENT_DEPTH:
+        raise ValueError(f'composite glyph nesting is too deep: {glyph_index}')
+    glyph = glyf.get_glyph(glyph_index)
+    if glyph is None:
+        points = []
+    elif isinstance(glyph, SimpleGlyph):
+        points = list(zip(glyph.x_coordinates, glyph.y_coordinates))
+    else:
+        points = []
+        components, _ = _decode_components(glyph.data)
+        for flags, component_glyph_index, arg1, arg2, (xx, xy, yx, yy) in components:
+            component_points = [(xx * x + yx * y, xy * x + yy * y) for x, y in _get_glyph_points(glyf, component_glyph_index, cache, depth + 1)]
+            if flags & COMPONENT_FLAG_ARGS_ARE_XY_VALUES:
+                dx, dy = arg1, arg2
+            elif arg1 < len(points) and arg2 < len(component_points):
+                dx = points[arg1][0] - component_points[arg2][0]
+                dy = points[arg1][1] - component_points[arg2][1]
+            else:
+                dx = dy = 0
+            points.extend((x + dx, y + dy) for x, y in component_points)
+    cache[glyph_index] = points
+    return points
+
+
+def _apply_tuple_variations(glyph_points: tuple[Any, Any], variations: list[Any], coordinates: Sequence[float], end_points: Sequence[int] | None) -> tuple[Any, Any]:
+    x_coordinates, y_coordinates = glyph_points
+    xs = _new_point_array(x_coordinates)
+    ys = _new_point_array(y_coordinates)
+    point_count = len(x_coordinates)
+    original_xs = xs.copy() if numpy is not None else x_coordinates
+    original_ys = ys.copy() if numpy is not None else y_coordinates
+    for variation in variations:
+        scalar = variation.calculate_scalar(coordinates)
+        if scalar == 0:
+            continue
+        if variation.point_numbers is None:
+            x_deltas, y_deltas = variation.x_deltas, variation.y_deltas
+        elif end_points is None:
+            x_deltas = _scatter_deltas(variation.point_numbers, variation.x_deltas, point_count)
+            y_deltas = _scatter_deltas(variation.point_numbers, variation.y_deltas, point_count)
+        else:
+            x_deltas = interpolate_untouched_deltas(original_xs, end_points, variation.point_numbers, variation.x_deltas, point_count)
+            y_deltas = interpolate_untouched_deltas(original_ys, end_points, variation.point_numbers, variation.y_deltas, point_count)
+        xs = _add_scaled_deltas(xs, x_deltas, scalar)
+        ys = _add_scaled_deltas(ys, y_deltas, scalar)
+    if numpy is not None:
+        xs = xs.tolist()
+        ys = ys.tolist()
+    return round_half_up_many(xs), round_half_up_many(ys)
+
+
+def instantiate_glyphs(glyf: GlyfTable, hmtx: HmtxTable, gvar: GvarTable, coordinates: Sequence[float]) -> tuple[GlyfTable, HmtxTable]:
+    if len(gvar) != len(glyf):
+        raise ValueError(f"'gvar' glyph count {len(gvar)} does not match 'glyf' glyph count {len(glyf)}")
+    new_glyf = GlyfTable(glyf.data, glyf.offsets)
+    advance_widths = array('H', hmtx.advance_widths)
+    lsbs = array('h', hmtx.lsbs)
+    origins = {}
+    changed_glyph_indices = set()
+    composite_glyph_indices = []
+
+    for glyph_index in range(len(glyf)):
+        glyph_data = glyf.get_glyph_data(glyph_index)
+        if len(glyph_data) >= GLYPH_HEADER_SCHEMA.size:
+            header = GLYPH_HEADER_SCHEMA.unpack_from(glyph_data)
+            origins[glyph_index] = header.x_min - lsbs[glyph_index]
+            if header.number_of_contours < 0:
+                composite_glyph_indices.append(glyph_index)
+        if len(gvar.get_glyph_variation_data(glyph_index)) == 0:
+            continue
+
+        glyph = glyf.get_glyph(glyph_index)
+        if glyph is None:
+            x_coordinates, y_coordinates, end_points = [], [], []
+            x_min = 0
+        elif isinstance(glyph, SimpleGlyph):
+            x_coordinates, y_coordinates, end_points = glyph.x_coordinates.tolist(), glyph.y_coordinates.tolist(), glyph.end_points
+            x_min = glyph.x_min
+        else:
+            components, instructions = _decode_components(glyph.data)
+            x_coordinates = [arg1 if flags & COMPONENT_FLAG_ARGS_ARE_XY_VALUES else 0 for flags, _, arg1, _, _ in components]
+            y_coordinates = [arg2 if flags & COMPONENT_FLAG_ARGS_ARE_XY_VALUES else 0 for flags, _, _, arg2, _ in components]
+            end_points = None
+            x_min = glyph.x_min
+
+        origin = x_min - lsbs[glyph_index]
+        x_coordinates.extend((origin, origin + advance_widths[glyph_index], 0, 0))
+        y_coordinates.extend((0, 0, 0, 0))
+        point_count = len(x_coordinates)
+        variations = gvar.get_tuple_variations(glyph_index, point_count, coordinates)
+        if len(variations) == 0:
+            continue
+        xs, ys = _apply_tuple_variations((x_coordinates, y_coordinates), variations, coordinates, end_points)
+        outline_count = point_count - PHANTOM_POINT_COUNT
+
+        advance_widths[glyph_index] = max(0, xs[outline_count + 1] - xs[outline_count])
+        origins[glyph_index] = xs[outline_count]
+        if glyph is None:
+            continue
+        elif isinstance(glyph, SimpleGlyph):
+            glyph = SimpleGlyph(0, 0, 0, 0, glyph.end_points, glyph.instructions, glyph.on_curves, array('h', xs[:outline_count]), array('h', ys[:outline_count]), glyph.overlap_simple)
+            glyph.recalculate_bounds()
+        else:
+            for component, x, y in zip(components, xs, ys):
+                if component[0] & COMPONENT_FLAG_ARGS_ARE_XY_VALUES:
+                    component[2], component[3] = x, y
+            glyph = CompositeGlyph(glyph.x_min, glyph.y_min, glyph.x_max, glyph.y_max, _encode_components(components, instructions))
+        new_glyf.set_glyph(glyph_index, glyph)
+        changed_glyph_indices.add(glyph_index)
+
+    points_cache = {}
+    for glyph_index in composite_glyph_indices:
+        glyph = new_glyf.get_glyph(glyph_index)
+        points = _get_glyph_points(new_glyf, glyph_index, points_cache)
+        if len(points) > 0:
+            xs = [x for x, _ in points]
+            ys = [y for _, y in points]
+            bounds = [round_half_up_integer(value) for value in (min(xs), min(ys), max(xs), max(ys))]
+        else:
+            bounds = [0, 0, 0, 0]
+        if bounds != [glyph.x_min, glyph.y_min, glyph.x_max, glyph.y_max]:
+            glyph.x_min, glyph.y_min, glyph.x_max, glyph.y_max = bounds
+            new_glyf.set_glyph(glyph_index, glyph)
+            changed_glyph_indices.add(glyph_index)
+
+    for glyph_index in changed_glyph_indices:
+        lsbs[glyph_index] = new_glyf.get_glyph(glyph_index).x_min - origins[glyph_index]
+    return new_glyf, HmtxTable(advance_widths, lsbs)
+
+
+def _calculate_font_bounds(glyf_data: bytes, offsets: array) -> tuple[int, int, int, int]:
+    x_mins, y_mins, x_maxs, y_maxs = [], [], [], []
+    for start, end in zip(offsets, offsets[1:]):
+        if end > start:
+            header = GLYPH_HEADER_SCHEMA.unpack_from(glyf_data, start)
+            x_mins.append(header.x_min)
+            y_mins.append(header.y_min)
+            x_maxs.append(header.x_max)
+            y_maxs.append(header.y_max)
+    if len(x_mins) == 0:
+        return 0, 0, 0, 0
+    return min(x_mins), min(y_mins), max(x_maxs), max(y_maxs)
+
+
+def _calculate_horizontal_extents(glyf_data: bytes, offsets: array, hmtx: HmtxTable) -> tuple[int, int, int]:
+    lsbs, rsbs, extents = [], [], []
+    for glyph_index, (start, end) in enumerate(zip(offsets, offsets[1:])):
+        if end > start:
+            header = GLYPH_HEADER_SCHEMA.unpack_from(glyf_data, start)
+            lsb = hmtx.lsbs[glyph_index]
+            extent = lsb + header.x_max - header.x_min
+            lsbs.append(lsb)
+            rsbs.append(hmtx.advance_widths[glyph_index] - extent)
+            extents.append(extent)
+    if len(lsbs) == 0:
+        return 0, 0, 0
+    return min(lsbs), min(rsbs), max(extents)
+
+
+def _strip_layout_variations(tables: dict[str, bytes | bytearray | memoryview]) -> list[str]:
+    stripped = []
+    gdef = tables.get('GDEF')
+    if gdef is not None and len(gdef) >= GDEF_ITEM_VAR_STORE_OFFSET + 4 and gdef[0:4] == b'\x00\x01\x00\x03' and any(gdef[GDEF_ITEM_VAR_STORE_OFFSET:GDEF_ITEM_VAR_STORE_OFFSET + 4]):
+        gdef = bytearray(gdef)
+        gdef[GDEF_ITEM_VAR_STORE_OFFSET:GDEF_ITEM_VAR_STORE_OFFSET + 4] = bytes(4)
+        tables['GDEF'] = gdef
+        stripped.append("'GDEF' item variation store")
+    for tag in ('GSUB', 'GPOS'):
+        table = tables.get(tag)
+        if table is not None and len(table) >= FEATURE_VARIATIONS_OFFSET + 4 and table[0:4] == b'\x00\x01\x00\x01' and any(table[FEATURE_VARIATIONS_OFFSET:FEATURE_VARIATIONS_OFFSET + 4]):
+            table = bytearray(table)
+            table[FEATURE_VARIATIONS_OFFSET:FEATURE_VARIATIONS_OFFSET + 4] = bytes(4)
+            tables[tag] = table
+            stripped.append(f'{tag!r} feature variations')
+    return stripped
+
+
+def instantiate_font_tables(font: SfntFont, location: Mapping[str, float]) -> dict[str, bytes | bytearray | memoryview]:
+    fvar = font.fvar
+    if fvar is None:
+        raise ValueError("instancing requires an 'fvar' table")
+    glyf = font.glyf
+    if glyf is None or 'hmtx' not in font:
+        raise ValueError("instancing requires 'glyf', 'loca' and 'hmtx' tables")
+
+    coordinates = normalize_location(fvar, font.avar, location)
+    hmtx = parse_hmtx_table(font.get_table_data('hmtx'), len(glyf), font.hhea.number_of_h_metrics)
+    if font.gvar is not None:
+        glyf, hmtx = instantiate_glyphs(glyf, hmtx, font.gvar, coordinates)
+
+    tables = {tag: font.get_table_data(tag) for tag in font.tags if tag not in VARIATION_TAGS}
+    stripped = _strip_layout_variations(tables)
+    if len(stripped) > 0:
+        warnings.warn(f'removed {", ".join(stripped)}; layout deltas are not instanced and stay at the default location', stacklevel=2)
+
+    index_format = font.head.index_to_loc_format
+    try:
+        glyf_data, loca_data = dump_glyf_table(glyf, index_format)
+    except ValueError:
+        index_format = 1
+        glyf_data, loca_data = dump_glyf_table(glyf, index_format)
+    offsets = read_loca_offsets(loca_data, index_format, len(glyf))
+    x_min, y_min, x_max, y_max = _calculate_font_bounds(glyf_data, offsets)
+    min_left_side_bearing, min_right_side_bearing, x_max_extent = _calculate_horizontal_extents(glyf_data, offsets, hmtx)
+    tables['glyf'] = glyf_data
+    tables['loca'] = loca_data
+    tables['head'] = dump_head_table(dataclasses.replace(font.head, x_min=x_min, y_min=y_min, x_max=x_max, y_max=y_max, index_to_loc_format=index_format))
+    tables['hmtx'] = dump_hmtx_table(hmtx)
+    tables['hhea'] = dump_hhea_table(dataclasses.replace(
+        font.hhea,
+        advance_width_max=max(hmtx.advance_widths, default=0),
+        min_left_side_bearing=min_left_side_bearing,
+        min_right_side_bearing=min_right_side_bearing,
+        x_max_extent=x_max_extent,
+        number_of_h_metrics=hmtx.num_h_metrics,
+    ))
+
+    if font.os2 is not None and 'wght' in location:
+        for axis in fvar.axes:
+            if axis.axis_tag == 'wght':
+                weight = max(axis.min_value, min(location['wght'], axis.max_value))
+                tables['OS/2'] = dump_os2_table(dataclasses.replace(font.os2, us_weight_class=max(1, min(round_half_up_integer(weight), 1000))))
+    return tables
+
+
+def instantiate_font(font: SfntFont, location: Mapping[str, float]) -> bytes:
+    return dump_sfnt(instantiate_font_tables(font, location), font.sfnt_version)
@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import os
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Iterable
+from itertools import compress
+from mmap import mmap
+from typing import Any
+
+from sfnttools.collection import TTC_TAG, SfntCollection
+from sfnttools.font import SfntFont
+from sfnttools.tables.cmap import CmapIndex
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+METADATA_INDEX_MAGIC = 'SFMI'
+METADATA_INDEX_VERSION = 1
+
+METADATA_INDEX_HEADER_SCHEMA = RecordSchema('MetadataIndexHeader', [
+    ('magic', 'tag'),
+    ('version', 'uint16'),
+    ('reserved', 'uint16'),
+    ('font_count', 'uint32'),
+    ('string_count', 'uint32'),
+    ('string_data_size', 'uint32'),
+    ('range_count', 'uint32'),
+    ('page_count', 'uint32'),
+    ('posting_count', 'uint32'),
+])
+
+MAX_CODE_POINT = 0x10FFFF
+
+COVERAGE_PAGE_SHIFT = 8
+COVERAGE_PAGE_MASK = (1 << COVERAGE_PAGE_SHIFT) - 1
+COVERAGE_BITMAP_SIZE = (1 << COVERAGE_PAGE_SHIFT) // 8
+
+NO_STRING = 0xFFFFFFFF
+
+_FONT_STRING_COLUMNS = ('path', 'family_name', 'subfamily_name', 'full_name', 'post_script_name')
+_FONT_UINT16_COLUMNS = ('font_index', 'weight_class', 'width_class', 'fs_selection', 'mac_style')
+
+_BIT_TABLES = [bytes(1 if value & (1 << bit) else 0 for value in range(256)) for bit in range(8)]
+
+
+class FontMetadata:
+    path: str
+    font_index: int
+    family_name: str | None
+    subfamily_name: str | None
+    full_name: str | None
+    post_script_name: str | None
+    weight_class: int
+    width_class: int
+    fs_selection: int
+    mac_style: int
+    unicode_ranges: tuple[int, int, int, int]
+    coverage: list[tuple[int, int]]
+
+    def __init__(
+            self,
+            path: str,
+            font_index: int = 0,
+            family_name: str | None = None,
+            subfamily_name: str | None = None,
+            full_name: str | None = None,
+            post_script_name: str | None = None,
+            weight_class: int = 400,
+            width_class: int = 5,
+            fs_selection: int = 0,
+            mac_style: int = 0,
+            unicode_ranges: tuple[int, int, int, int] = (0, 0, 0, 0),
+            coverage: list[tuple[int, int]] | None = None,
+    ):
+        self.path = path
+        self.font_index = font_index
+        self.family_name = family_name
+        self.subfamily_name = subfamily_name
+        self.full_name = full_name
+        self.post_script_name = post_script_name
+        self.weight_class = weight_class
+        self.width_class = width_class
+        self.fs_selection = fs_selection
+        self.mac_style = mac_style
+        self.unicode_ranges = unicode_ranges
+        self.coverage = [] if coverage is None else coverage
+
+    def __repr__(self) -> str:
+        return f'FontMetadata({self.path!r}, {self.font_index}, {self.family_name!r}, {self.subfamily_name!r})'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FontMetadata):
+            return NotImplemented
+        return (self.path == other.path and
+                self.font_index == other.font_index and
+                self.family_name == other.family_name and
+                self.subfamily_name == other.subfamily_name and
+                self.full_name == other.full_name and
+                self.post_script_name == other.post_script_name and
+                self.weight_class == other.weight_class and
+                self.width_class == other.width_class and
+                self.fs_selection == other.fs_selection and
+                self.mac_style == other.mac_style and
+                self.unicode_ranges == other.unicode_ranges and
+                self.coverage == other.coverage)
+
+    def covers(self, code_point: int) -> bool:
+        index = bisect_right(self.coverage, (code_point, MAX_CODE_POINT)) - 1
+        return index >= 0 and code_point <= self.coverage[index][1]
+
+
+def _merge_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged = []
+    for start, end in sorted(ranges):
+        if len(merged) > 0 and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = merged[-1][0], end
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def get_coverage_ranges(index: CmapIndex) -> list[tuple[int, int]]:
+    return _merge_ranges([(start, min(end, MAX_CODE_POINT)) for start, end in index.iter_ranges() if start <= MAX_CODE_POINT])
+
+
+def _get_preferred_name(font: SfntFont, name_ids: tuple[int, ...]) -> str | None:
+    name = font.name
+    if name is None:
+        return None
+    for name_id in name_ids:
+        value = name.get_name(name_id)
+        if value is not None:
+            return value
+    return None
+
+
+def extract_font_metadata(font: SfntFont, path: str = '', font_index: int = 0) -> FontMetadata:
+    metadata = FontMetadata(
+        path,
+        font_index,
+        _get_preferred_name(font, (16, 1)),
+        _get_preferred_name(font, (17, 2)),
+        _get_preferred_name(font, (4,)),
+        _get_preferred_name(font, (6,)),
+    )
+    os2 = font.os2
+    if os2 is not None:
+        metadata.weight_class = os2.us_weight_class
+        metadata.width_class = os2.us_width_class
+        metadata.fs_selection = os2.fs_selection
+        metadata.unicode_ranges = (os2.ul_unicode_range_1, os2.ul_unicode_range_2, os2.ul_unicode_range_3, os2.ul_unicode_range_4)
+    head = font.head
+    if head is not None:
+        metadata.mac_style = head.mac_style
+    cmap = font.cmap
+    if cmap is not None:
+        index = cmap.get_index()
+        if index is not None:
+            metadata.coverage = get_coverage_ranges(index)
+    return metadata
+
+
+def extract_file_metadata(file_path: str | os.PathLike[str]) -> list[FontMetadata]:
+    path = os.fspath(file_path)
+    with BufferStream.from_file(file_path) as stream:
+        if stream.buffer[:4] == TTC_TAG.encode('latin-1'):
+            with SfntCollection(stream) as collection:
+                return [extract_font_metadata(font, path, font_index) for font_index, font in enumerate(collection.fonts)]
+        with SfntFont(stream) as font:
+            return [extract_font_metadata(font, path)]
+
+
+def _build_coverage_pages(coverage: list[tuple[int, int]]) -> dict[int, int]:
+    pages = defaultdict(int)
+    for start, end in coverage:
+        code_point = start
+        while code_point <= end:
+            page = code_point >> COVERAGE_PAGE_SHIFT
+            page_end = min(end, code_point | COVERAGE_PAGE_MASK)
+            low = code_point & COVERAGE_PAGE_MASK
+            pages[page] |= ((1 << (page_end - code_point + 1)) - 1) << low
+            code_point = page_end + 1
+    return pages
+
+
+def dump_metadata_index(metadatas: Iterable[FontMetadata]) -> bytes:
+    metadatas = list(metadatas)
+    strings = {}
+    string_columns = {column: [] for column in _FONT_STRING_COLUMNS}
+    for metadata in metadatas:
+        for column in _FONT_STRING_COLUMNS:
+            value = getattr(metadata, column)
+            string_columns[column].append(NO_STRING if value is None else strings.setdefault(value, len(strings)))
+    string_datas = [value.encode('utf-8') for value in strings]
+
+    range_offsets = [0]
+    range_starts = []
+    range_ends = []
+    postings = defaultdict(list)
+    for font_id, metadata in enumerate(metadatas):
+        range_starts.extend(start for start, _ in metadata.coverage)
+        range_ends.extend(end for _, end in metadata.coverage)
+        range_offsets.append(len(range_starts))
+        for page, bits in _build_coverage_pages(metadata.coverage).items():
+            postings[page].append((font_id, bits.to_bytes(COVERAGE_BITMAP_SIZE, 'little')))
+    pages = sorted(postings)
+    posting_offsets = [0]
+    for page in pages:
+        posting_offsets.append(posting_offsets[-1] + len(postings[page]))
+
+    stream = BufferedStream()
+    stream.write_record(METADATA_INDEX_HEADER_SCHEMA, METADATA_INDEX_HEADER_SCHEMA.new_record(
+        METADATA_INDEX_MAGIC,
+        METADATA_INDEX_VERSION,
+        0,
+        len(metadatas),
+        len(string_datas),
+        sum(len(string_data) for string_data in string_datas),
+        len(range_starts),
+        len(pages),
+        posting_offsets[-1],
+    ))
+    for column in _FONT_STRING_COLUMNS:
+        stream.write_uint32_array(string_columns[column])
+    stream.write_uint32_array([value for metadata in metadatas for value in metadata.unicode_ranges])
+    stream.write_uint32_array(range_offsets)
+    for column in _FONT_UINT16_COLUMNS:
+        stream.write_uint16_array([getattr(metadata, column) for metadata in metadatas])
+    stream.align_to_4_byte_with_nulls()
+    stream.write_uint32_array(range_starts)
+    stream.write_uint32_array(range_ends)
+    stream.write_uint32_array(pages)
+    stream.write_uint32_array(posting_offsets)
+    stream.write_uint32_array([font_id for page in pages for font_id, _ in postings[page]])
+    stream.write(b''.join(bitmap for page in pages for _, bitmap in postings[page]))
+    string_offset = 0
+    stream.write_uint32(string_offset)
+    for string_data in string_datas:
+        string_offset += len(string_data)
+        stream.write_uint32(string_offset)
+    for string_data in string_datas:
+        stream.write(string_data)
+    return stream.get_value()
+
+
+class MetadataIndex:
+    stream: BufferStream
+    header: Any
+    pages: list[int]
+    posting_offsets: list[int]
+    _column_offsets: dict[str, int]
+    _strings: dict[int, str]
+
+    @staticmethod
+    def load(file_path: str | os.PathLike[str]) -> MetadataIndex:
+        return MetadataIndex(BufferStream.from_file(file_path))
+
+    @staticmethod
+    def parse(data: bytes | bytearray | memoryview | mmap) -> MetadataIndex:
+        return MetadataIndex(BufferStream(data))
+
+    def __init__(self, stream: BufferStream):
+        header = stream.read_record(METADATA_INDEX_HEADER_SCHEMA)
+        if header.magic != METADATA_INDEX_MAGIC:
+            raise ValueError('bad metadata index magic')
+        if header.version != METADATA_INDEX_VERSION:
+            raise ValueError(f'unsupported metadata index version: {header.version}')
+        self.stream = stream
+        self.header = header
+        self._strings = {}
+
+        font_count = header.font_count
+        column_offsets = {}
+        offset = METADATA_INDEX_HEADER_SCHEMA.size
+        for column, size in [
+            *((column, font_count * 4) for column in _FONT_STRING_COLUMNS),
+            ('unicode_ranges', font_count * 16),
+            ('range_offsets', (font_count + 1) * 4),
+            *((column, font_count * 2) for column in _FONT_UINT16_COLUMNS),
+        ]:
+            column_offsets[column] = offset
+            offset += size
+        offset = (offset + 3) // 4 * 4
+        for column, size in [
+            ('range_starts', header.range_count * 4),
+            ('range_ends', header.range_count * 4),
+            ('pages', header.page_count * 4),
+            ('posting_offsets', (header.page_count + 1) * 4),
+            ('posting_font_ids', header.posting_count * 4),
+            ('posting_bitmaps', header.posting_count * COVERAGE_BITMAP_SIZE),
+            ('string_offsets', (header.string_count + 1) * 4),
+            ('string_data', header.string_data_size),
+        ]:
+            column_offsets[column] = offset
+            offset += size
+        if offset > len(stream):
+            raise EOFError('metadata index is truncated')
+        self._column_offsets = column_offsets
+
+        stream.seek(column_offsets['pages'])
+        self.pages = stream.read_uint32_array(header.page_count).tolist()
+        self.posting_offsets = stream.read_uint32_array(header.page_count + 1).tolist()
+
+    def __enter__(self) -> MetadataIndex:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.header.font_count
+
+    def __getitem__(self, font_id: int) -> FontMetadata:
+        if not 0 <= font_id < self.header.font_count:
+            raise IndexError(f'font id out of range: {font_id}')
+        path, family_name, subfamily_name, full_name, post_script_name = [self.get_string(self._read_uint32(column, font_id)) for column in _FONT_STRING_COLUMNS]
+        font_index, weight_class, width_class, fs_selection, mac_style = [self._read_uint16(column, font_id) for column in _FONT_UINT16_COLUMNS]
+        self.stream.seek(self._column_offsets['unicode_ranges'] + font_id * 16)
+        unicode_ranges = self.stream.read_uint32_array(4, as_tuple=True)
+        return FontMetadata(
+            path,
+            font_index,
+            family_name,
+            subfamily_name,
+            full_name,
+            post_script_name,
+            weight_class,
+            width_class,
+            fs_selection,
+            mac_style,
+            unicode_ranges,
+            self.get_coverage(font_id),
+        )
+
+    def close(self):
+        self._strings.clear()
+        self.stream.close()
+
+    def _read_uint32(self, column: str, index: int) -> int:
+        self.stream.seek(self._column_offsets[column] + index * 4)
+        return self.stream.read_uint32()
+
+    def _read_uint16(self, column: str, index: int) -> int:
+        self.stream.seek(self._column_offsets[column] + index * 2)
+        return self.stream.read_uint16()
+
+    def get_string(self, string_id: int) -> str | None:
+        if string_id == NO_STRING:
+            return None
+        if string_id not in self._strings:
+            if string_id >= self.header.string_count:
+                raise ValueError(f'string id out of range: {string_id}')
+            self.stream.seek(self._column_offsets['string_offsets'] + string_id * 4)
+            start, end = self.stream.read_uint32_array(2, as_tuple=True)
+            self.stream.seek(self._column_offsets['string_data'] + start)
+            self._strings[string_id] = self.stream.read(end - start).decode('utf-8')
+        return self._strings[string_id]
+
+    def get_coverage(self, font_id: int) -> list[tuple[int, int]]:
+        self.stream.seek(self._column_offsets['range_offsets'] + font_id * 4)
+        start, end = self.stream.read_uint32_array(2, as_tuple=True)
+        self.stream.seek(self._column_offsets['range_starts'] + start * 4)
+        range_starts = self.stream.read_uint32_array(end - start)
+        self.stream.seek(self._column_offsets['range_ends'] + start * 4)
+        range_ends = self.stream.read_uint32_array(end - start)
+        return list(zip(range_starts, range_ends))
+
+    def _find_fonts_covering(self, code_point: int) -> set[int]:
+        page = code_point >> COVERAGE_PAGE_SHIFT
+        page_index = bisect_left(self.pages, page)
+        if page_index == len(self.pages) or self.pages[page_index] != page:
+            return set()
+        start, end = self.posting_offsets[page_index], self.posting_offsets[page_index + 1]
+        self.stream.seek(self._column_offsets['posting_font_ids'] + start * 4)
+        font_ids = self.stream.read_uint32_array(end - start)
+        bitmaps_offset = self._column_offsets['posting_bitmaps']
+        with self.stream.buffer[bitmaps_offset + start * COVERAGE_BITMAP_SIZE:bitmaps_offset + end * COVERAGE_BITMAP_SIZE] as bitmaps:
+            with bitmaps[(code_point & COVERAGE_PAGE_MASK) >> 3::COVERAGE_BITMAP_SIZE] as column:
+                flags = column.tobytes().translate(_BIT_TABLES[code_point & 7])
+        return set(compress(font_ids, flags))
+
+    def find_fonts(self, code_points: Iterable[int]) -> list[int]:
+        font_ids = None
+        for code_point in sorted(set(code_points)):
+            covering_font_ids = self._find_fonts_covering(code_point)
+            font_ids = covering_font_ids if font_ids is None else font_ids & covering_font_ids
+            if len(font_ids) == 0:
+                break
+        if font_ids is None:
+            return list(range(self.header.font_count))
+        return sorted(font_ids)
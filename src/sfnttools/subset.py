@@ -0,0 +1,130 @@
+import dataclasses
+from array import array
+from collections.abc import Iterable
+
+from sfnttools.font import SfntFont
+from sfnttools.tables.cmap import build_cmap_table
+from sfnttools.tables.glyf import GLYPH_HEADER_SCHEMA, GlyfTable, iter_components
+from sfnttools.tables.head import dump_head_table
+from sfnttools.tables.hhea import dump_hhea_table
+from sfnttools.tables.hmtx import HmtxTable, parse_hmtx_table, dump_hmtx_table
+from sfnttools.tables.maxp import dump_maxp_table
+from sfnttools.tables.os2 import dump_os2_table
+from sfnttools.tables.post import STANDARD_GLYPH_NAME_COUNT, PostTable, dump_post_table
+from sfnttools.utils.stream import BufferedStream
+from sfnttools.writer import dump_sfnt
+
+PASSTHROUGH_TAGS = {'cvt ', 'fpgm', 'gasp', 'name', 'prep'}
+
+
+def _is_composite_glyph_data(data: memoryview) -> bool:
+    return len(data) >= GLYPH_HEADER_SCHEMA.size and data[0] == 0xFF and data[1] == 0xFF
+
+
+def calculate_glyph_closure(glyf: GlyfTable, glyph_indices: Iterable[int]) -> set[int]:
+    closure = set()
+    pending = list(glyph_indices)
+    while len(pending) > 0:
+        glyph_index = pending.pop()
+        if glyph_index in closure:
+            continue
+        if not 0 <= glyph_index < len(glyf):
+            raise ValueError(f'glyph index out of range: {glyph_index}')
+        closure.add(glyph_index)
+        data = glyf.get_glyph_data(glyph_index)
+        if _is_composite_glyph_data(data):
+            pending.extend(component_glyph_index for _, _, component_glyph_index in iter_components(data[GLYPH_HEADER_SCHEMA.size:]))
+    return closure
+
+
+def _subset_glyf_loca(glyf: GlyfTable, old_glyph_indices: list[int], glyph_map: dict[int, int], index_format: int) -> tuple[bytes, bytes, int]:
+    stream = BufferedStream()
+    offsets = array('I')
+    for old_glyph_index in old_glyph_indices:
+        offsets.append(stream.tell())
+        data = glyf.get_glyph_data(old_glyph_index)
+        if len(data) == 0:
+            continue
+        if _is_composite_glyph_data(data):
+            data = bytearray(data)
+            components = list(iter_components(memoryview(data)[GLYPH_HEADER_SCHEMA.size:]))
+            for offset, _, component_glyph_index in components:
+                offset += GLYPH_HEADER_SCHEMA.size + 2
+                data[offset:offset + 2] = glyph_map[component_glyph_index].to_bytes(2, 'big', signed=False)
+        stream.write(data)
+        stream.align_to_4_byte_with_nulls()
+    offsets.append(stream.tell())
+
+    loca = BufferedStream()
+    if index_format == 0 and offsets[-1] > 0x1FFFE:
+        index_format = 1
+    if index_format == 0:
+        loca.write_uint16_array([offset >> 1 for offset in offsets])
+    else:
+        loca.write_uint32_array(offsets)
+    return stream.get_value(), loca.get_value(), index_format
+
+
+def _subset_post(post: PostTable, old_glyph_indices: list[int]) -> PostTable:
+    if post.glyph_name_indices is None:
+        return post
+    glyph_name_indices = []
+    names = []
+    for old_glyph_index in old_glyph_indices:
+        name_index = post.glyph_name_indices[old_glyph_index] if old_glyph_index < len(post.glyph_name_indices) else 0
+        if name_index >= STANDARD_GLYPH_NAME_COUNT:
+            names.append(post.names[name_index - STANDARD_GLYPH_NAME_COUNT])
+            name_index = STANDARD_GLYPH_NAME_COUNT + len(names) - 1
+        glyph_name_indices.append(name_index)
+    return PostTable(post.header, glyph_name_indices, names)
+
+
+def subset_font_tables(font: SfntFont, code_points: Iterable[int] = (), glyph_indices: Iterable[int] = ()) -> dict[str, bytes | memoryview]:
+    glyf = font.glyf
+    if glyf is None or 'hmtx' not in font:
+        raise ValueError("subsetting requires 'glyf', 'loca' and 'hmtx' tables")
+
+    code_points = sorted(set(code_points))
+    cmap_index = None if font.cmap is None else font.cmap.get_index()
+    mapping = {}
+    if cmap_index is not None:
+        for code_point, glyph_index in zip(code_points, cmap_index.map_many(code_points)):
+            if glyph_index != 0:
+                mapping[code_point] = glyph_index
+
+    old_glyph_indices = sorted(calculate_glyph_closure(glyf, [0, *mapping.values(), *glyph_indices]))
+    glyph_map = {old_glyph_index: new_glyph_index for new_glyph_index, old_glyph_index in enumerate(old_glyph_indices)}
+
+    tables = {}
+    for tag in PASSTHROUGH_TAGS:
+        if tag in font:
+            tables[tag] = font.get_table_data(tag)
+
+    glyf_data, loca_data, index_format = _subset_glyf_loca(glyf, old_glyph_indices, glyph_map, font.head.index_to_loc_format)
+    tables['glyf'] = glyf_data
+    tables['loca'] = loca_data
+    tables['head'] = dump_head_table(dataclasses.replace(font.head, index_to_loc_format=index_format))
+
+    hmtx = parse_hmtx_table(font.get_table_data('hmtx'), len(glyf), font.hhea.number_of_h_metrics)
+    hmtx = HmtxTable(
+        array('H', [hmtx.advance_widths[old_glyph_index] for old_glyph_index in old_glyph_indices]),
+        array('h', [hmtx.lsbs[old_glyph_index] for old_glyph_index in old_glyph_indices]),
+    )
+    tables['hmtx'] = dump_hmtx_table(hmtx)
+    tables['hhea'] = dump_hhea_table(dataclasses.replace(font.hhea, number_of_h_metrics=hmtx.num_h_metrics))
+    tables['maxp'] = dump_maxp_table(dataclasses.replace(font.maxp, num_glyphs=len(old_glyph_indices)))
+
+    if font.cmap is not None:
+        tables['cmap'] = build_cmap_table({code_point: glyph_map[glyph_index] for code_point, glyph_index in mapping.items()})
+    if font.post is not None:
+        tables['post'] = dump_post_table(_subset_post(font.post, old_glyph_indices))
+    if font.os2 is not None:
+        os2 = font.os2
+        if len(mapping) > 0:
+            os2 = dataclasses.replace(os2, us_first_char_index=min(min(mapping), 0xFFFF), us_last_char_index=min(max(mapping), 0xFFFF))
+        tables['OS/2'] = dump_os2_table(os2)
+    return tables
+
+
+def subset_font(font: SfntFont, code_points: Iterable[int] = (), glyph_indices: Iterable[int] = ()) -> bytes:
+    return dump_sfnt(subset_font_tables(font, code_points, glyph_indices), font.sfnt_version)
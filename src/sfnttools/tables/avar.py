@@ -0,0 +1,61 @@
+from bisect import bisect_left
+from collections.abc import Sequence
+
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+
+def map_axis_value(segment_map: Sequence[tuple[float, float]], value: float) -> float:
+    if len(segment_map) == 0:
+        return value
+    from_coordinates = [from_coordinate for from_coordinate, _ in segment_map]
+    index = bisect_left(from_coordinates, value)
+    if index == len(segment_map):
+        from_coordinate, to_coordinate = segment_map[-1]
+        return to_coordinate + value - from_coordinate
+    from_coordinate, to_coordinate = segment_map[index]
+    if value == from_coordinate:
+        return to_coordinate
+    if index == 0:
+        return to_coordinate + value - from_coordinate
+    previous_from_coordinate, previous_to_coordinate = segment_map[index - 1]
+    return previous_to_coordinate + (to_coordinate - previous_to_coordinate) * (value - previous_from_coordinate) / (from_coordinate - previous_from_coordinate)
+
+
+class AvarTable:
+    segment_maps: list[list[tuple[float, float]]]
+
+    def __init__(self, segment_maps: list[list[tuple[float, float]]] | None = None):
+        self.segment_maps = [] if segment_maps is None else segment_maps
+
+    def map_coordinates(self, coordinates: Sequence[float]) -> list[float]:
+        if len(coordinates) != len(self.segment_maps):
+            raise ValueError(f'expected {len(self.segment_maps)} coordinates, got {len(coordinates)}')
+        return [map_axis_value(segment_map, value) for segment_map, value in zip(self.segment_maps, coordinates)]
+
+
+def parse_avar_table(data: bytes | memoryview) -> AvarTable:
+    stream = BufferStream(data)
+    major_version = stream.read_uint16()
+    minor_version = stream.read_uint16()
+    if major_version != 1:
+        raise ValueError(f'unsupported avar version: {major_version}.{minor_version}')
+    stream.read_uint16()
+    axis_count = stream.read_uint16()
+    segment_maps = []
+    for _ in range(axis_count):
+        position_map_count = stream.read_uint16()
+        values = stream.read_f2dot14_array(position_map_count * 2)
+        segment_maps.append(list(zip(values[0::2], values[1::2])))
+    return AvarTable(segment_maps)
+
+
+def dump_avar_table(table: AvarTable) -> bytes:
+    stream = BufferedStream()
+    stream.write_uint16(1)
+    stream.write_uint16(0)
+    stream.write_uint16(0)
+    stream.write_uint16(len(table.segment_maps))
+    for segment_map in table.segment_maps:
+        stream.write_uint16(len(segment_map))
+        stream.write_f2dot14_array([value for axis_value_map in segment_map for value in axis_value_map])
+    return stream.get_value()
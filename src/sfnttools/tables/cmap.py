@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import os
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from itertools import chain
+from typing import Any
+
+from sfnttools.directory import calculate_search_params
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+CMAP_ENCODING_RECORD_SCHEMA = RecordSchema('CmapEncodingRecord', [
+    ('platform_id', 'uint16'),
+    ('encoding_id', 'uint16'),
+    ('subtable_offset', 'offset32'),
+])
+
+UNICODE_ENCODING_PRIORITIES = [(3, 10), (0, 6), (0, 4), (3, 1), (0, 3), (0, 2), (0, 1), (0, 0)]
+
+_INDEXABLE_FORMATS = (4, 12)
+
+
+class CmapIndex:
+    starts: array
+    ends: array
+    deltas: array
+    range_starts: array
+    glyph_ids: array
+    glyph_mask: int
+
+    @staticmethod
+    def from_format_4(data: bytes | memoryview) -> CmapIndex:
+        stream = BufferStream(data)
+        if stream.read_uint16() != 4:
+            raise ValueError('not a format 4 cmap subtable')
+        length = stream.read_uint16()
+        stream.read_uint16()
+        seg_count = stream.read_uint16() // 2
+        stream.seek(6, os.SEEK_CUR)
+        end_codes = stream.read_uint16_array(seg_count)
+        stream.read_uint16()
+        start_codes = stream.read_uint16_array(seg_count)
+        id_deltas = stream.read_int16_array(seg_count)
+        id_range_offsets = stream.read_uint16_array(seg_count)
+        glyph_ids = stream.read_uint16_array(max(0, min(length, len(stream)) - stream.tell()) // 2)
+
+        range_starts = array('i', [-1] * seg_count)
+        for index, id_range_offset in enumerate(id_range_offsets):
+            if id_range_offset != 0:
+                range_starts[index] = id_range_offset // 2 - (seg_count - index)
+        return CmapIndex(array('I', start_codes), array('I', end_codes), array('i', id_deltas), range_starts, glyph_ids, 0xFFFF)
+
+    @staticmethod
+    def from_format_12(data: bytes | memoryview) -> CmapIndex:
+        stream = BufferStream(data)
+        if stream.read_uint16() != 12:
+            raise ValueError('not a format 12 cmap subtable')
+        stream.seek(10, os.SEEK_CUR)
+        num_groups = stream.read_uint32()
+        groups = stream.read_uint32_array(num_groups * 3)
+        starts = array('I', groups[0::3])
+        deltas = array('i', [start_glyph_id - start for start, start_glyph_id in zip(starts, groups[2::3])])
+        return CmapIndex(starts, array('I', groups[1::3]), deltas, array('i', [-1] * num_groups), array('H'), 0xFFFFFFFF)
+
+    def __init__(self, starts: array, ends: array, deltas: array, range_starts: array, glyph_ids: array, glyph_mask: int):
+        self.starts = starts
+        self.ends = ends
+        self.deltas = deltas
+        self.range_starts = range_starts
+        self.glyph_ids = glyph_ids
+        self.glyph_mask = glyph_mask
+
+    def _map_in_segment(self, index: int, code_point: int) -> int:
+        range_start = self.range_starts[index]
+        if range_start < 0:
+            return (code_point + self.deltas[index]) & self.glyph_mask
+        glyph_id_index = range_start + code_point - self.starts[index]
+        if not 0 <= glyph_id_index < len(self.glyph_ids):
+            return 0
+        glyph_index = self.glyph_ids[glyph_id_index]
+        if glyph_index == 0:
+            return 0
+        return (glyph_index + self.deltas[index]) & self.glyph_mask
+
+    def lookup(self, code_point: int) -> int:
+        index = bisect_right(self.starts, code_point) - 1
+        if index < 0 or code_point > self.ends[index]:
+            return 0
+        return self._map_in_segment(index, code_point)
+
+    def map_many(self, code_points: Iterable[int]) -> list[int]:
+        starts = self.starts
+        ends = self.ends
+        map_in_segment = self._map_in_segment
+        glyph_indices = []
+        for code_point in code_points:
+            index = bisect_right(starts, code_point) - 1
+            if index < 0 or code_point > ends[index]:
+                glyph_indices.append(0)
+            else:
+                glyph_indices.append(map_in_segment(index, code_point))
+        return glyph_indices
+
+    def iter_mappings(self) -> Iterator[tuple[int, int]]:
+        for index, (start, end) in enumerate(zip(self.starts, self.ends)):
+            for code_point in range(start, end + 1):
+                glyph_index = self._map_in_segment(index, code_point)
+                if glyph_index != 0:
+                    yield code_point, glyph_index
+
+
+    def iter_ranges(self) -> Iterator[tuple[int, int]]:
+        for index, (start, end) in enumerate(zip(self.starts, self.ends)):
+            if self.range_starts[index] < 0:
+                unmapped_code_point = -self.deltas[index] & self.glyph_mask
+                if start <= unmapped_code_point <= end:
+                    if start < unmapped_code_point:
+                        yield start, unmapped_code_point - 1
+                    if unmapped_code_point < end:
+                        yield unmapped_code_point + 1, end
+                else:
+                    yield start, end
+            else:
+                range_start = None
+                for code_point in range(start, end + 1):
+                    if self._map_in_segment(index, code_point) != 0:
+                        if range_start is None:
+                            range_start = code_point
+                    elif range_start is not None:
+                        yield range_start, code_point - 1
+                        range_start = None
+                if range_start is not None:
+                    yield range_start, end
+
+
+class CmapTable:
+    version: int
+    encoding_records: list[Any]
+    data: bytes | memoryview
+    _indices: dict[int, CmapIndex]
+
+    def __init__(self, version: int, encoding_records: list[Any], data: bytes | memoryview):
+        self.version = version
+        self.encoding_records = encoding_records
+        self.data = data
+        self._indices = {}
+
+    def get_subtable_format(self, encoding_record: Any) -> int:
+        return int.from_bytes(self.data[encoding_record.subtable_offset:encoding_record.subtable_offset + 2], 'big', signed=False)
+
+    def find_encoding_record(self, platform_id: int | None = None, encoding_id: int | None = None) -> Any | None:
+        if platform_id is not None:
+            priorities = [(platform_id, encoding_id)]
+        else:
+            priorities = UNICODE_ENCODING_PRIORITIES
+        for priority_platform_id, priority_encoding_id in priorities:
+            for encoding_record in self.encoding_records:
+                if encoding_record.platform_id != priority_platform_id:
+                    continue
+                if priority_encoding_id is not None and encoding_record.encoding_id != priority_encoding_id:
+                    continue
+                if self.get_subtable_format(encoding_record) in _INDEXABLE_FORMATS:
+                    return encoding_record
+        return None
+
+    def get_index(self, platform_id: int | None = None, encoding_id: int | None = None) -> CmapIndex | None:
+        encoding_record = self.find_encoding_record(platform_id, encoding_id)
+        if encoding_record is None:
+            return None
+        offset = encoding_record.subtable_offset
+        if offset not in self._indices:
+            subtable_data = self.data[offset:]
+            if self.get_subtable_format(encoding_record) == 4:
+                self._indices[offset] = CmapIndex.from_format_4(subtable_data)
+            else:
+                self._indices[offset] = CmapIndex.from_format_12(subtable_data)
+        return self._indices[offset]
+
+
+def parse_cmap_table(data: bytes | memoryview) -> CmapTable:
+    stream = BufferStream(data)
+    version = stream.read_uint16()
+    if version != 0:
+        raise ValueError(f"unknown 'cmap' table version: {version}")
+    num_tables = stream.read_uint16()
+    encoding_records = stream.read_records(CMAP_ENCODING_RECORD_SCHEMA, num_tables)
+    for encoding_record in encoding_records:
+        if encoding_record.subtable_offset + 2 > len(data):
+            raise EOFError()
+    return CmapTable(version, encoding_records, data)
+
+
+def _build_format_4_subtable(mapping: dict[int, int]) -> bytes | None:
+    segments = []
+    for code_point, glyph_index in sorted(mapping.items()):
+        if code_point > 0xFFFF:
+            break
+        if code_point == 0xFFFF:
+            continue
+        if len(segments) > 0 and segments[-1][1] == code_point - 1 and segments[-1][2] == glyph_index - code_point:
+            segments[-1][1] = code_point
+        else:
+            segments.append([code_point, code_point, glyph_index - code_point])
+    segments.append([0xFFFF, 0xFFFF, 1])
+    seg_count = len(segments)
+    length = 16 + seg_count * 8
+    if length > 0xFFFF:
+        return None
+
+    search_range, entry_selector, range_shift = calculate_search_params(seg_count, 2)
+    stream = BufferedStream()
+    stream.write_uint16(4)
+    stream.write_uint16(length)
+    stream.write_uint16(0)
+    stream.write_uint16(seg_count * 2)
+    stream.write_uint16(search_range)
+    stream.write_uint16(entry_selector)
+    stream.write_uint16(range_shift)
+    stream.write_uint16_array([end_code for _, end_code, _ in segments])
+    stream.write_uint16(0)
+    stream.write_uint16_array([start_code for start_code, _, _ in segments])
+    stream.write_uint16_array([id_delta & 0xFFFF for _, _, id_delta in segments])
+    stream.write_nulls(seg_count * 2)
+    return stream.get_value()
+
+
+def _build_format_12_subtable(mapping: dict[int, int]) -> bytes:
+    groups = []
+    for code_point, glyph_index in sorted(mapping.items()):
+        if len(groups) > 0 and groups[-1][1] == code_point - 1 and groups[-1][2] + code_point - groups[-1][0] == glyph_index:
+            groups[-1][1] = code_point
+        else:
+            groups.append([code_point, code_point, glyph_index])
+
+    stream = BufferedStream()
+    stream.write_uint16(12)
+    stream.write_uint16(0)
+    stream.write_uint32(16 + len(groups) * 12)
+    stream.write_uint32(0)
+    stream.write_uint32(len(groups))
+    stream.write_uint32_array(chain.from_iterable(groups))
+    return stream.get_value()
+
+
+def build_cmap_table(mapping: dict[int, int]) -> bytes:
+    mapping = {code_point: glyph_index for code_point, glyph_index in mapping.items() if glyph_index != 0}
+    subtables = []
+    format_4_data = _build_format_4_subtable(mapping)
+    if format_4_data is not None:
+        subtables.append(((3, 1), format_4_data))
+    if format_4_data is None or any(code_point > 0xFFFF for code_point in mapping):
+        subtables.append(((3, 10), _build_format_12_subtable(mapping)))
+
+    stream = BufferedStream()
+    stream.write_uint16(0)
+    stream.write_uint16(len(subtables))
+    offset = 4 + CMAP_ENCODING_RECORD_SCHEMA.size * len(subtables)
+    for (platform_id, encoding_id), subtable_data in subtables:
+        stream.write_record(CMAP_ENCODING_RECORD_SCHEMA, CMAP_ENCODING_RECORD_SCHEMA.new_record(platform_id, encoding_id, offset))
+        offset += len(subtable_data)
+    for _, subtable_data in subtables:
+        stream.write(subtable_data)
+    return stream.get_value()
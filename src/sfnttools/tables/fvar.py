@@ -0,0 +1,129 @@
+from collections.abc import Mapping
+from typing import Any
+
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+FVAR_HEADER_SCHEMA = RecordSchema('FvarHeader', [
+    ('major_version', 'uint16'),
+    ('minor_version', 'uint16'),
+    ('axes_array_offset', 'offset16'),
+    ('reserved', 'uint16'),
+    ('axis_count', 'uint16'),
+    ('axis_size', 'uint16'),
+    ('instance_count', 'uint16'),
+    ('instance_size', 'uint16'),
+])
+
+VARIATION_AXIS_RECORD_SCHEMA = RecordSchema('VariationAxisRecord', [
+    ('axis_tag', 'tag'),
+    ('min_value', 'fixed'),
+    ('default_value', 'fixed'),
+    ('max_value', 'fixed'),
+    ('flags', 'uint16'),
+    ('axis_name_id', 'uint16'),
+])
+
+
+class FvarInstance:
+    subfamily_name_id: int
+    flags: int
+    coordinates: list[float]
+    post_script_name_id: int | None
+
+    def __init__(self, subfamily_name_id: int, flags: int, coordinates: list[float], post_script_name_id: int | None = None):
+        self.subfamily_name_id = subfamily_name_id
+        self.flags = flags
+        self.coordinates = coordinates
+        self.post_script_name_id = post_script_name_id
+
+    def __repr__(self) -> str:
+        return f'FvarInstance({self.subfamily_name_id}, {self.flags}, {self.coordinates!r}, {self.post_script_name_id!r})'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FvarInstance):
+            return NotImplemented
+        return (self.subfamily_name_id == other.subfamily_name_id and
+                self.flags == other.flags and
+                self.coordinates == other.coordinates and
+                self.post_script_name_id == other.post_script_name_id)
+
+
+def normalize_axis_value(value: float, min_value: float, default_value: float, max_value: float) -> float:
+    value = max(min_value, min(value, max_value))
+    if value < default_value:
+        return (value - default_value) / (default_value - min_value)
+    elif value > default_value:
+        return (value - default_value) / (max_value - default_value)
+    return 0.0
+
+
+class FvarTable:
+    axes: list[Any]
+    instances: list[FvarInstance]
+
+    def __init__(self, axes: list[Any] | None = None, instances: list[FvarInstance] | None = None):
+        self.axes = [] if axes is None else axes
+        self.instances = [] if instances is None else instances
+
+    @property
+    def axis_tags(self) -> list[str]:
+        return [axis.axis_tag for axis in self.axes]
+
+    def normalize_location(self, location: Mapping[str, float]) -> list[float]:
+        unknown_tags = set(location) - set(self.axis_tags)
+        if len(unknown_tags) > 0:
+            raise ValueError(f'unknown axes: {sorted(unknown_tags)!r}')
+        return [
+            normalize_axis_value(location[axis.axis_tag], axis.min_value, axis.default_value, axis.max_value) if axis.axis_tag in location else 0.0
+            for axis in self.axes
+        ]
+
+
+def parse_fvar_table(data: bytes | memoryview) -> FvarTable:
+    stream = BufferStream(data)
+    header = stream.read_record(FVAR_HEADER_SCHEMA)
+    if header.major_version != 1:
+        raise ValueError(f'unsupported fvar version: {header.major_version}.{header.minor_version}')
+    if header.axis_size != VARIATION_AXIS_RECORD_SCHEMA.size:
+        raise ValueError(f'bad fvar axis size: {header.axis_size}')
+    coordinates_size = header.axis_count * 4
+    if header.instance_size not in (coordinates_size + 4, coordinates_size + 6):
+        raise ValueError(f'bad fvar instance size: {header.instance_size}')
+
+    stream.seek(header.axes_array_offset)
+    axes = stream.read_records(VARIATION_AXIS_RECORD_SCHEMA, header.axis_count)
+    instances = []
+    for _ in range(header.instance_count):
+        subfamily_name_id = stream.read_uint16()
+        flags = stream.read_uint16()
+        coordinates = list(stream.read_fixed_array(header.axis_count))
+        post_script_name_id = stream.read_uint16() if header.instance_size == coordinates_size + 6 else None
+        instances.append(FvarInstance(subfamily_name_id, flags, coordinates, post_script_name_id))
+    return FvarTable(axes, instances)
+
+
+def dump_fvar_table(table: FvarTable) -> bytes:
+    has_post_script_name_ids = any(instance.post_script_name_id is not None for instance in table.instances)
+    instance_size = len(table.axes) * 4 + (6 if has_post_script_name_ids else 4)
+    stream = BufferedStream()
+    stream.write_record(FVAR_HEADER_SCHEMA, FVAR_HEADER_SCHEMA.new_record(
+        1,
+        0,
+        FVAR_HEADER_SCHEMA.size,
+        2,
+        len(table.axes),
+        VARIATION_AXIS_RECORD_SCHEMA.size,
+        len(table.instances),
+        instance_size,
+    ))
+    stream.write_records(VARIATION_AXIS_RECORD_SCHEMA, table.axes)
+    for instance in table.instances:
+        if len(instance.coordinates) != len(table.axes):
+            raise ValueError('instance coordinates do not match the axis count')
+        stream.write_uint16(instance.subfamily_name_id)
+        stream.write_uint16(instance.flags)
+        stream.write_fixed_array(instance.coordinates)
+        if has_post_script_name_ids:
+            stream.write_uint16(0xFFFF if instance.post_script_name_id is None else instance.post_script_name_id)
+    return stream.get_value()
@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from itertools import chain, groupby
+from operator import sub
+
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+GLYPH_HEADER_SCHEMA = RecordSchema('GlyphHeader', [
+    ('number_of_contours', 'int16'),
+    ('x_min', 'int16'),
+    ('y_min', 'int16'),
+    ('x_max', 'int16'),
+    ('y_max', 'int16'),
+])
+
+FLAG_ON_CURVE_POINT = 0x01
+FLAG_X_SHORT_VECTOR = 0x02
+FLAG_Y_SHORT_VECTOR = 0x04
+FLAG_REPEAT = 0x08
+FLAG_X_IS_SAME_OR_POSITIVE_X_SHORT_VECTOR = 0x10
+FLAG_Y_IS_SAME_OR_POSITIVE_Y_SHORT_VECTOR = 0x20
+FLAG_OVERLAP_SIMPLE = 0x40
+
+COMPONENT_FLAG_ARG_1_AND_2_ARE_WORDS = 0x0001
+COMPONENT_FLAG_ARGS_ARE_XY_VALUES = 0x0002
+COMPONENT_FLAG_WE_HAVE_A_SCALE = 0x0008
+COMPONENT_FLAG_MORE_COMPONENTS = 0x0020
+COMPONENT_FLAG_WE_HAVE_AN_X_AND_Y_SCALE = 0x0040
+COMPONENT_FLAG_WE_HAVE_A_TWO_BY_TWO = 0x0080
+COMPONENT_FLAG_WE_HAVE_INSTRUCTIONS = 0x0100
+
+
+def _encode_deltas(coordinates: list[int] | array, short_vector_flag: int, same_or_positive_flag: int) -> tuple[list[int], bytearray]:
+    flags = []
+    data = bytearray()
+    for delta in map(sub, coordinates, chain((0,), coordinates)):
+        if delta == 0:
+            flags.append(same_or_positive_flag)
+        elif -0xFF <= delta <= 0xFF:
+            if delta > 0:
+                flags.append(short_vector_flag | same_or_positive_flag)
+                data.append(delta)
+            else:
+                flags.append(short_vector_flag)
+                data.append(-delta)
+        else:
+            flags.append(0)
+            data += delta.to_bytes(2, 'big', signed=True)
+    return flags, data
+
+
+def _compress_flags(flags: list[int]) -> bytearray:
+    data = bytearray()
+    for flag, group in groupby(flags):
+        count = sum(1 for _ in group)
+        while count > 1:
+            repeat_count = min(count, 0x100)
+            data.append(flag | FLAG_REPEAT)
+            data.append(repeat_count - 1)
+            count -= repeat_count
+        if count == 1:
+            data.append(flag)
+    return data
+
+
+def encode_simple_glyph_data(
+        end_points: list[int] | array,
+        instructions: bytes | memoryview,
+        on_curves: bytes | bytearray,
+        x_coordinates: list[int] | array,
+        y_coordinates: list[int] | array,
+        overlap_simple: bool = False,
+) -> bytes:
+    x_flags, x_data = _encode_deltas(x_coordinates, FLAG_X_SHORT_VECTOR, FLAG_X_IS_SAME_OR_POSITIVE_X_SHORT_VECTOR)
+    y_flags, y_data = _encode_deltas(y_coordinates, FLAG_Y_SHORT_VECTOR, FLAG_Y_IS_SAME_OR_POSITIVE_Y_SHORT_VECTOR)
+    flags = [(FLAG_ON_CURVE_POINT if on_curve else 0) | x_flag | y_flag for on_curve, x_flag, y_flag in zip(on_curves, x_flags, y_flags)]
+    if overlap_simple and len(flags) > 0:
+        flags[0] |= FLAG_OVERLAP_SIMPLE
+
+    stream = BufferedStream()
+    stream.write_uint16_array(end_points)
+    stream.write_uint16(len(instructions))
+    stream.write(instructions)
+    stream.write(_compress_flags(flags))
+    stream.write(x_data)
+    stream.write(y_data)
+    return stream.get_value()
+
+
+def decode_simple_glyph_data(data: bytes | memoryview, n_contours: int) -> tuple[array, memoryview, bytearray, array, array, bool]:
+    stream = BufferStream(data)
+    end_points = stream.read_uint16_array(n_contours)
+    point_count = end_points[-1] + 1 if n_contours > 0 else 0
+    instruction_length = stream.read_uint16()
+    instructions = stream.read_view(instruction_length)
+
+    view = stream.buffer
+    offset = stream.tell()
+    flags = bytearray()
+    try:
+        while len(flags) < point_count:
+            flag = view[offset]
+            offset += 1
+            if flag & FLAG_REPEAT:
+                flags += bytes([flag]) * (view[offset] + 1)
+                offset += 1
+            else:
+                flags.append(flag)
+        del flags[point_count:]
+
+        x_coordinates = array('i')
+        x = 0
+        for flag in flags:
+            if flag & FLAG_X_SHORT_VECTOR:
+                if flag & FLAG_X_IS_SAME_OR_POSITIVE_X_SHORT_VECTOR:
+                    x += view[offset]
+                else:
+                    x -= view[offset]
+                offset += 1
+            elif not flag & FLAG_X_IS_SAME_OR_POSITIVE_X_SHORT_VECTOR:
+                x += int.from_bytes(view[offset:offset + 2], 'big', signed=True)
+                offset += 2
+            x_coordinates.append(x)
+
+        y_coordinates = array('i')
+        y = 0
+        for flag in flags:
+            if flag & FLAG_Y_SHORT_VECTOR:
+                if flag & FLAG_Y_IS_SAME_OR_POSITIVE_Y_SHORT_VECTOR:
+                    y += view[offset]
+                else:
+                    y -= view[offset]
+                offset += 1
+            elif not flag & FLAG_Y_IS_SAME_OR_POSITIVE_Y_SHORT_VECTOR:
+                y += int.from_bytes(view[offset:offset + 2], 'big', signed=True)
+                offset += 2
+            y_coordinates.append(y)
+    except IndexError as e:
+        raise EOFError() from e
+    if offset > len(view):
+        raise EOFError()
+
+    on_curves = bytearray(flag & FLAG_ON_CURVE_POINT for flag in flags)
+    overlap_simple = point_count > 0 and bool(flags[0] & FLAG_OVERLAP_SIMPLE)
+    return end_points, instructions, on_curves, x_coordinates, y_coordinates, overlap_simple
+
+
+def calculate_composite_glyph_size(data: memoryview, offset: int) -> tuple[int, bool]:
+    start = offset
+    have_instructions = False
+    while True:
+        if offset + 2 > len(data):
+            raise EOFError()
+        flags = (data[offset] << 8) | data[offset + 1]
+        offset += 4
+        offset += 4 if flags & COMPONENT_FLAG_ARG_1_AND_2_ARE_WORDS else 2
+        if flags & COMPONENT_FLAG_WE_HAVE_A_SCALE:
+            offset += 2
+        elif flags & COMPONENT_FLAG_WE_HAVE_AN_X_AND_Y_SCALE:
+            offset += 4
+        elif flags & COMPONENT_FLAG_WE_HAVE_A_TWO_BY_TWO:
+            offset += 8
+        if flags & COMPONENT_FLAG_WE_HAVE_INSTRUCTIONS:
+            have_instructions = True
+        if not flags & COMPONENT_FLAG_MORE_COMPONENTS:
+            break
+    if offset > len(data):
+        raise EOFError()
+    return offset - start, have_instructions
+
+
+def iter_components(data: bytes | memoryview) -> Iterator[tuple[int, int, int]]:
+    offset = 0
+    while True:
+        if offset + 4 > len(data):
+            raise EOFError()
+        flags = int.from_bytes(data[offset:offset + 2], 'big', signed=False)
+        yield offset, flags, int.from_bytes(data[offset + 2:offset + 4], 'big', signed=False)
+        offset += 4
+        offset += 4 if flags & COMPONENT_FLAG_ARG_1_AND_2_ARE_WORDS else 2
+        if flags & COMPONENT_FLAG_WE_HAVE_A_SCALE:
+            offset += 2
+        elif flags & COMPONENT_FLAG_WE_HAVE_AN_X_AND_Y_SCALE:
+            offset += 4
+        elif flags & COMPONENT_FLAG_WE_HAVE_A_TWO_BY_TWO:
+            offset += 8
+        if not flags & COMPONENT_FLAG_MORE_COMPONENTS:
+            break
+
+
+def read_loca_offsets(loca: bytes | memoryview, index_format: int, num_glyphs: int) -> array:
+    stream = BufferStream(loca)
+    if index_format == 0:
+        return array('I', [offset << 1 for offset in stream.read_uint16_array(num_glyphs + 1)])
+    else:
+        return array('I', stream.read_uint32_array(num_glyphs + 1))
+
+
+class SimpleGlyph:
+    x_min: int
+    y_min: int
+    x_max: int
+    y_max: int
+    end_points: array
+    instructions: bytes
+    on_curves: bytearray
+    x_coordinates: array
+    y_coordinates: array
+    overlap_simple: bool
+
+    def __init__(
+            self,
+            x_min: int,
+            y_min: int,
+            x_max: int,
+            y_max: int,
+            end_points: array,
+            instructions: bytes,
+            on_curves: bytearray,
+            x_coordinates: array,
+            y_coordinates: array,
+            overlap_simple: bool = False,
+    ):
+        self.x_min = x_min
+        self.y_min = y_min
+        self.x_max = x_max
+        self.y_max = y_max
+        self.end_points = end_points
+        self.instructions = instructions
+        self.on_curves = on_curves
+        self.x_coordinates = x_coordinates
+        self.y_coordinates = y_coordinates
+        self.overlap_simple = overlap_simple
+
+    @property
+    def number_of_contours(self) -> int:
+        return len(self.end_points)
+
+    @property
+    def point_count(self) -> int:
+        return len(self.x_coordinates)
+
+    def recalculate_bounds(self):
+        if self.point_count > 0:
+            self.x_min = min(self.x_coordinates)
+            self.y_min = min(self.y_coordinates)
+            self.x_max = max(self.x_coordinates)
+            self.y_max = max(self.y_coordinates)
+        else:
+            self.x_min = self.y_min = self.x_max = self.y_max = 0
+
+    def dump(self) -> bytes:
+        return GLYPH_HEADER_SCHEMA.pack(GLYPH_HEADER_SCHEMA.new_record(
+            self.number_of_contours,
+            self.x_min,
+            self.y_min,
+            self.x_max,
+            self.y_max,
+        )) + encode_simple_glyph_data(self.end_points, self.instructions, self.on_curves, self.x_coordinates, self.y_coordinates, self.overlap_simple)
+
+
+class CompositeGlyph:
+    x_min: int
+    y_min: int
+    x_max: int
+    y_max: int
+    data: bytes
+
+    def __init__(self, x_min: int, y_min: int, x_max: int, y_max: int, data: bytes):
+        self.x_min = x_min
+        self.y_min = y_min
+        self.x_max = x_max
+        self.y_max = y_max
+        self.data = data
+
+    @property
+    def number_of_contours(self) -> int:
+        return -1
+
+    @property
+    def component_glyph_indices(self) -> list[int]:
+        return [glyph_index for _, _, glyph_index in iter_components(self.data)]
+
+    def dump(self) -> bytes:
+        return GLYPH_HEADER_SCHEMA.pack(GLYPH_HEADER_SCHEMA.new_record(-1, self.x_min, self.y_min, self.x_max, self.y_max)) + self.data
+
+
+def parse_glyph(data: bytes | memoryview) -> SimpleGlyph | CompositeGlyph | None:
+    if len(data) == 0:
+        return None
+    header = GLYPH_HEADER_SCHEMA.unpack_from(data, 0)
+    if header.number_of_contours >= 0:
+        end_points, instructions, on_curves, x_coordinates, y_coordinates, overlap_simple = decode_simple_glyph_data(memoryview(data)[GLYPH_HEADER_SCHEMA.size:], header.number_of_contours)
+        return SimpleGlyph(
+            header.x_min,
+            header.y_min,
+            header.x_max,
+            header.y_max,
+            array('H', end_points),
+            bytes(instructions),
+            on_curves,
+            array('h', x_coordinates),
+            array('h', y_coordinates),
+            overlap_simple,
+        )
+    elif header.number_of_contours == -1:
+        data = memoryview(data)[GLYPH_HEADER_SCHEMA.size:]
+        size, have_instructions = calculate_composite_glyph_size(data, 0)
+        if have_instructions:
+            size += 2 + int.from_bytes(data[size:size + 2], 'big', signed=False)
+            if size > len(data):
+                raise EOFError()
+        return CompositeGlyph(header.x_min, header.y_min, header.x_max, header.y_max, bytes(data[:size]))
+    else:
+        raise ValueError(f'illegal number of contours: {header.number_of_contours}')
+
+
+class GlyfTable:
+    data: bytes | memoryview
+    offsets: array
+    _glyphs: dict[int, SimpleGlyph | CompositeGlyph | None]
+
+    def __init__(self, data: bytes | memoryview, offsets: array):
+        self.data = data
+        self.offsets = offsets
+        self._glyphs = {}
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def get_glyph_data(self, glyph_index: int) -> memoryview:
+        if glyph_index in self._glyphs:
+            glyph = self._glyphs[glyph_index]
+            return memoryview(b'' if glyph is None else glyph.dump())
+        start, end = self.offsets[glyph_index], self.offsets[glyph_index + 1]
+        if end < start or end > len(self.data):
+            raise ValueError(f'bad loca offsets for glyph {glyph_index}')
+        return memoryview(self.data)[start:end]
+
+    def get_glyph(self, glyph_index: int) -> SimpleGlyph | CompositeGlyph | None:
+        if glyph_index in self._glyphs:
+            return self._glyphs[glyph_index]
+        return parse_glyph(self.get_glyph_data(glyph_index))
+
+    def set_glyph(self, glyph_index: int, glyph: SimpleGlyph | CompositeGlyph | None):
+        if not 0 <= glyph_index < len(self):
+            raise IndexError(f'glyph index out of range: {glyph_index}')
+        self._glyphs[glyph_index] = glyph
+
+
+def parse_glyf_table(glyf: bytes | memoryview, loca: bytes | memoryview, index_format: int, num_glyphs: int) -> GlyfTable:
+    return GlyfTable(glyf, read_loca_offsets(loca, index_format, num_glyphs))
+
+
+def dump_glyf_table(table: GlyfTable, index_format: int) -> tuple[bytes, bytes]:
+    glyf = BufferedStream()
+    offsets = array('I')
+    for glyph_index in range(len(table)):
+        offsets.append(glyf.tell())
+        glyph_data = table.get_glyph_data(glyph_index)
+        if len(glyph_data) > 0:
+            glyf.write(glyph_data)
+            glyf.align_to_4_byte_with_nulls()
+    offsets.append(glyf.tell())
+
+    loca = BufferedStream()
+    if index_format == 0:
+        if offsets[-1] > 0x1FFFE:
+            raise ValueError("glyf table is too large for short 'loca' format")
+        loca.write_uint16_array([offset >> 1 for offset in offsets])
+    else:
+        loca.write_uint32_array(offsets)
+    return glyf.get_value(), loca.get_value()
@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+GVAR_HEADER_SCHEMA = RecordSchema('GvarHeader', [
+    ('major_version', 'uint16'),
+    ('minor_version', 'uint16'),
+    ('axis_count', 'uint16'),
+    ('shared_tuple_count', 'uint16'),
+    ('shared_tuples_offset', 'offset32'),
+    ('glyph_count', 'uint16'),
+    ('flags', 'uint16'),
+    ('glyph_variation_data_array_offset', 'offset32'),
+])
+
+GVAR_FLAG_LONG_OFFSETS = 0x0001
+
+TUPLE_VARIATION_FLAG_SHARED_POINT_NUMBERS = 0x8000
+TUPLE_VARIATION_COUNT_MASK = 0x0FFF
+
+TUPLE_INDEX_FLAG_EMBEDDED_PEAK_TUPLE = 0x8000
+TUPLE_INDEX_FLAG_INTERMEDIATE_REGION = 0x4000
+TUPLE_INDEX_FLAG_PRIVATE_POINT_NUMBERS = 0x2000
+TUPLE_INDEX_MASK = 0x0FFF
+
+POINTS_ARE_WORDS = 0x80
+POINT_RUN_COUNT_MASK = 0x7F
+
+DELTAS_ARE_ZERO = 0x80
+DELTAS_ARE_WORDS = 0x40
+DELTAS_ARE_LONGS = 0xC0
+DELTA_RUN_COUNT_MASK = 0x3F
+
+_INT32_TYPECODE = 'i' if array('i').itemsize == 4 else 'l'
+
+
+def read_packed_point_numbers(stream: BufferStream) -> array | None:
+    count = stream.read_uint8()
+    if count == 0:
+        return None
+    if count & POINTS_ARE_WORDS:
+        count = ((count & POINT_RUN_COUNT_MASK) << 8) | stream.read_uint8()
+    differences = array('H')
+    while len(differences) < count:
+        control = stream.read_uint8()
+        run_count = (control & POINT_RUN_COUNT_MASK) + 1
+        if control & POINTS_ARE_WORDS:
+            differences.extend(stream.read_uint16_array(run_count))
+        else:
+            differences.fromlist(stream.read_uint8_array(run_count).tolist())
+    if len(differences) != count:
+        raise ValueError('packed point numbers overrun their count')
+    return array('H', accumulate(differences))
+
+
+def read_packed_deltas(stream: BufferStream, count: int) -> array:
+    deltas = array(_INT32_TYPECODE)
+    while len(deltas) < count:
+        control = stream.read_uint8()
+        run_count = (control & DELTA_RUN_COUNT_MASK) + 1
+        run_type = control & DELTAS_ARE_LONGS
+        if run_type == DELTAS_ARE_ZERO:
+            deltas.frombytes(bytes(run_count * deltas.itemsize))
+        elif run_type == DELTAS_ARE_WORDS:
+            deltas.fromlist(stream.read_int16_array(run_count).tolist())
+        elif run_type == DELTAS_ARE_LONGS:
+            deltas.fromlist(stream.read_int32_array(run_count).tolist())
+        else:
+            deltas.fromlist(stream.read_int8_array(run_count).tolist())
+    if len(deltas) != count:
+        raise ValueError('packed deltas overrun their count')
+    return deltas
+
+
+def encode_packed_point_numbers(point_numbers: Sequence[int] | None) -> bytes:
+    if point_numbers is None:
+        return b'\x00'
+    stream = BufferedStream()
+    count = len(point_numbers)
+    if count < POINTS_ARE_WORDS:
+        stream.write_uint8(count)
+    else:
+        stream.write_uint16(count | (POINTS_ARE_WORDS << 8))
+    differences = [point_number - previous_point_number for point_number, previous_point_number in zip(point_numbers, [0, *point_numbers])]
+    index = 0
+    while index < count:
+        words = differences[index] > 0xFF
+        run_end = index + 1
+        while run_end < count and run_end - index <= POINT_RUN_COUNT_MASK and (differences[run_end] > 0xFF) == words:
+            run_end += 1
+        if words:
+            stream.write_uint8(POINTS_ARE_WORDS | (run_end - index - 1))
+            stream.write_uint16_array(differences[index:run_end])
+        else:
+            stream.write_uint8(run_end - index - 1)
+            stream.write_uint8_array(differences[index:run_end])
+        index = run_end
+    return stream.get_value()
+
+
+def _get_delta_run_type(delta: int) -> int:
+    if delta == 0:
+        return DELTAS_ARE_ZERO
+    elif -0x80 <= delta <= 0x7F:
+        return 0
+    elif -0x8000 <= delta <= 0x7FFF:
+        return DELTAS_ARE_WORDS
+    return DELTAS_ARE_LONGS
+
+
+def encode_packed_deltas(deltas: Sequence[int]) -> bytes:
+    stream = BufferedStream()
+    run_types = [_get_delta_run_type(delta) for delta in deltas]
+    index = 0
+    while index < len(deltas):
+        run_type = run_types[index]
+        run_end = index + 1
+        while run_end < len(deltas) and run_end - index <= DELTA_RUN_COUNT_MASK and run_types[run_end] == run_type:
+            run_end += 1
+        stream.write_uint8(run_type | (run_end - index - 1))
+        if run_type == DELTAS_ARE_WORDS:
+            stream.write_int16_array(deltas[index:run_end])
+        elif run_type == DELTAS_ARE_LONGS:
+            stream.write_int32_array(deltas[index:run_end])
+        elif run_type == 0:
+            stream.write_int8_array(deltas[index:run_end])
+        index = run_end
+    return stream.get_value()
+
+
+def calculate_tuple_scalar(coordinates: Sequence[float], peak: Sequence[float], start: Sequence[float] | None = None, end: Sequence[float] | None = None) -> float:
+    scalar = 1.0
+    for axis_index, peak_value in enumerate(peak):
+        if peak_value == 0:
+            continue
+        value = coordinates[axis_index]
+        if value == peak_value:
+            continue
+        if start is not None:
+            start_value = start[axis_index]
+            end_value = end[axis_index]
+            if start_value > peak_value or peak_value > end_value or (start_value < 0 < end_value):
+                continue
+            if value < start_value or value > end_value:
+                return 0.0
+            if value < peak_value:
+                scalar *= (value - start_value) / (peak_value - start_value)
+            else:
+                scalar *= (end_value - value) / (end_value - peak_value)
+        else:
+            if value == 0 or value < min(0.0, peak_value) or value > max(0.0, peak_value):
+                return 0.0
+            scalar *= value / peak_value
+    return scalar
+
+
+class TupleVariation:
+    peak: tuple[float, ...]
+    start: tuple[float, ...] | None
+    end: tuple[float, ...] | None
+    point_numbers: array | None
+    x_deltas: array
+    y_deltas: array
+
+    def __init__(
+            self,
+            peak: tuple[float, ...],
+            x_deltas: array,
+            y_deltas: array,
+            point_numbers: array | None = None,
+            start: tuple[float, ...] | None = None,
+            end: tuple[float, ...] | None = None,
+    ):
+        self.peak = peak
+        self.start = start
+        self.end = end
+        self.point_numbers = point_numbers
+        self.x_deltas = x_deltas
+        self.y_deltas = y_deltas
+
+    def __repr__(self) -> str:
+        return f'TupleVariation({self.peak!r}, {self.x_deltas!r}, {self.y_deltas!r}, point_numbers={self.point_numbers!r}, start={self.start!r}, end={self.end!r})'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TupleVariation):
+            return NotImplemented
+        return (self.peak == other.peak and
+                self.start == other.start and
+                self.end == other.end and
+                self.point_numbers == other.point_numbers and
+                self.x_deltas == other.x_deltas and
+                self.y_deltas == other.y_deltas)
+
+    def calculate_scalar(self, coordinates: Sequence[float]) -> float:
+        return calculate_tuple_scalar(coordinates, self.peak, self.start, self.end)
+
+
+def decode_glyph_variation_data(
+        data: bytes | memoryview,
+        axis_count: int,
+        shared_tuples: Sequence[tuple[float, ...]],
+        point_count: int,
+        coordinates: Sequence[float] | None = None,
+) -> list[TupleVariation]:
+    if len(data) == 0:
+        return []
+    stream = BufferStream(data)
+    tuple_variation_count = stream.read_uint16()
+    data_offset = stream.read_offset16()
+    headers = []
+    for _ in range(tuple_variation_count & TUPLE_VARIATION_COUNT_MASK):
+        variation_data_size = stream.read_uint16()
+        tuple_index = stream.read_uint16()
+        if tuple_index & TUPLE_INDEX_FLAG_EMBEDDED_PEAK_TUPLE:
+            peak = stream.read_f2dot14_array(axis_count, as_tuple=True)
+        elif tuple_index & TUPLE_INDEX_MASK < len(shared_tuples):
+            peak = shared_tuples[tuple_index & TUPLE_INDEX_MASK]
+        else:
+            raise ValueError(f'shared tuple index out of range: {tuple_index & TUPLE_INDEX_MASK}')
+        start = end = None
+        if tuple_index & TUPLE_INDEX_FLAG_INTERMEDIATE_REGION:
+            start = stream.read_f2dot14_array(axis_count, as_tuple=True)
+            end = stream.read_f2dot14_array(axis_count, as_tuple=True)
+        headers.append((variation_data_size, tuple_index, peak, start, end))
+
+    stream.seek(data_offset)
+    shared_point_numbers = None
+    if tuple_variation_count & TUPLE_VARIATION_FLAG_SHARED_POINT_NUMBERS:
+        shared_point_numbers = read_packed_point_numbers(stream)
+    offset = stream.tell()
+
+    variations = []
+    for variation_data_size, tuple_index, peak, start, end in headers:
+        next_offset = offset + variation_data_size
+        if coordinates is None or calculate_tuple_scalar(coordinates, peak, start, end) != 0:
+            stream.seek(offset)
+            if tuple_index & TUPLE_INDEX_FLAG_PRIVATE_POINT_NUMBERS:
+                point_numbers = read_packed_point_numbers(stream)
+            else:
+                point_numbers = shared_point_numbers
+            count = point_count if point_numbers is None else len(point_numbers)
+            x_deltas = read_packed_deltas(stream, count)
+            y_deltas = read_packed_deltas(stream, count)
+            if stream.tell() > next_offset:
+                raise ValueError('tuple variation data overruns its size')
+            variations.append(TupleVariation(peak, x_deltas, y_deltas, point_numbers, start, end))
+        offset = next_offset
+    return variations
+
+
+def encode_glyph_variation_data(variations: Sequence[TupleVariation], shared_tuples: Sequence[tuple[float, ...]] = ()) -> bytes:
+    if len(variations) == 0:
+        return b''
+    shared_tuple_indices = {peak: index for index, peak in enumerate(shared_tuples)}
+    headers = BufferedStream()
+    serialized_data = BufferedStream()
+    for variation in variations:
+        variation_data = BufferedStream()
+        tuple_index = TUPLE_INDEX_FLAG_PRIVATE_POINT_NUMBERS
+        variation_data.write(encode_packed_point_numbers(variation.point_numbers))
+        variation_data.write(encode_packed_deltas(variation.x_deltas))
+        variation_data.write(encode_packed_deltas(variation.y_deltas))
+        peak = tuple(variation.peak)
+        if peak in shared_tuple_indices:
+            tuple_index |= shared_tuple_indices[peak]
+        else:
+            tuple_index |= TUPLE_INDEX_FLAG_EMBEDDED_PEAK_TUPLE
+        if variation.start is not None:
+            tuple_index |= TUPLE_INDEX_FLAG_INTERMEDIATE_REGION
+        data = variation_data.get_value()
+        headers.write_uint16(len(data))
+        headers.write_uint16(tuple_index)
+        if tuple_index & TUPLE_INDEX_FLAG_EMBEDDED_PEAK_TUPLE:
+            headers.write_f2dot14_array(peak)
+        if variation.start is not None:
+            headers.write_f2dot14_array(variation.start)
+            headers.write_f2dot14_array(variation.end)
+        serialized_data.write(data)
+
+    stream = BufferedStream()
+    header_data = headers.get_value()
+    stream.write_uint16(len(variations))
+    stream.write_offset16(4 + len(header_data))
+    stream.write(header_data)
+    stream.write(serialized_data.get_value())
+    stream.align_to_2_byte_with_nulls()
+    return stream.get_value()
+
+
+class GvarTable:
+    axis_count: int
+    shared_tuples: list[tuple[float, ...]]
+    data: bytes | memoryview
+    offsets: array
+
+    def __init__(self, axis_count: int, shared_tuples: list[tuple[float, ...]], data: bytes | memoryview, offsets: array):
+        self.axis_count = axis_count
+        self.shared_tuples = shared_tuples
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def get_glyph_variation_data(self, glyph_index: int) -> memoryview:
+        start, end = self.offsets[glyph_index], self.offsets[glyph_index + 1]
+        if end < start or end > len(self.data):
+            raise ValueError(f'bad gvar offsets for glyph {glyph_index}')
+        return memoryview(self.data)[start:end]
+
+    def get_tuple_variations(self, glyph_index: int, point_count: int, coordinates: Sequence[float] | None = None) -> list[TupleVariation]:
+        return decode_glyph_variation_data(self.get_glyph_variation_data(glyph_index), self.axis_count, self.shared_tuples, point_count, coordinates)
+
+
+def parse_gvar_table(data: bytes | memoryview) -> GvarTable:
+    stream = BufferStream(data)
+    header = stream.read_record(GVAR_HEADER_SCHEMA)
+    if header.major_version != 1:
+        raise ValueError(f'unsupported gvar version: {header.major_version}.{header.minor_version}')
+    if header.flags & GVAR_FLAG_LONG_OFFSETS:
+        offsets = array('I', stream.read_uint32_array(header.glyph_count + 1))
+    else:
+        offsets = array('I', [offset << 1 for offset in stream.read_uint16_array(header.glyph_count + 1)])
+    stream.seek(header.shared_tuples_offset)
+    shared_tuples = [stream.read_f2dot14_array(header.axis_count, as_tuple=True) for _ in range(header.shared_tuple_count)]
+    return GvarTable(header.axis_count, shared_tuples, memoryview(data)[header.glyph_variation_data_array_offset:], offsets)
+
+
+def dump_gvar_table(table: GvarTable) -> bytes:
+    long_offsets = table.offsets[-1] > 0x1FFFE or any(offset % 2 != 0 for offset in table.offsets)
+    offsets_size = len(table.offsets) * (4 if long_offsets else 2)
+    shared_tuples_offset = GVAR_HEADER_SCHEMA.size + offsets_size
+    glyph_variation_data_array_offset = shared_tuples_offset + len(table.shared_tuples) * table.axis_count * 2
+
+    stream = BufferedStream()
+    stream.write_record(GVAR_HEADER_SCHEMA, GVAR_HEADER_SCHEMA.new_record(
+        1,
+        0,
+        table.axis_count,
+        len(table.shared_tuples),
+        shared_tuples_offset,
+        len(table),
+        GVAR_FLAG_LONG_OFFSETS if long_offsets else 0,
+        glyph_variation_data_array_offset,
+    ))
+    if long_offsets:
+        stream.write_uint32_array(table.offsets)
+    else:
+        stream.write_uint16_array([offset >> 1 for offset in table.offsets])
+    for shared_tuple in table.shared_tuples:
+        stream.write_f2dot14_array(shared_tuple)
+    stream.write(table.data[:table.offsets[-1]])
+    return stream.get_value()
@@ -0,0 +1,39 @@
+from typing import Any
+
+from sfnttools.utils.record import RecordSchema
+
+HEAD_MAGIC_NUMBER = 0x5F0F3CF5
+
+HEAD_TABLE_SCHEMA = RecordSchema('HeadTable', [
+    ('major_version', 'uint16'),
+    ('minor_version', 'uint16'),
+    ('font_revision', 'fixed'),
+    ('checksum_adjustment', 'uint32'),
+    ('magic_number', 'uint32'),
+    ('flags', 'uint16'),
+    ('units_per_em', 'uint16'),
+    ('created', 'long_datetime'),
+    ('modified', 'long_datetime'),
+    ('x_min', 'int16'),
+    ('y_min', 'int16'),
+    ('x_max', 'int16'),
+    ('y_max', 'int16'),
+    ('mac_style', 'uint16'),
+    ('lowest_rec_ppem', 'uint16'),
+    ('font_direction_hint', 'int16'),
+    ('index_to_loc_format', 'int16'),
+    ('glyph_data_format', 'int16'),
+])
+
+
+def parse_head_table(data: bytes | memoryview) -> Any:
+    if len(data) < HEAD_TABLE_SCHEMA.size:
+        raise EOFError()
+    table = HEAD_TABLE_SCHEMA.unpack_from(data)
+    if table.magic_number != HEAD_MAGIC_NUMBER:
+        raise ValueError("bad 'head' table magic number")
+    return table
+
+
+def dump_head_table(table: Any) -> bytes:
+    return HEAD_TABLE_SCHEMA.pack(table)
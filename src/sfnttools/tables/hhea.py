@@ -0,0 +1,34 @@
+from typing import Any
+
+from sfnttools.utils.record import RecordSchema
+
+HHEA_TABLE_SCHEMA = RecordSchema('HheaTable', [
+    ('major_version', 'uint16'),
+    ('minor_version', 'uint16'),
+    ('ascender', 'fword'),
+    ('descender', 'fword'),
+    ('line_gap', 'fword'),
+    ('advance_width_max', 'ufword'),
+    ('min_left_side_bearing', 'fword'),
+    ('min_right_side_bearing', 'fword'),
+    ('x_max_extent', 'fword'),
+    ('caret_slope_rise', 'int16'),
+    ('caret_slope_run', 'int16'),
+    ('caret_offset', 'int16'),
+    ('reserved_0', 'int16'),
+    ('reserved_1', 'int16'),
+    ('reserved_2', 'int16'),
+    ('reserved_3', 'int16'),
+    ('metric_data_format', 'int16'),
+    ('number_of_h_metrics', 'uint16'),
+])
+
+
+def parse_hhea_table(data: bytes | memoryview) -> Any:
+    if len(data) < HHEA_TABLE_SCHEMA.size:
+        raise EOFError()
+    return HHEA_TABLE_SCHEMA.unpack_from(data)
+
+
+def dump_hhea_table(table: Any) -> bytes:
+    return HHEA_TABLE_SCHEMA.pack(table)
@@ -0,0 +1,44 @@
+from array import array
+
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+
+class HmtxTable:
+    advance_widths: array
+    lsbs: array
+
+    def __init__(self, advance_widths: array | None = None, lsbs: array | None = None):
+        self.advance_widths = array('H') if advance_widths is None else advance_widths
+        self.lsbs = array('h') if lsbs is None else lsbs
+
+    def __len__(self) -> int:
+        return len(self.advance_widths)
+
+    @property
+    def num_h_metrics(self) -> int:
+        num_h_metrics = len(self.advance_widths)
+        while num_h_metrics > 1 and self.advance_widths[num_h_metrics - 2] == self.advance_widths[-1]:
+            num_h_metrics -= 1
+        return num_h_metrics
+
+
+def parse_hmtx_table(data: bytes | memoryview, num_glyphs: int, num_h_metrics: int) -> HmtxTable:
+    if num_h_metrics < 1 or num_h_metrics > num_glyphs:
+        raise ValueError('number of h metrics requires 1 <= integer <= number of glyphs')
+    stream = BufferStream(data)
+    metrics = stream.read_int16_array(num_h_metrics * 2)
+    advance_widths = array('H', metrics[0::2].tobytes())
+    lsbs = metrics[1::2]
+    advance_widths.extend([advance_widths[-1]] * (num_glyphs - num_h_metrics))
+    lsbs.extend(stream.read_int16_array(num_glyphs - num_h_metrics))
+    return HmtxTable(advance_widths, lsbs)
+
+
+def dump_hmtx_table(table: HmtxTable) -> bytes:
+    num_h_metrics = table.num_h_metrics
+    stream = BufferedStream()
+    for advance_width, lsb in zip(table.advance_widths[:num_h_metrics], table.lsbs):
+        stream.write_uint16(advance_width)
+        stream.write_int16(lsb)
+    stream.write_int16_array(table.lsbs[num_h_metrics:])
+    return stream.get_value()
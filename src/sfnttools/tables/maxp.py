@@ -0,0 +1,45 @@
+from typing import Any
+
+from sfnttools.utils.record import RecordSchema
+
+MAXP_VERSION_0_5 = 0x00005000
+MAXP_VERSION_1_0 = 0x00010000
+
+MAXP_TABLE_SCHEMA = RecordSchema('MaxpTable', [
+    ('version', 'uint32'),
+    ('num_glyphs', 'uint16'),
+    ('max_points', 'uint16'),
+    ('max_contours', 'uint16'),
+    ('max_composite_points', 'uint16'),
+    ('max_composite_contours', 'uint16'),
+    ('max_zones', 'uint16'),
+    ('max_twilight_points', 'uint16'),
+    ('max_storage', 'uint16'),
+    ('max_function_defs', 'uint16'),
+    ('max_instruction_defs', 'uint16'),
+    ('max_stack_elements', 'uint16'),
+    ('max_size_of_instructions', 'uint16'),
+    ('max_component_elements', 'uint16'),
+    ('max_component_depth', 'uint16'),
+])
+
+_MAXP_TABLE_SIZES = {
+    MAXP_VERSION_0_5: 6,
+    MAXP_VERSION_1_0: MAXP_TABLE_SCHEMA.size,
+}
+
+
+def parse_maxp_table(data: bytes | memoryview) -> Any:
+    if len(data) < 4:
+        raise EOFError()
+    version = int.from_bytes(data[:4], 'big', signed=False)
+    if version not in _MAXP_TABLE_SIZES:
+        raise ValueError(f"unknown 'maxp' table version: 0x{version:08X}")
+    size = _MAXP_TABLE_SIZES[version]
+    if len(data) < size:
+        raise EOFError()
+    return MAXP_TABLE_SCHEMA.unpack(bytes(data[:size]).ljust(MAXP_TABLE_SCHEMA.size, b'\x00'))
+
+
+def dump_maxp_table(table: Any) -> bytes:
+    return MAXP_TABLE_SCHEMA.pack(table)[:_MAXP_TABLE_SIZES[table.version]]
@@ -0,0 +1,148 @@
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+PLATFORM_ID_UNICODE = 0
+PLATFORM_ID_MACINTOSH = 1
+PLATFORM_ID_WINDOWS = 3
+
+NAME_ID_COPYRIGHT = 0
+NAME_ID_FAMILY = 1
+NAME_ID_SUBFAMILY = 2
+NAME_ID_UNIQUE_ID = 3
+NAME_ID_FULL_NAME = 4
+NAME_ID_VERSION = 5
+NAME_ID_POSTSCRIPT_NAME = 6
+NAME_ID_TYPOGRAPHIC_FAMILY = 16
+NAME_ID_TYPOGRAPHIC_SUBFAMILY = 17
+
+_NAME_RECORD_SCHEMA = RecordSchema('_NameRecord', [
+    ('platform_id', 'uint16'),
+    ('encoding_id', 'uint16'),
+    ('language_id', 'uint16'),
+    ('name_id', 'uint16'),
+    ('length', 'uint16'),
+    ('string_offset', 'offset16'),
+])
+
+
+class NameRecord:
+    platform_id: int
+    encoding_id: int
+    language_id: int
+    name_id: int
+    data: bytes
+
+    def __init__(self, platform_id: int, encoding_id: int, language_id: int, name_id: int, data: bytes):
+        self.platform_id = platform_id
+        self.encoding_id = encoding_id
+        self.language_id = language_id
+        self.name_id = name_id
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f'NameRecord({self.platform_id}, {self.encoding_id}, {self.language_id}, {self.name_id}, {self.data!r})'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, NameRecord):
+            return NotImplemented
+        return (self.platform_id == other.platform_id and
+                self.encoding_id == other.encoding_id and
+                self.language_id == other.language_id and
+                self.name_id == other.name_id and
+                self.data == other.data)
+
+    @property
+    def value(self) -> str:
+        if self.platform_id in (PLATFORM_ID_UNICODE, PLATFORM_ID_WINDOWS):
+            return self.data.decode('utf-16-be', errors='replace')
+        elif self.platform_id == PLATFORM_ID_MACINTOSH and self.encoding_id == 0:
+            return self.data.decode('mac-roman')
+        else:
+            return self.data.decode('latin-1')
+
+
+class NameTable:
+    records: list[NameRecord]
+    lang_tags: list[bytes]
+
+    def __init__(self, records: list[NameRecord] | None = None, lang_tags: list[bytes] | None = None):
+        self.records = [] if records is None else records
+        self.lang_tags = [] if lang_tags is None else lang_tags
+
+    @property
+    def format(self) -> int:
+        return 1 if len(self.lang_tags) > 0 else 0
+
+    def get_name(self, name_id: int, platform_id: int = PLATFORM_ID_WINDOWS, language_id: int | None = 0x0409) -> str | None:
+        fallback = None
+        for record in self.records:
+            if record.name_id != name_id:
+                continue
+            if record.platform_id == platform_id and (language_id is None or record.language_id == language_id):
+                return record.value
+            if fallback is None:
+                fallback = record
+        return None if fallback is None else fallback.value
+
+
+def parse_name_table(data: bytes | memoryview) -> NameTable:
+    stream = BufferStream(data)
+    format_ = stream.read_uint16()
+    if format_ not in (0, 1):
+        raise ValueError(f"unknown 'name' table format: {format_}")
+    count = stream.read_uint16()
+    storage_offset = stream.read_offset16()
+
+    table = NameTable()
+    for raw_record in stream.read_records(_NAME_RECORD_SCHEMA, count):
+        offset = storage_offset + raw_record.string_offset
+        table.records.append(NameRecord(
+            raw_record.platform_id,
+            raw_record.encoding_id,
+            raw_record.language_id,
+            raw_record.name_id,
+            stream.slice(offset, raw_record.length).get_value(),
+        ))
+    if format_ == 1:
+        lang_tag_count = stream.read_uint16()
+        for _ in range(lang_tag_count):
+            length = stream.read_uint16()
+            offset = stream.read_offset16()
+            table.lang_tags.append(stream.slice(storage_offset + offset, length).get_value())
+    return table
+
+
+def dump_name_table(table: NameTable) -> bytes:
+    records = sorted(table.records, key=lambda record: (record.platform_id, record.encoding_id, record.language_id, record.name_id))
+
+    strings = bytearray()
+    string_offsets = {}
+
+    def add_string(value: bytes) -> int:
+        if value not in string_offsets:
+            string_offsets[value] = len(strings)
+            strings.extend(value)
+        return string_offsets[value]
+
+    stream = BufferedStream()
+    stream.write_uint16(table.format)
+    stream.write_uint16(len(records))
+    header_size = 6 + _NAME_RECORD_SCHEMA.size * len(records)
+    if table.format == 1:
+        header_size += 2 + 4 * len(table.lang_tags)
+    stream.write_offset16(header_size)
+    stream.write_records(_NAME_RECORD_SCHEMA, [_NAME_RECORD_SCHEMA.new_record(
+        record.platform_id,
+        record.encoding_id,
+        record.language_id,
+        record.name_id,
+        len(record.data),
+        add_string(record.data),
+    ) for record in records])
+    if table.format == 1:
+        stream.write_uint16(len(table.lang_tags))
+        for lang_tag in table.lang_tags:
+            stream.write_uint16(len(lang_tag))
+            stream.write_offset16(add_string(lang_tag))
+    stream.write(strings)
+    return stream.get_value()
@@ -0,0 +1,79 @@
+from typing import Any
+
+from sfnttools.utils.record import RecordSchema
+
+OS2_TABLE_SCHEMA = RecordSchema('Os2Table', [
+    ('version', 'uint16'),
+    ('x_avg_char_width', 'fword'),
+    ('us_weight_class', 'uint16'),
+    ('us_width_class', 'uint16'),
+    ('fs_type', 'uint16'),
+    ('y_subscript_x_size', 'fword'),
+    ('y_subscript_y_size', 'fword'),
+    ('y_subscript_x_offset', 'fword'),
+    ('y_subscript_y_offset', 'fword'),
+    ('y_superscript_x_size', 'fword'),
+    ('y_superscript_y_size', 'fword'),
+    ('y_superscript_x_offset', 'fword'),
+    ('y_superscript_y_offset', 'fword'),
+    ('y_strikeout_size', 'fword'),
+    ('y_strikeout_position', 'fword'),
+    ('s_family_class', 'int16'),
+    ('panose_family_type', 'uint8'),
+    ('panose_serif_style', 'uint8'),
+    ('panose_weight', 'uint8'),
+    ('panose_proportion', 'uint8'),
+    ('panose_contrast', 'uint8'),
+    ('panose_stroke_variation', 'uint8'),
+    ('panose_arm_style', 'uint8'),
+    ('panose_letterform', 'uint8'),
+    ('panose_midline', 'uint8'),
+    ('panose_x_height', 'uint8'),
+    ('ul_unicode_range_1', 'uint32'),
+    ('ul_unicode_range_2', 'uint32'),
+    ('ul_unicode_range_3', 'uint32'),
+    ('ul_unicode_range_4', 'uint32'),
+    ('ach_vend_id', 'tag'),
+    ('fs_selection', 'uint16'),
+    ('us_first_char_index', 'uint16'),
+    ('us_last_char_index', 'uint16'),
+    ('s_typo_ascender', 'fword'),
+    ('s_typo_descender', 'fword'),
+    ('s_typo_line_gap', 'fword'),
+    ('us_win_ascent', 'ufword'),
+    ('us_win_descent', 'ufword'),
+    ('ul_code_page_range_1', 'uint32'),
+    ('ul_code_page_range_2', 'uint32'),
+    ('sx_height', 'fword'),
+    ('s_cap_height', 'fword'),
+    ('us_default_char', 'uint16'),
+    ('us_break_char', 'uint16'),
+    ('us_max_context', 'uint16'),
+    ('us_lower_optical_point_size', 'uint16'),
+    ('us_upper_optical_point_size', 'uint16'),
+])
+
+_OS2_TABLE_SIZES = [78, 86, 96, 96, 96, 100]
+
+
+def parse_os2_table(data: bytes | memoryview) -> Any:
+    if len(data) < 2:
+        raise EOFError()
+    version = int.from_bytes(data[:2], 'big', signed=False)
+    size = _OS2_TABLE_SIZES[min(version, len(_OS2_TABLE_SIZES) - 1)]
+    if len(data) < size:
+        raise EOFError()
+    return OS2_TABLE_SCHEMA.unpack(bytes(data[:size]).ljust(OS2_TABLE_SCHEMA.size, b'\x00'))
+
+
+def dump_os2_table(table: Any) -> bytes:
+    return OS2_TABLE_SCHEMA.pack(table)[:_OS2_TABLE_SIZES[min(table.version, len(_OS2_TABLE_SIZES) - 1)]]
+
+
+def get_unicode_ranges(table: Any) -> set[int]:
+    unicode_ranges = set()
+    for i, value in enumerate([table.ul_unicode_range_1, table.ul_unicode_range_2, table.ul_unicode_range_3, table.ul_unicode_range_4]):
+        for bit in range(32):
+            if value & (1 << bit):
+                unicode_ranges.add(i * 32 + bit)
+    return unicode_ranges
@@ -0,0 +1,73 @@
+from typing import Any
+
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+POST_VERSION_1_0 = 0x00010000
+POST_VERSION_2_0 = 0x00020000
+POST_VERSION_2_5 = 0x00025000
+POST_VERSION_3_0 = 0x00030000
+
+POST_HEADER_SCHEMA = RecordSchema('PostHeader', [
+    ('version', 'uint32'),
+    ('italic_angle', 'fixed'),
+    ('underline_position', 'fword'),
+    ('underline_thickness', 'fword'),
+    ('is_fixed_pitch', 'uint32'),
+    ('min_mem_type42', 'uint32'),
+    ('max_mem_type42', 'uint32'),
+    ('min_mem_type1', 'uint32'),
+    ('max_mem_type1', 'uint32'),
+])
+
+STANDARD_GLYPH_NAME_COUNT = 258
+
+
+class PostTable:
+    header: Any
+    glyph_name_indices: list[int] | None
+    names: list[bytes]
+    extra_data: bytes
+
+    def __init__(self, header: Any, glyph_name_indices: list[int] | None = None, names: list[bytes] | None = None, extra_data: bytes = b''):
+        self.header = header
+        self.glyph_name_indices = glyph_name_indices
+        self.names = [] if names is None else names
+        self.extra_data = extra_data
+
+    def get_glyph_name(self, glyph_index: int) -> bytes | None:
+        if self.glyph_name_indices is None or glyph_index >= len(self.glyph_name_indices):
+            return None
+        name_index = self.glyph_name_indices[glyph_index]
+        if name_index < STANDARD_GLYPH_NAME_COUNT:
+            return None
+        return self.names[name_index - STANDARD_GLYPH_NAME_COUNT]
+
+
+def parse_post_table(data: bytes | memoryview) -> PostTable:
+    stream = BufferStream(data)
+    header = stream.read_record(POST_HEADER_SCHEMA)
+    if header.version != POST_VERSION_2_0:
+        return PostTable(header, extra_data=stream.read(len(stream) - stream.tell()))
+
+    num_glyphs = stream.read_uint16()
+    glyph_name_indices = list(stream.read_uint16_array(num_glyphs))
+    names = []
+    while stream.tell() < len(stream):
+        names.append(stream.read(stream.read_uint8()))
+    return PostTable(header, glyph_name_indices, names)
+
+
+def dump_post_table(table: PostTable) -> bytes:
+    stream = BufferedStream()
+    stream.write_record(POST_HEADER_SCHEMA, table.header)
+    if table.header.version != POST_VERSION_2_0:
+        stream.write(table.extra_data)
+        return stream.get_value()
+
+    stream.write_uint16(len(table.glyph_name_indices))
+    stream.write_uint16_array(table.glyph_name_indices)
+    for name in table.names:
+        stream.write_uint8(len(name))
+        stream.write(name)
+    return stream.get_value()
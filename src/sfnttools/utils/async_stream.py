@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import os
+from array import array
+from collections.abc import Callable, Iterable
+from io import UnsupportedOperation
+from typing import Any
+
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+
+class AsyncStream:
+    source: Any
+    position: int
+
+    def __init__(self, source: Any, position: int = 0):
+        self.source = source
+        self.position = position
+
+    async def _call(self, method: Callable[..., Any], *args: Any) -> Any:
+        if inspect.iscoroutinefunction(method):
+            return await method(*args)
+        result = await asyncio.to_thread(method, *args)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def read(self, size: int, ignore_eof: bool = False) -> bytes:
+        values = bytearray()
+        while len(values) < size:
+            chunk = await self._call(self.source.read, size - len(values))
+            if len(chunk) == 0:
+                break
+            values += chunk
+        self.position += len(values)
+        if len(values) < size and not ignore_eof:
+            raise EOFError()
+        return bytes(values)
+
+    async def readexactly(self, size: int) -> bytes:
+        if hasattr(self.source, 'readexactly'):
+            try:
+                values = await self.source.readexactly(size)
+            except asyncio.IncompleteReadError as e:
+                self.position += len(e.partial)
+                raise EOFError() from e
+            self.position += len(values)
+            return values
+        return await self.read(size)
+
+    async def _read_with(self, size: int, reader: Callable[[BufferStream], Any]) -> Any:
+        return reader(BufferStream(await self.readexactly(size)))
+
+    async def read_uint8(self) -> int:
+        return (await self.readexactly(1))[0]
+
+    async def read_int8(self) -> int:
+        return int.from_bytes(await self.readexactly(1), 'big', signed=True)
+
+    async def read_uint16(self) -> int:
+        return int.from_bytes(await self.readexactly(2), 'big', signed=False)
+
+    async def read_int16(self) -> int:
+        return int.from_bytes(await self.readexactly(2), 'big', signed=True)
+
+    async def read_uint24(self) -> int:
+        return int.from_bytes(await self.readexactly(3), 'big', signed=False)
+
+    async def read_uint32(self) -> int:
+        return int.from_bytes(await self.readexactly(4), 'big', signed=False)
+
+    async def read_int32(self) -> int:
+        return int.from_bytes(await self.readexactly(4), 'big', signed=True)
+
+    async def read_fixed(self) -> float:
+        return await self._read_with(4, BufferStream.read_fixed)
+
+    async def read_fword(self) -> int:
+        return await self.read_int16()
+
+    async def read_ufword(self) -> int:
+        return await self.read_uint16()
+
+    async def read_f2dot14(self) -> float:
+        return await self._read_with(2, BufferStream.read_f2dot14)
+
+    async def read_long_datetime(self) -> int:
+        return int.from_bytes(await self.readexactly(8), 'big', signed=True)
+
+    async def read_tag(self) -> str:
+        return (await self.readexactly(4)).decode('latin-1')
+
+    async def read_offset8(self) -> int:
+        return await self.read_uint8()
+
+    async def read_offset16(self) -> int:
+        return await self.read_uint16()
+
+    async def read_offset24(self) -> int:
+        return await self.read_uint24()
+
+    async def read_offset32(self) -> int:
+        return await self.read_uint32()
+
+    async def read_version_16dot16(self) -> tuple[int, int]:
+        return await self._read_with(4, BufferStream.read_version_16dot16)
+
+    async def read_255uint16(self) -> int:
+        code = await self.read_uint8()
+        if code == 253:
+            return await self.read_uint16()
+        elif code == 254:
+            return await self.read_uint8() + 506
+        elif code == 255:
+            return await self.read_uint8() + 253
+        else:
+            return code
+
+    async def read_uint_base128(self) -> int:
+        data = bytearray()
+        while len(data) < 5:
+            data.append(await self.read_uint8())
+            if data[-1] & 0x80 == 0:
+                break
+        return BufferStream(data).read_uint_base128()
+
+    async def read_uint8_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        return await self._read_with(count, lambda stream: stream.read_uint8_array(count, as_tuple))
+
+    async def read_int8_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        return await self._read_with(count, lambda stream: stream.read_int8_array(count, as_tuple))
+
+    async def read_uint16_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        return await self._read_with(count * 2, lambda stream: stream.read_uint16_array(count, as_tuple))
+
+    async def read_int16_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        return await self._read_with(count * 2, lambda stream: stream.read_int16_array(count, as_tuple))
+
+    async def read_uint32_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        return await self._read_with(count * 4, lambda stream: stream.read_uint32_array(count, as_tuple))
+
+    async def read_int32_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        return await self._read_with(count * 4, lambda stream: stream.read_int32_array(count, as_tuple))
+
+    async def read_fixed_array(self, count: int, as_tuple: bool = False) -> array | tuple[float, ...]:
+        return await self._read_with(count * 4, lambda stream: stream.read_fixed_array(count, as_tuple))
+
+    async def read_f2dot14_array(self, count: int, as_tuple: bool = False) -> array | tuple[float, ...]:
+        return await self._read_with(count * 2, lambda stream: stream.read_f2dot14_array(count, as_tuple))
+
+    async def read_record(self, schema: RecordSchema) -> Any:
+        return schema.unpack(await self.readexactly(schema.size))
+
+    async def read_records(self, schema: RecordSchema, count: int) -> list[Any]:
+        return schema.unpack_many(await self.readexactly(schema.size * count), 0, count)
+
+    async def read_255uint16_many(self, count: int) -> list[int]:
+        return [await self.read_255uint16() for _ in range(count)]
+
+    async def read_uint_base128_many(self, count: int) -> list[int]:
+        return [await self.read_uint_base128() for _ in range(count)]
+
+    async def read_binary_string(self, size: int) -> str:
+        return await self._read_with(size, lambda stream: stream.read_binary_string(size))
+
+    async def write(self, values: bytes | bytearray | memoryview) -> int:
+        if hasattr(self.source, 'drain'):
+            result = self.source.write(values)
+            if inspect.isawaitable(result):
+                await result
+            await self.source.drain()
+        else:
+            await self._call(self.source.write, values)
+        self.position += len(values)
+        return len(values)
+
+    async def _write_with(self, writer: Callable[[BufferedStream], Any]) -> int:
+        stream = BufferedStream()
+        writer(stream)
+        return await self.write(stream.get_value())
+
+    async def write_uint8(self, value: int) -> int:
+        return await self._write_with(lambda stream: stream.write_uint8(value))
+
+    async def write_int8(self, value: int) -> int:
+        return await self._write_with(lambda stream: stream.write_int8(value))
+
+    async def write_uint16(self, value: int) -> int:
+        return await self._write_with(lambda stream: stream.write_uint16(value))
+
+    async def write_int16(self, value: int) -> int:
+        return await self._write_with(lambda stream: stream.write_int16(value))
+
+    async def write_uint24(self, value: int) -> int:
+        return await self._write_with(lambda stream: stream.write_uint24(value))
+
+    async def write_uint32(self, value: int) -> int:
+        return await self._write_with(lambda stream: stream.write_uint32(value))
+
+    async def write_int32(self, value: int) -> int:
+        return await self._write_with(lambda stream: stream.write_int32(value))
+
+    async def write_fixed(self, value: float) -> int:
+        return await self._write_with(lambda stream: stream.write_fixed(value))
+
+    async def write_fword(self, value: int) -> int:
+        return await self.write_int16(value)
+
+    async def write_ufword(self, value: int) -> int:
+        return await self.write_uint16(value)
+
+    async def write_f2dot14(self, value: float) -> int:
+        return await self._write_with(lambda stream: stream.write_f2dot14(value))
+
+    async def write_long_datetime(self, value: int) -> int:
+        return await self._write_with(lambda stream: stream.write_long_datetime(value))
+
+    async def write_tag(self, value: str) -> int:
+        return await self._write_with(lambda stream: stream.write_tag(value))
+
+    async def write_offset8(self, value: int) -> int:
+        return await self.write_uint8(value)
+
+    async def write_offset16(self, value: int) -> int:
+        return await self.write_uint16(value)
+
+    async def write_offset24(self, value: int) -> int:
+        return await self.write_uint24(value)
+
+    async def write_offset32(self, value: int) -> int:
+        return await self.write_uint32(value)
+
+    async def write_version_16dot16(self, value: tuple[int, int]) -> int:
+        return await self._write_with(lambda stream: stream.write_version_16dot16(value))
+
+    async def write_255uint16(self, value: int) -> int:
+        return await self._write_with(lambda stream: stream.write_255uint16(value))
+
+    async def write_uint_base128(self, value: int) -> int:
+        return await self._write_with(lambda stream: stream.write_uint_base128(value))
+
+    async def write_uint8_array(self, values: Iterable[int]) -> int:
+        return await self._write_with(lambda stream: stream.write_uint8_array(values))
+
+    async def write_int8_array(self, values: Iterable[int]) -> int:
+        return await self._write_with(lambda stream: stream.write_int8_array(values))
+
+    async def write_uint16_array(self, values: Iterable[int]) -> int:
+        return await self._write_with(lambda stream: stream.write_uint16_array(values))
+
+    async def write_int16_array(self, values: Iterable[int]) -> int:
+        return await self._write_with(lambda stream: stream.write_int16_array(values))
+
+    async def write_uint32_array(self, values: Iterable[int]) -> int:
+        return await self._write_with(lambda stream: stream.write_uint32_array(values))
+
+    async def write_int32_array(self, values: Iterable[int]) -> int:
+        return await self._write_with(lambda stream: stream.write_int32_array(values))
+
+    async def write_fixed_array(self, values: Iterable[float]) -> int:
+        return await self._write_with(lambda stream: stream.write_fixed_array(values))
+
+    async def write_f2dot14_array(self, values: Iterable[float]) -> int:
+        return await self._write_with(lambda stream: stream.write_f2dot14_array(values))
+
+    async def write_record(self, schema: RecordSchema, record: Any) -> int:
+        return await self.write(schema.pack(record))
+
+    async def write_records(self, schema: RecordSchema, records: Iterable[Any]) -> int:
+        return await self.write(schema.pack_many(records))
+
+    async def write_255uint16_many(self, values: Iterable[int]) -> int:
+        return await self._write_with(lambda stream: stream.write_255uint16_many(values))
+
+    async def write_uint_base128_many(self, values: Iterable[int]) -> int:
+        return await self._write_with(lambda stream: stream.write_uint_base128_many(values))
+
+    async def write_binary_string(self, value: str) -> int:
+        return await self._write_with(lambda stream: stream.write_binary_string(value))
+
+    async def write_nulls(self, size: int) -> int:
+        if size > 0:
+            await self.write(bytes(size))
+        return size
+
+    async def align_to_2_byte_with_nulls(self) -> int:
+        return await self.write_nulls(1 - (self.position + 1) % 2)
+
+    async def align_to_4_byte_with_nulls(self) -> int:
+        return await self.write_nulls(3 - (self.position + 3) % 4)
+
+    async def seek(self, offset: int, whence: int = os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence != os.SEEK_SET:
+            raise UnsupportedOperation('async stream only supports absolute and relative seeks')
+        if offset < 0:
+            raise ValueError('negative seek position')
+        if hasattr(self.source, 'seek'):
+            await self._call(self.source.seek, offset)
+            self.position = offset
+        elif offset >= self.position:
+            await self.readexactly(offset - self.position)
+        else:
+            raise UnsupportedOperation('cannot seek backwards in a non-seekable async stream')
+
+    def tell(self) -> int:
+        return self.position
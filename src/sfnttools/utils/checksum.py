@@ -1,15 +1,39 @@
+from __future__ import annotations
+
+from array import array
+from mmap import mmap
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 _CHECKSUM_MASK = 0xFFFFFFFF
 _CHECKSUM_MAGIC_NUMBER = 0xB1B0AFBA
 
+_WORD_TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+_BLOCK_SIZE = 1024 * 64
+
+
+def _sum_words(view: memoryview) -> int:
+    if numpy is not None:
+        return int(numpy.frombuffer(view, dtype='>u4').sum(dtype=numpy.uint64))
 
-def calculate_checksum(data: bytes) -> int:
-    checksum = 0
-    for i in range(0, len(data), 4):
-        chunk = data[i:i + 4]
-        if len(chunk) < 4:
-            chunk += b'\x00' * (4 - len(chunk))
-        checksum += int.from_bytes(chunk, 'big', signed=False)
+    total = 0
+    for i in range(0, len(view), _BLOCK_SIZE):
+        words = array(_WORD_TYPECODE)
+        words.frombytes(view[i:i + _BLOCK_SIZE])
+        words.byteswap()
+        total += sum(words)
+    return total
+
+
+def calculate_checksum(data: bytes | bytearray | memoryview | mmap) -> int:
+    with memoryview(data) as view, view.cast('B') as view:
+        body_size = len(view) - len(view) % 4
+        checksum = _sum_words(view[:body_size])
+        if body_size < len(view):
+            checksum += int.from_bytes(view[body_size:].tobytes().ljust(4, b'\x00'), 'big', signed=False)
     checksum &= _CHECKSUM_MASK
     return checksum
 
@@ -18,3 +42,51 @@ def calculate_checksum_adjustment(checksums: list[int]) -> int:
     total_checksum = sum(checksums) & _CHECKSUM_MASK
     checksum_adjustment = (_CHECKSUM_MAGIC_NUMBER - total_checksum) & _CHECKSUM_MASK
     return checksum_adjustment
+
+
+class ChecksumAccumulator:
+    total: int
+    pending: bytes
+    size: int
+
+    def __init__(self, data: bytes | bytearray | memoryview | mmap | None = None):
+        self.total = 0
+        self.pending = b''
+        self.size = 0
+        if data is not None:
+            self.update(data)
+
+    @property
+    def checksum(self) -> int:
+        checksum = self.total
+        if len(self.pending) > 0:
+            checksum += int.from_bytes(self.pending.ljust(4, b'\x00'), 'big', signed=False)
+        checksum &= _CHECKSUM_MASK
+        return checksum
+
+    def update(self, data: bytes | bytearray | memoryview | mmap):
+        with memoryview(data) as view, view.cast('B') as view:
+            self.size += len(view)
+            offset = 0
+            if len(self.pending) > 0:
+                offset = min(4 - len(self.pending), len(view))
+                self.pending += view[:offset].tobytes()
+                if len(self.pending) < 4:
+                    return
+                self.total += int.from_bytes(self.pending, 'big', signed=False)
+                self.pending = b''
+            body_end = offset + (len(view) - offset) // 4 * 4
+            self.total = (self.total + _sum_words(view[offset:body_end])) & _CHECKSUM_MASK
+            self.pending = view[body_end:].tobytes()
+
+    def merge(self, other: ChecksumAccumulator):
+        self.total = (self.checksum + other.total) & _CHECKSUM_MASK
+        self.pending = other.pending
+        self.size += (4 - self.size % 4) % 4 + other.size
+
+    def copy(self) -> ChecksumAccumulator:
+        accumulator = ChecksumAccumulator()
+        accumulator.total = self.total
+        accumulator.pending = self.pending
+        accumulator.size = self.size
+        return accumulator
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+
+from sfnttools.utils.math import round_half_up_many
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+FIXED_SCALE = 1 << 16
+F2DOT14_SCALE = 1 << 14
+
+_INT32_TYPECODE = 'i' if array('i').itemsize == 4 else 'l'
+
+
+def _encode_many(values: Iterable[float], scale: int, typecode: str, dtype: str) -> array:
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        scaled = values.astype(numpy.float64) * scale
+        if numpy.isnan(scaled).any():
+            raise ValueError('cannot convert float NaN to integer')
+        rounded = numpy.floor(numpy.abs(scaled) + 0.5)
+        rounded = numpy.where(scaled >= 0, rounded, -rounded)
+        limits = numpy.iinfo(dtype)
+        if len(rounded) > 0 and (rounded.min() < limits.min or rounded.max() > limits.max):
+            raise OverflowError(f'value out of range for {dtype}')
+        return array(typecode, rounded.astype(dtype).tobytes())
+    return array(typecode, round_half_up_many(value * scale for value in values))
+
+
+def _decode_many(values: Iterable[int], scale: int) -> array:
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return array('d', (values.astype(numpy.float64) / scale).tobytes())
+    return array('d', [value / scale for value in values])
+
+
+def encode_fixed_many(values: Iterable[float]) -> array:
+    return _encode_many(values, FIXED_SCALE, _INT32_TYPECODE, 'int32')
+
+
+def decode_fixed_many(values: Iterable[int]) -> array:
+    return _decode_many(values, FIXED_SCALE)
+
+
+def encode_f2dot14_many(values: Iterable[float]) -> array:
+    return _encode_many(values, F2DOT14_SCALE, 'h', 'int16')
+
+
+def decode_f2dot14_many(values: Iterable[int]) -> array:
+    return _decode_many(values, F2DOT14_SCALE)
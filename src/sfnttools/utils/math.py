@@ -1,4 +1,5 @@
 import math
+from collections.abc import Iterable
 
 
 def round_half_up(value: int | float, n_digits: int = 0) -> int | float:
@@ -10,3 +11,13 @@ def round_half_up(value: int | float, n_digits: int = 0) -> int | float:
     if n_digits == 0:
         value = int(value)
     return value
+
+
+def round_half_up_integer(value: float) -> int:
+    if value >= 0:
+        return int(value + 0.5)
+    return -int(0.5 - value)
+
+
+def round_half_up_many(values: Iterable[int | float]) -> list[int]:
+    return [int(value + 0.5) if value >= 0 else -int(0.5 - value) for value in values]
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any
+
+from sfnttools.utils.stream import Stream
+
+_PRIMITIVE_PREFIXES = ('read', 'write', 'align_')
+
+_NULL_CONTEXT = nullcontext()
+
+_active_profiler: StreamProfiler | None = None
+
+
+def _iter_stream_classes() -> Iterator[type]:
+    pending = [Stream]
+    while len(pending) > 0:
+        cls = pending.pop()
+        yield cls
+        pending.extend(cls.__subclasses__())
+
+
+def profile_table(tag: str, size: int = 0) -> AbstractContextManager:
+    if _active_profiler is None:
+        return _NULL_CONTEXT
+    return _active_profiler.table(tag, size)
+
+
+class _ThreadState(threading.local):
+    depth: int
+    table_stack: list[str]
+
+    def __init__(self):
+        self.depth = 0
+        self.table_stack = []
+
+
+class StreamProfiler:
+    primitive_calls: Counter[str]
+    primitive_bytes: Counter[str]
+    table_calls: Counter[str]
+    table_bytes: Counter[str]
+    table_primitive_bytes: Counter[str]
+    table_time: defaultdict[str, float]
+    _state: _ThreadState
+    _lock: threading.Lock
+    _originals: list[tuple[type, str, Callable[..., Any]]]
+
+    def __init__(self):
+        self.primitive_calls = Counter()
+        self.primitive_bytes = Counter()
+        self.table_calls = Counter()
+        self.table_bytes = Counter()
+        self.table_primitive_bytes = Counter()
+        self.table_time = defaultdict(float)
+        self._state = _ThreadState()
+        self._lock = threading.Lock()
+        self._originals = []
+
+    def __enter__(self) -> StreamProfiler:
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disable()
+
+    @property
+    def enabled(self) -> bool:
+        return _active_profiler is self
+
+    def _wrap(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(stream: Stream, *args: Any, **kwargs: Any) -> Any:
+            state = self._state
+            if state.depth > 0:
+                return method(stream, *args, **kwargs)
+            state.depth += 1
+            try:
+                start = stream.tell()
+                result = method(stream, *args, **kwargs)
+                size = stream.tell() - start
+            finally:
+                state.depth -= 1
+            with self._lock:
+                self.primitive_calls[name] += 1
+                self.primitive_bytes[name] += size
+                if len(state.table_stack) > 0:
+                    self.table_primitive_bytes[state.table_stack[-1]] += size
+            return result
+
+        wrapper.__name__ = method.__name__
+        wrapper.__qualname__ = method.__qualname__
+        wrapper.__wrapped__ = method
+        return wrapper
+
+    def enable(self):
+        global _active_profiler
+        if _active_profiler is self:
+            return
+        if _active_profiler is not None:
+            raise ValueError('another profiler is already enabled')
+        for cls in _iter_stream_classes():
+            for name, method in list(vars(cls).items()):
+                if name.startswith(_PRIMITIVE_PREFIXES) and callable(method):
+                    self._originals.append((cls, name, method))
+                    setattr(cls, name, self._wrap(name, method))
+        _active_profiler = self
+
+    def disable(self):
+        global _active_profiler
+        if _active_profiler is not self:
+            return
+        for cls, name, method in reversed(self._originals):
+            setattr(cls, name, method)
+        self._originals.clear()
+        _active_profiler = None
+
+    @contextmanager
+    def table(self, tag: str, size: int = 0) -> Iterator[None]:
+        table_stack = self._state.table_stack
+        table_stack.append(tag)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            table_stack.pop()
+            with self._lock:
+                self.table_time[tag] += elapsed
+                self.table_calls[tag] += 1
+                self.table_bytes[tag] += size
+
+    def reset(self):
+        self.primitive_calls.clear()
+        self.primitive_bytes.clear()
+        self.table_calls.clear()
+        self.table_bytes.clear()
+        self.table_primitive_bytes.clear()
+        self.table_time.clear()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'primitives': {name: {
+                'calls': self.primitive_calls[name],
+                'bytes': self.primitive_bytes[name],
+            } for name in sorted(self.primitive_calls)},
+            'tables': {tag: {
+                'calls': self.table_calls[tag],
+                'bytes': self.table_bytes[tag],
+                'primitive_bytes': self.table_primitive_bytes[tag],
+                'time': self.table_time[tag],
+            } for tag in sorted(self.table_calls)},
+        }
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def format_report(self) -> str:
+        lines = [f'{"table":<8} {"calls":>8} {"bytes":>12} {"primitive":>12} {"time (ms)":>12}']
+        for tag in sorted(self.table_calls, key=lambda tag: self.table_time[tag], reverse=True):
+            lines.append(f'{tag!r:<8} {self.table_calls[tag]:>8} {self.table_bytes[tag]:>12} {self.table_primitive_bytes[tag]:>12} {self.table_time[tag] * 1000:>12.3f}')
+        lines.append('')
+        lines.append(f'{"primitive":<24} {"calls":>8} {"bytes":>12}')
+        for name, calls in self.primitive_calls.most_common():
+            lines.append(f'{name:<24} {calls:>8} {self.primitive_bytes[name]:>12}')
+        return '\n'.join(lines)
@@ -0,0 +1,157 @@
+import struct
+from collections.abc import Callable, Iterable
+from dataclasses import make_dataclass
+from operator import attrgetter
+from typing import Any
+
+from sfnttools.utils.math import round_half_up_integer
+
+
+def _decode_uint24(value: bytes) -> int:
+    return int.from_bytes(value, 'big', signed=False)
+
+
+def _encode_uint24(value: int) -> bytes:
+    return value.to_bytes(3, 'big', signed=False)
+
+
+def _decode_fixed(value: int) -> float:
+    return value / (2 ** 16)
+
+
+def _encode_fixed(value: float) -> int:
+    return round_half_up_integer(value * (2 ** 16))
+
+
+def _decode_f2dot14(value: int) -> float:
+    return value / (2 ** 14)
+
+
+def _encode_f2dot14(value: float) -> int:
+    return round_half_up_integer(value * (2 ** 14))
+
+
+def _decode_tag(value: bytes) -> str:
+    return value.decode('latin-1')
+
+
+def _encode_tag(value: str) -> bytes:
+    data = value.encode('latin-1')
+    if len(data) != 4:
+        raise ValueError('bytes length must be 4')
+    return data
+
+
+def _decode_version_16dot16(major_version: int, minor_version: int) -> tuple[int, int]:
+    return major_version, minor_version >> 12
+
+
+def _encode_version_16dot16(value: tuple[int, int]) -> tuple[int, int]:
+    major_version, minor_version = value
+    if not 0 <= minor_version <= 9:
+        raise ValueError('minor version requires 0 <= integer <= 9')
+    return major_version, minor_version << 12
+
+
+_FIELD_TYPES: dict[str, tuple[str, Callable[..., Any] | None, Callable[[Any], Any] | None]] = {
+    'uint8': ('B', None, None),
+    'int8': ('b', None, None),
+    'uint16': ('H', None, None),
+    'int16': ('h', None, None),
+    'uint24': ('3s', _decode_uint24, _encode_uint24),
+    'uint32': ('I', None, None),
+    'int32': ('i', None, None),
+    'fixed': ('i', _decode_fixed, _encode_fixed),
+    'fword': ('h', None, None),
+    'ufword': ('H', None, None),
+    'f2dot14': ('h', _decode_f2dot14, _encode_f2dot14),
+    'long_datetime': ('q', None, None),
+    'tag': ('4s', _decode_tag, _encode_tag),
+    'offset8': ('B', None, None),
+    'offset16': ('H', None, None),
+    'offset24': ('3s', _decode_uint24, _encode_uint24),
+    'offset32': ('I', None, None),
+    'version_16dot16': ('HH', _decode_version_16dot16, _encode_version_16dot16),
+}
+
+
+class RecordSchema:
+    name: str
+    fields: list[tuple[str, str]]
+    record_class: type
+    size: int
+
+    def __init__(self, name: str, fields: list[tuple[str, str]]):
+        for field_name, field_type in fields:
+            if field_type not in _FIELD_TYPES:
+                raise ValueError(f'unknown field type: {field_type!r}')
+
+        self.name = name
+        self.fields = fields
+        self.record_class = make_dataclass(name, [field_name for field_name, _ in fields], slots=True)
+        self._struct = struct.Struct('>' + ''.join(_FIELD_TYPES[field_type][0] for _, field_type in fields))
+        self.size = self._struct.size
+
+        self._decoders = []
+        self._encoders = []
+        position = 0
+        for _, field_type in fields:
+            field_format, decoder, encoder = _FIELD_TYPES[field_type]
+            width = 2 if field_format == 'HH' else 1
+            self._decoders.append((position, width, decoder))
+            self._encoders.append((width, encoder))
+            position += width
+        self._plain = all(decoder is None for _, _, decoder in self._decoders)
+        names = [field_name for field_name, _ in fields]
+        getter = attrgetter(*names)
+        self._get_values = getter if len(names) > 1 else lambda record: (getter(record),)
+
+    def _decode(self, values: tuple) -> Any:
+        if self._plain:
+            return self.record_class(*values)
+        args = []
+        for position, width, decoder in self._decoders:
+            if decoder is None:
+                args.append(values[position])
+            else:
+                args.append(decoder(*values[position:position + width]))
+        return self.record_class(*args)
+
+    def _encode(self, record: Any) -> tuple:
+        values = self._get_values(record)
+        if self._plain:
+            return values
+        slots = []
+        for value, (width, encoder) in zip(values, self._encoders):
+            if encoder is None:
+                slots.append(value)
+            elif width == 1:
+                slots.append(encoder(value))
+            else:
+                slots.extend(encoder(value))
+        return tuple(slots)
+
+    def new_record(self, *args: Any, **kwargs: Any) -> Any:
+        return self.record_class(*args, **kwargs)
+
+    def unpack(self, buffer: bytes | bytearray | memoryview) -> Any:
+        return self._decode(self._struct.unpack(buffer))
+
+    def unpack_from(self, buffer: bytes | bytearray | memoryview, offset: int = 0) -> Any:
+        return self._decode(self._struct.unpack_from(buffer, offset))
+
+    def unpack_many(self, buffer: bytes | bytearray | memoryview, offset: int, count: int) -> list[Any]:
+        with memoryview(buffer) as view:
+            end = offset + self.size * count
+            if end > len(view):
+                raise EOFError()
+            return [self._decode(values) for values in self._struct.iter_unpack(view[offset:end])]
+
+    def pack(self, record: Any) -> bytes:
+        return self._struct.pack(*self._encode(record))
+
+    def pack_into(self, buffer: bytearray | memoryview, offset: int, record: Any):
+        self._struct.pack_into(buffer, offset, *self._encode(record))
+
+    def pack_many(self, records: Iterable[Any]) -> bytes:
+        return b''.join(self._struct.pack(*self._encode(record)) for record in records)
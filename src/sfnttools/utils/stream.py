@@ -1,8 +1,40 @@
-import os
-from io import BytesIO, StringIO
-from typing import BinaryIO
+from __future__ import annotations
 
-from sfnttools.utils.math import round_half_up
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from io import BytesIO, StringIO, UnsupportedOperation
+from mmap import mmap, ACCESS_READ
+from typing import Any, BinaryIO
+
+from sfnttools.utils.fixed import decode_f2dot14_many, decode_fixed_many, encode_f2dot14_many, encode_fixed_many
+from sfnttools.utils.math import round_half_up_integer
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.varint import decode_255uint16_many, decode_uint_base128_many, encode_255uint16_many, encode_uint_base128_many
+
+
+def _find_array_typecode(size: int, signed: bool) -> str:
+    for typecode in ('bhilq' if signed else 'BHILQ'):
+        if array(typecode).itemsize == size:
+            return typecode
+    raise ValueError(f'no array typecode for {size} bytes')
+
+
+_UINT8_TYPECODE = _find_array_typecode(1, False)
+_INT8_TYPECODE = _find_array_typecode(1, True)
+_UINT16_TYPECODE = _find_array_typecode(2, False)
+_INT16_TYPECODE = _find_array_typecode(2, True)
+_UINT32_TYPECODE = _find_array_typecode(4, False)
+_INT32_TYPECODE = _find_array_typecode(4, True)
+
+_UINT8_STRUCT = struct.Struct('>B')
+_INT8_STRUCT = struct.Struct('>b')
+_UINT16_STRUCT = struct.Struct('>H')
+_INT16_STRUCT = struct.Struct('>h')
+_UINT32_STRUCT = struct.Struct('>I')
+_INT32_STRUCT = struct.Struct('>i')
 
 
 class Stream:
@@ -21,6 +53,16 @@ class Stream:
             raise EOFError()
         return values
 
+    def read_view(self, size: int, ignore_eof: bool = False) -> memoryview:
+        return memoryview(self.read(size, ignore_eof))
+
+    def _read_array(self, typecode: str, count: int) -> array:
+        values = array(typecode)
+        values.frombytes(self.read_view(values.itemsize * count))
+        if values.itemsize > 1 and sys.byteorder == 'little':
+            values.byteswap()
+        return values
+
     def read_uint8(self) -> int:
         return int.from_bytes(self.read(1), 'big', signed=False)
 
@@ -108,6 +150,50 @@ class Stream:
                 return value
         raise ValueError('uint_base128 sequence exceeds 5 bytes')
 
+    def read_uint8_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        values = self._read_array(_UINT8_TYPECODE, count)
+        return tuple(values) if as_tuple else values
+
+    def read_int8_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        values = self._read_array(_INT8_TYPECODE, count)
+        return tuple(values) if as_tuple else values
+
+    def read_uint16_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        values = self._read_array(_UINT16_TYPECODE, count)
+        return tuple(values) if as_tuple else values
+
+    def read_int16_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        values = self._read_array(_INT16_TYPECODE, count)
+        return tuple(values) if as_tuple else values
+
+    def read_uint32_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        values = self._read_array(_UINT32_TYPECODE, count)
+        return tuple(values) if as_tuple else values
+
+    def read_int32_array(self, count: int, as_tuple: bool = False) -> array | tuple[int, ...]:
+        values = self._read_array(_INT32_TYPECODE, count)
+        return tuple(values) if as_tuple else values
+
+    def read_fixed_array(self, count: int, as_tuple: bool = False) -> array | tuple[float, ...]:
+        values = decode_fixed_many(self._read_array(_INT32_TYPECODE, count))
+        return tuple(values) if as_tuple else values
+
+    def read_f2dot14_array(self, count: int, as_tuple: bool = False) -> array | tuple[float, ...]:
+        values = decode_f2dot14_many(self._read_array(_INT16_TYPECODE, count))
+        return tuple(values) if as_tuple else values
+
+    def read_record(self, schema: RecordSchema) -> Any:
+        return schema.unpack(self.read_view(schema.size))
+
+    def read_records(self, schema: RecordSchema, count: int) -> list[Any]:
+        return schema.unpack_many(self.read_view(schema.size * count), 0, count)
+
+    def read_255uint16_many(self, count: int) -> list[int]:
+        return [self.read_255uint16() for _ in range(count)]
+
+    def read_uint_base128_many(self, count: int) -> list[int]:
+        return [self.read_uint_base128() for _ in range(count)]
+
     def read_binary_string(self, size: int) -> str:
         value = StringIO()
         for b in self.read(size):
@@ -117,6 +203,12 @@ class Stream:
     def write(self, values: bytes) -> int:
         return self.source.write(values)
 
+    def _write_array(self, typecode: str, values: Iterable[int]) -> int:
+        values = array(typecode, values)
+        if values.itemsize > 1 and sys.byteorder == 'little':
+            values.byteswap()
+        return self.write(values.tobytes())
+
     def write_uint8(self, value: int) -> int:
         return self.write(value.to_bytes(1, 'big', signed=False))
 
@@ -139,7 +231,7 @@ class Stream:
         return self.write(value.to_bytes(4, 'big', signed=True))
 
     def write_fixed(self, value: float) -> int:
-        return self.write_int32(round_half_up(value * (2 ** 16)))
+        return self.write_int32(round_half_up_integer(value * (2 ** 16)))
 
     def write_fword(self, value: int) -> int:
         return self.write_int16(value)
@@ -148,7 +240,7 @@ class Stream:
         return self.write_uint16(value)
 
     def write_f2dot14(self, value: float) -> int:
-        return self.write_int16(round_half_up(value * (2 ** 14)))
+        return self.write_int16(round_half_up_integer(value * (2 ** 14)))
 
     def write_long_datetime(self, value: int) -> int:
         return self.write(value.to_bytes(8, 'big', signed=True))
@@ -210,6 +302,42 @@ class Stream:
             size += self.write_uint8(code)
         return size
 
+    def write_uint8_array(self, values: Iterable[int]) -> int:
+        return self._write_array(_UINT8_TYPECODE, values)
+
+    def write_int8_array(self, values: Iterable[int]) -> int:
+        return self._write_array(_INT8_TYPECODE, values)
+
+    def write_uint16_array(self, values: Iterable[int]) -> int:
+        return self._write_array(_UINT16_TYPECODE, values)
+
+    def write_int16_array(self, values: Iterable[int]) -> int:
+        return self._write_array(_INT16_TYPECODE, values)
+
+    def write_uint32_array(self, values: Iterable[int]) -> int:
+        return self._write_array(_UINT32_TYPECODE, values)
+
+    def write_int32_array(self, values: Iterable[int]) -> int:
+        return self._write_array(_INT32_TYPECODE, values)
+
+    def write_fixed_array(self, values: Iterable[float]) -> int:
+        return self._write_array(_INT32_TYPECODE, encode_fixed_many(values))
+
+    def write_f2dot14_array(self, values: Iterable[float]) -> int:
+        return self._write_array(_INT16_TYPECODE, encode_f2dot14_many(values))
+
+    def write_record(self, schema: RecordSchema, record: Any) -> int:
+        return self.write(schema.pack(record))
+
+    def write_records(self, schema: RecordSchema, records: Iterable[Any]) -> int:
+        return self.write(schema.pack_many(records))
+
+    def write_255uint16_many(self, values: Iterable[int]) -> int:
+        return self.write(encode_255uint16_many(values))
+
+    def write_uint_base128_many(self, values: Iterable[int]) -> int:
+        return self.write(encode_uint_base128_many(values))
+
     def write_binary_string(self, value: str) -> int:
         if len(value) % 8 != 0:
             raise ValueError('the length must be a multiple of 8')
@@ -217,8 +345,8 @@ class Stream:
         return self.write(bytes(int(value[i:i + 8], 2) for i in range(0, len(value), 8)))
 
     def write_nulls(self, size: int) -> int:
-        for _ in range(size):
-            self.write(b'\x00')
+        if size > 0:
+            self.write(bytes(size))
         return size
 
     def align_to_2_byte_with_nulls(self) -> int:
@@ -237,3 +365,220 @@ class Stream:
         if not isinstance(self.source, BytesIO):
             raise ValueError("non 'BytesIO' source cannot get value")
         return self.source.getvalue()
+
+
+class BufferStream(Stream):
+    buffer: memoryview
+    position: int
+    _mmap: mmap | None
+
+    @staticmethod
+    def from_file(file_path: str | os.PathLike[str]) -> BufferStream:
+        with open(file_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return BufferStream(b'')
+            source = mmap(file.fileno(), 0, access=ACCESS_READ)
+        stream = BufferStream(source)
+        stream._mmap = source
+        return stream
+
+    def __init__(self, source: bytes | bytearray | memoryview | mmap):
+        with memoryview(source) as view:
+            self.buffer = view.cast('B')
+        self.position = 0
+        self._mmap = None
+
+    def __enter__(self) -> BufferStream:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.buffer)
+
+    def close(self):
+        self.buffer.release()
+        source, self._mmap = self._mmap, None
+        if source is not None:
+            try:
+                source.close()
+            except BufferError:
+                pass
+
+    def read_view(self, size: int, ignore_eof: bool = False) -> memoryview:
+        if size < 0:
+            size = max(0, len(self.buffer) - self.position)
+        end = max(self.position, min(self.position + size, len(self.buffer)))
+        if end - self.position < size and not ignore_eof:
+            raise EOFError()
+        view = self.buffer[self.position:end]
+        self.position = end
+        return view
+
+    def read(self, size: int, ignore_eof: bool = False) -> bytes:
+        return self.read_view(size, ignore_eof).tobytes()
+
+    def _unpack(self, unpacker: struct.Struct) -> int:
+        if self.position + unpacker.size > len(self.buffer):
+            raise EOFError()
+        value = unpacker.unpack_from(self.buffer, self.position)[0]
+        self.position += unpacker.size
+        return value
+
+    def read_uint8(self) -> int:
+        return self._unpack(_UINT8_STRUCT)
+
+    def read_int8(self) -> int:
+        return self._unpack(_INT8_STRUCT)
+
+    def read_uint16(self) -> int:
+        return self._unpack(_UINT16_STRUCT)
+
+    def read_int16(self) -> int:
+        return self._unpack(_INT16_STRUCT)
+
+    def read_uint32(self) -> int:
+        return self._unpack(_UINT32_STRUCT)
+
+    def read_int32(self) -> int:
+        return self._unpack(_INT32_STRUCT)
+
+    def read_255uint16_many(self, count: int) -> list[int]:
+        values, self.position = decode_255uint16_many(self.buffer, self.position, count)
+        return values
+
+    def read_uint_base128_many(self, count: int) -> list[int]:
+        values, self.position = decode_uint_base128_many(self.buffer, self.position, count)
+        return values
+
+    def slice(self, offset: int, length: int) -> BufferStream:
+        if offset < 0 or length < 0 or offset + length > len(self.buffer):
+            raise EOFError()
+        return BufferStream(self.buffer[offset:offset + length])
+
+    def write(self, values: bytes) -> int:
+        if self.buffer.readonly:
+            raise ValueError('read-only buffer cannot be written')
+        end = self.position + len(values)
+        if end > len(self.buffer):
+            raise EOFError()
+        self.buffer[self.position:end] = values
+        self.position = end
+        return len(values)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.position
+        elif whence == os.SEEK_END:
+            offset += len(self.buffer)
+        if offset < 0:
+            raise ValueError('negative seek position')
+        self.position = offset
+
+    def tell(self) -> int:
+        return self.position
+
+    def get_value(self) -> bytes:
+        return self.buffer.tobytes()
+
+
+class BufferedStream(Stream):
+    buffer: bytearray
+    target: BinaryIO | None
+    target_start: int
+    flushed_size: int
+    flush_size: int
+
+    def __init__(self, target: BinaryIO | None = None, flush_size: int = 1024 * 1024):
+        self.buffer = bytearray()
+        self.target = target
+        self.target_start = 0 if target is None else target.tell()
+        self.flushed_size = 0
+        self.flush_size = flush_size
+
+    def __enter__(self) -> BufferedStream:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.flush()
+
+    def read(self, size: int, ignore_eof: bool = False) -> bytes:
+        raise UnsupportedOperation('buffered stream is write-only')
+
+    def write(self, values: bytes | bytearray | memoryview) -> int:
+        self.buffer += values
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+        return len(values)
+
+    def _write_packed(self, packer: struct.Struct, value: int) -> int:
+        try:
+            self.buffer += packer.pack(value)
+        except struct.error as e:
+            raise OverflowError(str(e)) from e
+        if len(self.buffer) >= self.flush_size:
+            self.flush()
+        return packer.size
+
+    def write_uint8(self, value: int) -> int:
+        return self._write_packed(_UINT8_STRUCT, value)
+
+    def write_int8(self, value: int) -> int:
+        return self._write_packed(_INT8_STRUCT, value)
+
+    def write_uint16(self, value: int) -> int:
+        return self._write_packed(_UINT16_STRUCT, value)
+
+    def write_int16(self, value: int) -> int:
+        return self._write_packed(_INT16_STRUCT, value)
+
+    def write_uint32(self, value: int) -> int:
+        return self._write_packed(_UINT32_STRUCT, value)
+
+    def write_int32(self, value: int) -> int:
+        return self._write_packed(_INT32_STRUCT, value)
+
+    def reserve(self, size: int) -> int:
+        offset = self.tell()
+        self.write_nulls(size)
+        return offset
+
+    def patch(self, offset: int, values: bytes | bytearray | memoryview):
+        if offset < 0 or offset + len(values) > self.tell():
+            raise ValueError('patch range out of written data')
+
+        buffer_offset = offset - self.flushed_size
+        if buffer_offset < 0:
+            flushed_values = values[:-buffer_offset]
+            self.target.seek(self.target_start + offset)
+            self.target.write(flushed_values)
+            self.target.seek(self.target_start + self.flushed_size)
+            values = values[-buffer_offset:]
+            buffer_offset = 0
+        self.buffer[buffer_offset:buffer_offset + len(values)] = values
+
+    def patch_uint16(self, offset: int, value: int):
+        self.patch(offset, value.to_bytes(2, 'big', signed=False))
+
+    def patch_uint32(self, offset: int, value: int):
+        self.patch(offset, value.to_bytes(4, 'big', signed=False))
+
+    def flush(self):
+        if self.target is None or len(self.buffer) == 0:
+            return
+        self.target.write(self.buffer)
+        self.flushed_size += len(self.buffer)
+        self.buffer.clear()
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET):
+        raise UnsupportedOperation('buffered stream is append-only, use patch instead')
+
+    def tell(self) -> int:
+        return self.flushed_size + len(self.buffer)
+
+    def get_value(self) -> bytes:
+        if self.target is not None:
+            raise ValueError('buffered stream with target cannot get value')
+        return bytes(self.buffer)
@@ -0,0 +1,85 @@
+from collections.abc import Iterable
+
+_255UINT16_ENCODINGS = [
+    *(bytes([value]) for value in range(253)),
+    *(bytes([255, value - 253]) for value in range(253, 506)),
+    *(bytes([254, value - 506]) for value in range(506, 762)),
+]
+
+
+def decode_255uint16_many(buffer: bytes | bytearray | memoryview, offset: int, count: int) -> tuple[list[int], int]:
+    values = []
+    try:
+        for _ in range(count):
+            code = buffer[offset]
+            if code < 253:
+                values.append(code)
+                offset += 1
+            elif code == 253:
+                values.append((buffer[offset + 1] << 8) | buffer[offset + 2])
+                offset += 3
+            elif code == 254:
+                values.append(buffer[offset + 1] + 506)
+                offset += 2
+            else:
+                values.append(buffer[offset + 1] + 253)
+                offset += 2
+    except IndexError as e:
+        raise EOFError() from e
+    return values, offset
+
+
+def encode_255uint16_many(values: Iterable[int]) -> bytes:
+    chunks = []
+    for value in values:
+        if not 0 <= value <= 0xFFFF:
+            raise ValueError('255uint16 requires 0 <= integer <= 65535')
+        if value < 762:
+            chunks.append(_255UINT16_ENCODINGS[value])
+        else:
+            chunks.append(bytes([253, value >> 8, value & 0xFF]))
+    return b''.join(chunks)
+
+
+def decode_uint_base128_many(buffer: bytes | bytearray | memoryview, offset: int, count: int) -> tuple[list[int], int]:
+    values = []
+    try:
+        for _ in range(count):
+            code = buffer[offset]
+            offset += 1
+            if code < 0x80:
+                values.append(code)
+                continue
+            if code == 0x80:
+                raise ValueError('uint_base128 bytes must not start with leading zeros')
+            value = code & 0x7F
+            for _ in range(4):
+                code = buffer[offset]
+                offset += 1
+                value = (value << 7) | (code & 0x7F)
+                if value >= 2 ** 32:
+                    raise ValueError('uint_base128 value exceeds 2 ** 32 - 1')
+                if code < 0x80:
+                    values.append(value)
+                    break
+            else:
+                raise ValueError('uint_base128 sequence exceeds 5 bytes')
+    except IndexError as e:
+        raise EOFError() from e
+    return values, offset
+
+
+def encode_uint_base128_many(values: Iterable[int]) -> bytes:
+    buffer = bytearray()
+    for value in values:
+        if not 0 <= value < 2 ** 32:
+            raise ValueError('uint_base128 requires 0 <= integer < 2 ** 32')
+        if value < 0x80:
+            buffer.append(value)
+            continue
+        shift = (value.bit_length() - 1) // 7 * 7
+        while shift > 0:
+            buffer.append(((value >> shift) & 0x7F) | 0x80)
+            shift -= 7
+        buffer.append(value & 0x7F)
+    return bytes(buffer)
@@ -0,0 +1,64 @@
+import os
+from mmap import mmap
+
+from sfnttools.directory import SFNT_VERSIONS, OFFSET_TABLE_SCHEMA, TABLE_RECORD_SCHEMA, HEAD_CHECKSUM_ADJUSTMENT_OFFSET
+from sfnttools.utils.checksum import calculate_checksum, calculate_checksum_adjustment
+from sfnttools.utils.stream import BufferStream
+
+
+def validate_sfnt(data: bytes | bytearray | memoryview | mmap, offset: int = 0) -> list[str]:
+    with memoryview(data) as view, view.cast('B') as view:
+        if offset + OFFSET_TABLE_SCHEMA.size > len(view):
+            return ['offset table is truncated']
+        offset_table = OFFSET_TABLE_SCHEMA.unpack_from(view, offset)
+        if offset_table.sfnt_version not in SFNT_VERSIONS:
+            return [f'unknown sfnt version: {offset_table.sfnt_version!r}']
+        directory_end = offset + OFFSET_TABLE_SCHEMA.size + TABLE_RECORD_SCHEMA.size * offset_table.num_tables
+        if directory_end > len(view):
+            return ['table directory is truncated']
+        table_records = TABLE_RECORD_SCHEMA.unpack_many(view, offset + OFFSET_TABLE_SCHEMA.size, offset_table.num_tables)
+
+        problems = []
+        tags = [table_record.tag for table_record in table_records]
+        if len(set(tags)) != len(tags):
+            problems.append('table directory contains duplicate tags')
+        if tags != sorted(tags):
+            problems.append('table records are not sorted by tag')
+
+        checksums = [calculate_checksum(view[offset:directory_end])]
+        checksum_adjustment = None
+        layout_broken = False
+        previous_record = None
+        for table_record in sorted(table_records, key=lambda table_record: (table_record.offset, table_record.length)):
+            tag = table_record.tag
+            end = table_record.offset + table_record.length
+            if table_record.offset % 4 != 0:
+                problems.append(f'{tag!r} offset {table_record.offset} is not 4-byte aligned')
+            if table_record.offset < directory_end or end > len(view):
+                problems.append(f'{tag!r} range {table_record.offset}..{end} is out of bounds')
+                layout_broken = True
+                continue
+            if previous_record is not None and table_record.offset < previous_record.offset + previous_record.length:
+                problems.append(f'{tag!r} overlaps {previous_record.tag!r}')
+                layout_broken = True
+            previous_record = table_record
+
+            with view[table_record.offset:end] as table_data:
+                checksum = calculate_checksum(table_data)
+                if tag == 'head' and table_record.length >= HEAD_CHECKSUM_ADJUSTMENT_OFFSET + 4:
+                    checksum_adjustment = int.from_bytes(table_data[HEAD_CHECKSUM_ADJUSTMENT_OFFSET:HEAD_CHECKSUM_ADJUSTMENT_OFFSET + 4], 'big', signed=False)
+                    checksum = (checksum - checksum_adjustment) & 0xFFFFFFFF
+            if checksum != table_record.checksum:
+                problems.append(f'{tag!r} checksum mismatch: expected {table_record.checksum:08X}, got {checksum:08X}')
+            checksums.append(checksum)
+
+        if checksum_adjustment is not None and not layout_broken:
+            expected_checksum_adjustment = calculate_checksum_adjustment(checksums)
+            if checksum_adjustment != expected_checksum_adjustment:
+                problems.append(f'checkSumAdjustment mismatch: expected {expected_checksum_adjustment:08X}, got {checksum_adjustment:08X}')
+        return problems
+
+
+def validate_sfnt_file(file_path: str | os.PathLike[str], offset: int = 0) -> list[str]:
+    with BufferStream.from_file(file_path) as stream:
+        return validate_sfnt(stream.buffer, offset)
@@ -0,0 +1,78 @@
+import zlib
+from collections.abc import Iterator
+from io import BytesIO
+from typing import Any, BinaryIO
+
+from sfnttools.utils.profiler import profile_table
+from sfnttools.utils.stream import Stream, BufferStream
+from sfnttools.woff.directory import WOFF_SIGNATURE, WOFF_HEADER_SCHEMA, WOFF_TABLE_ENTRY_SCHEMA
+from sfnttools.writer import SfntWriter
+
+
+class WoffDecoder:
+    stream: Stream
+    header: Any
+    table_entries: dict[str, Any]
+    _tables: dict[str, bytes]
+
+    def __init__(self, stream: Stream):
+        header = stream.read_record(WOFF_HEADER_SCHEMA)
+        if header.signature != WOFF_SIGNATURE:
+            raise ValueError('bad woff signature')
+
+        self.stream = stream
+        self.header = header
+        self.table_entries = {table_entry.tag: table_entry for table_entry in stream.read_records(WOFF_TABLE_ENTRY_SCHEMA, header.num_tables)}
+        self._tables = {}
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self.table_entries
+
+    @property
+    def tags(self) -> list[str]:
+        return sorted(self.table_entries)
+
+    def get_table_data(self, tag: str) -> bytes:
+        if tag not in self._tables:
+            table_entry = self.table_entries[tag]
+            with profile_table(tag, table_entry.orig_length):
+                self.stream.seek(table_entry.offset)
+                data = self.stream.read(table_entry.comp_length)
+                if table_entry.comp_length > table_entry.orig_length:
+                    raise ValueError(f'woff table {tag!r} compressed length larger than original length')
+                if table_entry.comp_length < table_entry.orig_length:
+                    data = zlib.decompress(data)
+                    if len(data) != table_entry.orig_length:
+                        raise ValueError(f'woff table {tag!r} length mismatch')
+            self._tables[tag] = data
+        return self._tables[tag]
+
+    def iter_tables(self) -> Iterator[tuple[str, bytes]]:
+        for table_entry in sorted(self.table_entries.values(), key=lambda table_entry: table_entry.offset):
+            yield table_entry.tag, self.get_table_data(table_entry.tag)
+
+    def decode(self, target: BinaryIO):
+        with SfntWriter(target, self.header.flavor, len(self.table_entries)) as writer:
+            for tag, data in self.iter_tables():
+                writer.write_table(tag, data)
+
+    def read_metadata(self) -> bytes | None:
+        if self.header.meta_length == 0:
+            return None
+        self.stream.seek(self.header.meta_offset)
+        metadata = zlib.decompress(self.stream.read(self.header.meta_length))
+        if len(metadata) != self.header.meta_orig_length:
+            raise ValueError('woff metadata length mismatch')
+        return metadata
+
+    def read_private_data(self) -> bytes | None:
+        if self.header.priv_length == 0:
+            return None
+        self.stream.seek(self.header.priv_offset)
+        return self.stream.read(self.header.priv_length)
+
+
+def decode_woff(data: bytes | bytearray | memoryview) -> bytes:
+    target = BytesIO()
+    WoffDecoder(BufferStream(data)).decode(target)
+    return target.getvalue()
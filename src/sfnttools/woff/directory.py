@@ -0,0 +1,27 @@
+from sfnttools.utils.record import RecordSchema
+
+WOFF_SIGNATURE = 'wOFF'
+
+WOFF_HEADER_SCHEMA = RecordSchema('WoffHeader', [
+    ('signature', 'tag'),
+    ('flavor', 'tag'),
+    ('length', 'uint32'),
+    ('num_tables', 'uint16'),
+    ('reserved', 'uint16'),
+    ('total_sfnt_size', 'uint32'),
+    ('major_version', 'uint16'),
+    ('minor_version', 'uint16'),
+    ('meta_offset', 'offset32'),
+    ('meta_length', 'uint32'),
+    ('meta_orig_length', 'uint32'),
+    ('priv_offset', 'offset32'),
+    ('priv_length', 'uint32'),
+])
+
+WOFF_TABLE_ENTRY_SCHEMA = RecordSchema('WoffTableEntry', [
+    ('tag', 'tag'),
+    ('offset', 'offset32'),
+    ('comp_length', 'uint32'),
+    ('orig_length', 'uint32'),
+    ('orig_checksum', 'uint32'),
+])
@@ -0,0 +1,94 @@
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from sfnttools.directory import OFFSET_TABLE_SCHEMA, TABLE_RECORD_SCHEMA, HEAD_CHECKSUM_ADJUSTMENT_OFFSET, read_table_directory
+from sfnttools.utils.checksum import calculate_checksum
+from sfnttools.utils.stream import BufferStream, BufferedStream
+from sfnttools.woff.directory import WOFF_SIGNATURE, WOFF_HEADER_SCHEMA, WOFF_TABLE_ENTRY_SCHEMA
+
+
+class WoffEncoder:
+    level: int
+    max_workers: int | None
+
+    def __init__(self, level: int = 9, max_workers: int | None = None):
+        if not -1 <= level <= 9:
+            raise ValueError('zlib level requires -1 <= integer <= 9')
+
+        self.level = level
+        self.max_workers = max_workers
+
+    def _compress_table(self, data: memoryview) -> bytes | memoryview:
+        compressed_data = zlib.compress(data, self.level)
+        if len(compressed_data) < len(data):
+            return compressed_data
+        return data
+
+    def encode(
+            self,
+            data: bytes | bytearray | memoryview,
+            metadata: bytes | None = None,
+            private_data: bytes | None = None,
+    ) -> bytes:
+        source = BufferStream(data)
+        offset_table, table_records = read_table_directory(source)
+        tables = {}
+        for table_record in sorted(table_records, key=lambda table_record: table_record.tag):
+            tables[table_record.tag] = source.slice(table_record.offset, table_record.length).buffer
+
+        if self.max_workers == 1:
+            compressed_tables = [self._compress_table(table_data) for table_data in tables.values()]
+        else:
+            with ThreadPoolExecutor(self.max_workers) as executor:
+                compressed_tables = list(executor.map(self._compress_table, tables.values()))
+
+        stream = BufferedStream()
+        stream.reserve(WOFF_HEADER_SCHEMA.size)
+        entries_offset = stream.reserve(WOFF_TABLE_ENTRY_SCHEMA.size * len(tables))
+        table_entries = []
+        for (tag, table_data), compressed_data in zip(tables.items(), compressed_tables):
+            if tag == 'head':
+                checksum_data = bytearray(table_data)
+                checksum_data[HEAD_CHECKSUM_ADJUSTMENT_OFFSET:HEAD_CHECKSUM_ADJUSTMENT_OFFSET + 4] = bytes(4)
+            else:
+                checksum_data = table_data
+            table_entries.append(WOFF_TABLE_ENTRY_SCHEMA.new_record(tag, stream.tell(), len(compressed_data), len(table_data), calculate_checksum(checksum_data)))
+            stream.write(compressed_data)
+            stream.align_to_4_byte_with_nulls()
+        stream.patch(entries_offset, WOFF_TABLE_ENTRY_SCHEMA.pack_many(table_entries))
+
+        meta_offset = 0
+        meta_length = 0
+        if metadata is not None:
+            meta_offset = stream.tell()
+            meta_length = stream.write(zlib.compress(metadata, self.level))
+        priv_offset = 0
+        if private_data is not None:
+            stream.align_to_4_byte_with_nulls()
+            priv_offset = stream.tell()
+            stream.write(private_data)
+
+        head = tables.get('head')
+        stream.patch(0, WOFF_HEADER_SCHEMA.pack(WOFF_HEADER_SCHEMA.new_record(
+            WOFF_SIGNATURE,
+            offset_table.sfnt_version,
+            stream.tell(),
+            len(tables),
+            0,
+            OFFSET_TABLE_SCHEMA.size + TABLE_RECORD_SCHEMA.size * len(tables) + sum((len(table_data) + 3) // 4 * 4 for table_data in tables.values()),
+            0 if head is None else int.from_bytes(head[4:6], 'big', signed=False),
+            0 if head is None else int.from_bytes(head[6:8], 'big', signed=False),
+            meta_offset,
+            meta_length,
+            0 if metadata is None else len(metadata),
+            priv_offset,
+            0 if private_data is None else len(private_data),
+        )))
+        return stream.get_value()
+
+    def encode_file(self, input_file_path: str | os.PathLike[str], output_file_path: str | os.PathLike[str]):
+        with BufferStream.from_file(input_file_path) as source:
+            data = self.encode(source.buffer)
+        with open(output_file_path, 'wb') as file:
+            file.write(data)
@@ -0,0 +1,119 @@
+from collections.abc import Iterator
+from io import BytesIO
+from typing import Any, BinaryIO
+
+import brotli
+
+from sfnttools.utils.profiler import profile_table
+from sfnttools.utils.stream import Stream, BufferStream
+from sfnttools.woff2.directory import WOFF2_SIGNATURE, WOFF2_HEADER_SCHEMA, Woff2TableEntry, read_table_entries
+from sfnttools.woff2.glyf import reconstruct_glyf_loca
+from sfnttools.woff2.hmtx import reconstruct_hmtx
+from sfnttools.writer import SfntWriter
+
+
+class Woff2Decoder:
+    stream: Stream
+    header: Any
+    table_entries: list[Woff2TableEntry]
+    compressed_data_offset: int
+    chunk_size: int
+
+    def __init__(self, stream: Stream, chunk_size: int = 1024 * 64):
+        header = stream.read_record(WOFF2_HEADER_SCHEMA)
+        if header.signature != WOFF2_SIGNATURE:
+            raise ValueError('bad woff2 signature')
+        if header.flavor == 'ttcf':
+            raise ValueError('woff2 font collections are not supported')
+
+        self.stream = stream
+        self.header = header
+        self.table_entries = read_table_entries(stream, header.num_tables)
+        self.compressed_data_offset = stream.tell()
+        self.chunk_size = chunk_size
+
+    def _iter_decompressed_tables(self) -> Iterator[tuple[Woff2TableEntry, bytes]]:
+        self.stream.seek(self.compressed_data_offset)
+        decompressor = brotli.Decompressor()
+        remaining_size = self.header.total_compressed_size
+        buffer = bytearray()
+        for entry in self.table_entries:
+            data_length = entry.data_length
+            while len(buffer) < data_length:
+                if remaining_size <= 0:
+                    raise EOFError()
+                chunk = self.stream.read(min(self.chunk_size, remaining_size))
+                remaining_size -= len(chunk)
+                buffer += decompressor.process(chunk)
+            data = bytes(buffer[:data_length])
+            del buffer[:data_length]
+            yield entry, data
+        while remaining_size > 0:
+            chunk = self.stream.read(min(self.chunk_size, remaining_size))
+            remaining_size -= len(chunk)
+            buffer += decompressor.process(chunk)
+        if len(buffer) > 0 or not decompressor.is_finished():
+            raise ValueError('woff2 compressed data size mismatch')
+
+    def iter_tables(self) -> Iterator[tuple[str, bytes]]:
+        tables = {}
+        deferred_entries = []
+        glyf_result = None
+        for entry, data in self._iter_decompressed_tables():
+            if not entry.transformed:
+                if entry.tag in ('hhea', 'maxp'):
+                    tables[entry.tag] = data
+                yield entry.tag, data
+            elif entry.tag == 'glyf':
+                with profile_table('glyf', len(data)):
+                    glyf_result = reconstruct_glyf_loca(data)
+                yield 'glyf', glyf_result[0]
+            elif entry.tag in ('loca', 'hmtx'):
+                deferred_entries.append((entry, data))
+            else:
+                raise ValueError(f'unsupported transform version {entry.transform_version} for {entry.tag!r} table')
+
+            while len(deferred_entries) > 0:
+                entry, data = deferred_entries[0]
+                if glyf_result is None:
+                    break
+                if entry.tag == 'loca':
+                    yield 'loca', glyf_result[1]
+                else:
+                    if 'hhea' not in tables or 'maxp' not in tables:
+                        break
+                    num_glyphs = int.from_bytes(tables['maxp'][4:6], 'big', signed=False)
+                    num_h_metrics = int.from_bytes(tables['hhea'][34:36], 'big', signed=False)
+                    with profile_table('hmtx', len(data)):
+                        hmtx = reconstruct_hmtx(data, num_glyphs, num_h_metrics, glyf_result[2])
+                    yield 'hmtx', hmtx
+                deferred_entries.pop(0)
+
+        if len(deferred_entries) > 0:
+            raise ValueError("transformed 'loca' or 'hmtx' table is missing its dependencies")
+
+    def decode(self, target: BinaryIO):
+        with SfntWriter(target, self.header.flavor, len(self.table_entries)) as writer:
+            for tag, data in self.iter_tables():
+                writer.write_table(tag, data)
+
+    def read_metadata(self) -> bytes | None:
+        if self.header.meta_length == 0:
+            return None
+        self.stream.seek(self.header.meta_offset)
+        metadata = brotli.decompress(self.stream.read(self.header.meta_length))
+        if len(metadata) != self.header.meta_orig_length:
+            raise ValueError('woff2 metadata length mismatch')
+        return metadata
+
+    def read_private_data(self) -> bytes | None:
+        if self.header.priv_length == 0:
+            return None
+        self.stream.seek(self.header.priv_offset)
+        return self.stream.read(self.header.priv_length)
+
+
+def decode_woff2(data: bytes | bytearray | memoryview) -> bytes:
+    target = BytesIO()
+    Woff2Decoder(BufferStream(data)).decode(target)
+    return target.getvalue()
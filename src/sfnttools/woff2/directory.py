@@ -0,0 +1,111 @@
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import Stream
+
+WOFF2_SIGNATURE = 'wOF2'
+
+WOFF2_HEADER_SCHEMA = RecordSchema('Woff2Header', [
+    ('signature', 'tag'),
+    ('flavor', 'tag'),
+    ('length', 'uint32'),
+    ('num_tables', 'uint16'),
+    ('reserved', 'uint16'),
+    ('total_sfnt_size', 'uint32'),
+    ('total_compressed_size', 'uint32'),
+    ('major_version', 'uint16'),
+    ('minor_version', 'uint16'),
+    ('meta_offset', 'offset32'),
+    ('meta_length', 'uint32'),
+    ('meta_orig_length', 'uint32'),
+    ('priv_offset', 'offset32'),
+    ('priv_length', 'uint32'),
+])
+
+KNOWN_TABLE_TAGS = [
+    'cmap', 'head', 'hhea', 'hmtx', 'maxp', 'name', 'OS/2', 'post',
+    'cvt ', 'fpgm', 'glyf', 'loca', 'prep', 'CFF ', 'VORG', 'EBDT',
+    'EBLC', 'gasp', 'hdmx', 'kern', 'LTSH', 'PCLT', 'VDMX', 'vhea',
+    'vmtx', 'BASE', 'GDEF', 'GPOS', 'GSUB', 'EBSC', 'JSTF', 'MATH',
+    'CBDT', 'CBLC', 'COLR', 'CPAL', 'SVG ', 'sbix', 'acnt', 'avar',
+    'bdat', 'bloc', 'bsln', 'cvar', 'fdsc', 'feat', 'fmtx', 'fvar',
+    'gvar', 'hsty', 'just', 'lcar', 'mort', 'morx', 'opbd', 'prop',
+    'trak', 'Zapf', 'Silf', 'Glat', 'Gloc', 'Feat', 'Sill',
+]
+
+_KNOWN_TABLE_TAG_INDICES = {tag: index for index, tag in enumerate(KNOWN_TABLE_TAGS)}
+_ARBITRARY_TAG_INDEX = 0x3F
+
+_GLYF_LOCA_NULL_TRANSFORM_VERSION = 3
+
+
+class Woff2TableEntry:
+    tag: str
+    transform_version: int
+    orig_length: int
+    transform_length: int | None
+
+    def __init__(
+            self,
+            tag: str,
+            orig_length: int,
+            transform_version: int = 0,
+            transform_length: int | None = None,
+    ):
+        self.tag = tag
+        self.orig_length = orig_length
+        self.transform_version = transform_version
+        self.transform_length = transform_length
+
+    def __repr__(self) -> str:
+        return f'Woff2TableEntry({self.tag!r}, orig_length={self.orig_length}, transform_version={self.transform_version}, transform_length={self.transform_length})'
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Woff2TableEntry):
+            return NotImplemented
+        return (self.tag == other.tag and
+                self.orig_length == other.orig_length and
+                self.transform_version == other.transform_version and
+                self.transform_length == other.transform_length)
+
+    @property
+    def transformed(self) -> bool:
+        if self.tag in ('glyf', 'loca'):
+            return self.transform_version != _GLYF_LOCA_NULL_TRANSFORM_VERSION
+        return self.transform_version != 0
+
+    @property
+    def data_length(self) -> int:
+        return self.transform_length if self.transformed else self.orig_length
+
+
+def read_table_entries(stream: Stream, num_tables: int) -> list[Woff2TableEntry]:
+    entries = []
+    for _ in range(num_tables):
+        flags = stream.read_uint8()
+        tag_index = flags & 0x3F
+        transform_version = flags >> 6
+        if tag_index == _ARBITRARY_TAG_INDEX:
+            tag = stream.read_tag()
+        else:
+            tag = KNOWN_TABLE_TAGS[tag_index]
+        entry = Woff2TableEntry(tag, stream.read_uint_base128(), transform_version)
+        if entry.transformed:
+            entry.transform_length = stream.read_uint_base128()
+            if tag == 'loca' and entry.transform_length != 0:
+                raise ValueError("transformed 'loca' table must have a zero transform length")
+        entries.append(entry)
+    return entries
+
+
+def write_table_entries(stream: Stream, entries: list[Woff2TableEntry]) -> int:
+    size = 0
+    for entry in entries:
+        if not 0 <= entry.transform_version <= 3:
+            raise ValueError('transform version requires 0 <= integer <= 3')
+        tag_index = _KNOWN_TABLE_TAG_INDICES.get(entry.tag, _ARBITRARY_TAG_INDEX)
+        size += stream.write_uint8((entry.transform_version << 6) | tag_index)
+        if tag_index == _ARBITRARY_TAG_INDEX:
+            size += stream.write_tag(entry.tag)
+        size += stream.write_uint_base128(entry.orig_length)
+        if entry.transformed:
+            size += stream.write_uint_base128(entry.transform_length)
+    return size
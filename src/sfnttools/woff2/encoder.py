@@ -0,0 +1,141 @@
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+
+import brotli
+
+from sfnttools.directory import SFNT_VERSION_TRUETYPE, TABLE_RECORD_SCHEMA, OFFSET_TABLE_SCHEMA, read_table_directory
+from sfnttools.utils.profiler import profile_table
+from sfnttools.utils.stream import BufferStream, BufferedStream
+from sfnttools.woff2.directory import WOFF2_SIGNATURE, WOFF2_HEADER_SCHEMA, Woff2TableEntry, write_table_entries
+from sfnttools.woff2.glyf import transform_glyf_loca
+from sfnttools.woff2.hmtx import transform_hmtx
+
+_HEAD_FLAG_LOSSLESS_MODIFYING_TRANSFORM = 1 << 11
+
+
+class Woff2Encoder:
+    quality: int
+    window_bits: int
+    transform_glyf: bool
+
+    def __init__(self, quality: int = 11, window_bits: int = 22, transform_glyf: bool = True):
+        if not 0 <= quality <= 11:
+            raise ValueError('brotli quality requires 0 <= integer <= 11')
+        if not 10 <= window_bits <= 24:
+            raise ValueError('brotli window bits requires 10 <= integer <= 24')
+
+        self.quality = quality
+        self.window_bits = window_bits
+        self.transform_glyf = transform_glyf
+
+    def encode(
+            self,
+            data: bytes | bytearray | memoryview,
+            metadata: bytes | None = None,
+            private_data: bytes | None = None,
+    ) -> bytes:
+        source = BufferStream(data)
+        offset_table, table_records = read_table_directory(source)
+        tables = {}
+        for table_record in sorted(table_records, key=lambda table_record: table_record.tag):
+            tables[table_record.tag] = source.slice(table_record.offset, table_record.length).buffer
+
+        transformed_glyf = None
+        x_mins = None
+        if self.transform_glyf and offset_table.sfnt_version == SFNT_VERSION_TRUETYPE and all(tag in tables for tag in ('glyf', 'loca', 'head', 'maxp')):
+            index_format = int.from_bytes(tables['head'][50:52], 'big', signed=True)
+            num_glyphs = int.from_bytes(tables['maxp'][4:6], 'big', signed=False)
+            with profile_table('glyf', len(tables['glyf'])):
+                transformed_glyf, x_mins = transform_glyf_loca(tables['glyf'], tables['loca'], index_format, num_glyphs)
+            head = bytearray(tables['head'])
+            head[16:18] = (int.from_bytes(head[16:18], 'big', signed=False) | _HEAD_FLAG_LOSSLESS_MODIFYING_TRANSFORM).to_bytes(2, 'big', signed=False)
+            tables['head'] = memoryview(head)
+
+        transformed_hmtx = None
+        if x_mins is not None and 'hmtx' in tables and 'hhea' in tables:
+            num_h_metrics = int.from_bytes(tables['hhea'][34:36], 'big', signed=False)
+            with profile_table('hmtx', len(tables['hmtx'])):
+                transformed_hmtx = transform_hmtx(tables['hmtx'], len(x_mins), num_h_metrics, x_mins)
+
+        tags = list(tables)
+        if transformed_glyf is not None:
+            tags.remove('loca')
+            tags.insert(tags.index('glyf') + 1, 'loca')
+
+        entries = []
+        chunks = []
+        for tag in tags:
+            table_data = tables[tag]
+            if tag == 'glyf' and transformed_glyf is not None:
+                entries.append(Woff2TableEntry(tag, len(table_data), 0, len(transformed_glyf)))
+                chunks.append(transformed_glyf)
+            elif tag == 'loca' and transformed_glyf is not None:
+                entries.append(Woff2TableEntry(tag, len(table_data), 0, 0))
+            elif tag == 'hmtx' and transformed_hmtx is not None:
+                entries.append(Woff2TableEntry(tag, len(table_data), 1, len(transformed_hmtx)))
+                chunks.append(transformed_hmtx)
+            else:
+                entries.append(Woff2TableEntry(tag, len(table_data), 3 if tag in ('glyf', 'loca') else 0))
+                chunks.append(table_data)
+        compressed_data = brotli.compress(b''.join(chunks), mode=brotli.MODE_FONT, quality=self.quality, lgwin=self.window_bits)
+
+        stream = BufferedStream()
+        stream.reserve(WOFF2_HEADER_SCHEMA.size)
+        write_table_entries(stream, entries)
+        stream.write(compressed_data)
+
+        meta_offset = 0
+        meta_length = 0
+        if metadata is not None:
+            stream.align_to_4_byte_with_nulls()
+            meta_offset = stream.tell()
+            meta_length = stream.write(brotli.compress(metadata, mode=brotli.MODE_TEXT, quality=self.quality))
+        priv_offset = 0
+        if private_data is not None:
+            stream.align_to_4_byte_with_nulls()
+            priv_offset = stream.tell()
+            stream.write(private_data)
+
+        head = tables.get('head')
+        stream.patch(0, WOFF2_HEADER_SCHEMA.pack(WOFF2_HEADER_SCHEMA.new_record(
+            WOFF2_SIGNATURE,
+            offset_table.sfnt_version,
+            stream.tell(),
+            len(entries),
+            0,
+            OFFSET_TABLE_SCHEMA.size + TABLE_RECORD_SCHEMA.size * len(entries) + sum((len(table_data) + 3) // 4 * 4 for table_data in tables.values()),
+            len(compressed_data),
+            0 if head is None else int.from_bytes(head[4:6], 'big', signed=False),
+            0 if head is None else int.from_bytes(head[6:8], 'big', signed=False),
+            meta_offset,
+            meta_length,
+            0 if metadata is None else len(metadata),
+            priv_offset,
+            0 if private_data is None else len(private_data),
+        )))
+        return stream.get_value()
+
+    def encode_file(self, input_file_path: str | os.PathLike[str], output_file_path: str | os.PathLike[str]):
+        with BufferStream.from_file(input_file_path) as source:
+            data = self.encode(source.buffer)
+        with open(output_file_path, 'wb') as file:
+            file.write(data)
+
+    def encode_many(self, fonts: Iterable[bytes], max_workers: int | None = None) -> list[bytes]:
+        if max_workers == 1:
+            return [self.encode(data) for data in fonts]
+        with ProcessPoolExecutor(max_workers) as executor:
+            return list(executor.map(self.encode, fonts))
+
+    def encode_files(self, file_paths: Iterable[tuple[str | os.PathLike[str], str | os.PathLike[str]]], max_workers: int | None = None):
+        file_paths = list(file_paths)
+        if max_workers == 1:
+            for input_file_path, output_file_path in file_paths:
+                self.encode_file(input_file_path, output_file_path)
+            return
+        with ProcessPoolExecutor(max_workers) as executor:
+            input_file_paths = [input_file_path for input_file_path, _ in file_paths]
+            output_file_paths = [output_file_path for _, output_file_path in file_paths]
+            for _ in executor.map(self.encode_file, input_file_paths, output_file_paths):
+                pass
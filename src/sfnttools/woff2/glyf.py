@@ -0,0 +1,316 @@
+from array import array
+
+from sfnttools.tables.glyf import calculate_composite_glyph_size, decode_simple_glyph_data, encode_simple_glyph_data, read_loca_offsets
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import BufferStream, BufferedStream
+from sfnttools.utils.varint import decode_255uint16_many, encode_255uint16_many
+
+GLYF_TRANSFORM_HEADER_SCHEMA = RecordSchema('GlyfTransformHeader', [
+    ('reserved', 'uint16'),
+    ('option_flags', 'uint16'),
+    ('num_glyphs', 'uint16'),
+    ('index_format', 'uint16'),
+    ('n_contour_stream_size', 'uint32'),
+    ('n_points_stream_size', 'uint32'),
+    ('flag_stream_size', 'uint32'),
+    ('glyph_stream_size', 'uint32'),
+    ('composite_stream_size', 'uint32'),
+    ('bbox_stream_size', 'uint32'),
+    ('instruction_stream_size', 'uint32'),
+])
+
+OPTION_FLAG_OVERLAP_SIMPLE_BITMAP = 0x0001
+
+
+def _decode_triplets(flags: memoryview, glyph_stream: memoryview, offset: int, x_coordinates: array, y_coordinates: array, on_curves: bytearray) -> int:
+    x = 0
+    y = 0
+    for flag in flags:
+        on_curves.append(0 if flag & 0x80 else 1)
+        flag &= 0x7F
+        if flag < 10:
+            dx = 0
+            dy = ((flag & 14) << 7) + glyph_stream[offset]
+            offset += 1
+        elif flag < 20:
+            dx = (((flag - 10) & 14) << 7) + glyph_stream[offset]
+            dy = 0
+            offset += 1
+        elif flag < 84:
+            b0 = flag - 20
+            b1 = glyph_stream[offset]
+            dx = 1 + (b0 & 0x30) + (b1 >> 4)
+            dy = 1 + ((b0 & 0x0C) << 2) + (b1 & 0x0F)
+            offset += 1
+        elif flag < 120:
+            b0 = flag - 84
+            dx = 1 + ((b0 // 12) << 8) + glyph_stream[offset]
+            dy = 1 + (((b0 % 12) >> 2) << 8) + glyph_stream[offset + 1]
+            offset += 2
+        elif flag < 124:
+            b1 = glyph_stream[offset + 1]
+            dx = (glyph_stream[offset] << 4) + (b1 >> 4)
+            dy = ((b1 & 0x0F) << 8) + glyph_stream[offset + 2]
+            offset += 3
+        else:
+            dx = (glyph_stream[offset] << 8) + glyph_stream[offset + 1]
+            dy = (glyph_stream[offset + 2] << 8) + glyph_stream[offset + 3]
+            offset += 4
+        if flag < 10:
+            if not flag & 1:
+                dy = -dy
+        elif flag < 20:
+            if not flag & 1:
+                dx = -dx
+        else:
+            if not flag & 1:
+                dx = -dx
+            if not flag & 2:
+                dy = -dy
+        x += dx
+        y += dy
+        x_coordinates.append(x)
+        y_coordinates.append(y)
+    return offset
+
+
+def _read_instructions(instruction_stream: memoryview, offset: int, length: int) -> memoryview:
+    if offset + length > len(instruction_stream):
+        raise EOFError()
+    return instruction_stream[offset:offset + length]
+
+
+def reconstruct_glyf_loca(data: bytes | memoryview) -> tuple[bytes, bytes, array]:
+    stream = BufferStream(data)
+    header = stream.read_record(GLYF_TRANSFORM_HEADER_SCHEMA)
+    num_glyphs = header.num_glyphs
+
+    n_contours = BufferStream(stream.read_view(header.n_contour_stream_size)).read_int16_array(num_glyphs)
+    n_points_stream = stream.read_view(header.n_points_stream_size)
+    flag_stream = stream.read_view(header.flag_stream_size)
+    glyph_stream = stream.read_view(header.glyph_stream_size)
+    composite_stream = stream.read_view(header.composite_stream_size)
+    bbox_stream = stream.read_view(header.bbox_stream_size)
+    instruction_stream = stream.read_view(header.instruction_stream_size)
+    if header.option_flags & OPTION_FLAG_OVERLAP_SIMPLE_BITMAP:
+        overlap_simple_bitmap = stream.read_view((num_glyphs + 7) >> 3)
+    else:
+        overlap_simple_bitmap = None
+
+    bbox_bitmap_size = ((num_glyphs + 31) >> 5) << 2
+    bbox_bitmap = bbox_stream[:bbox_bitmap_size]
+    bbox_values = BufferStream(bbox_stream[bbox_bitmap_size:])
+
+    n_points, _ = decode_255uint16_many(n_points_stream, 0, sum(n for n in n_contours if n > 0))
+    n_points_offset = 0
+    flag_offset = 0
+    glyph_offset = 0
+    composite_offset = 0
+    instruction_offset = 0
+
+    glyf = bytearray()
+    loca = []
+    x_mins = array('h', [0]) * num_glyphs
+    for glyph_index, n_contour in enumerate(n_contours):
+        loca.append(len(glyf))
+        has_bbox = bbox_bitmap[glyph_index >> 3] & (0x80 >> (glyph_index & 7))
+        if n_contour == 0:
+            if has_bbox:
+                raise ValueError(f'empty glyph {glyph_index} must not have a bbox')
+            continue
+
+        if n_contour > 0:
+            end_points = []
+            point_count = 0
+            for i in range(n_points_offset, n_points_offset + n_contour):
+                point_count += n_points[i]
+                end_points.append(point_count - 1)
+            n_points_offset += n_contour
+
+            x_coordinates = array('i')
+            y_coordinates = array('i')
+            on_curves = bytearray()
+            flags = flag_stream[flag_offset:flag_offset + point_count]
+            if len(flags) < point_count:
+                raise EOFError()
+            flag_offset += point_count
+            try:
+                glyph_offset = _decode_triplets(flags, glyph_stream, glyph_offset, x_coordinates, y_coordinates, on_curves)
+                [instruction_length], glyph_offset = decode_255uint16_many(glyph_stream, glyph_offset, 1)
+            except IndexError as e:
+                raise EOFError() from e
+            instructions = _read_instructions(instruction_stream, instruction_offset, instruction_length)
+            instruction_offset += instruction_length
+
+            if has_bbox:
+                bbox = bbox_values.read_int16_array(4, as_tuple=True)
+            elif point_count > 0:
+                bbox = min(x_coordinates), min(y_coordinates), max(x_coordinates), max(y_coordinates)
+            else:
+                bbox = 0, 0, 0, 0
+            overlap_simple = overlap_simple_bitmap is not None and overlap_simple_bitmap[glyph_index >> 3] & (0x80 >> (glyph_index & 7))
+            glyph_data = encode_simple_glyph_data(end_points, instructions, on_curves, x_coordinates, y_coordinates, bool(overlap_simple))
+        elif n_contour == -1:
+            if not has_bbox:
+                raise ValueError(f'composite glyph {glyph_index} must have a bbox')
+            bbox = bbox_values.read_int16_array(4, as_tuple=True)
+            size, have_instructions = calculate_composite_glyph_size(composite_stream, composite_offset)
+            glyph_data = composite_stream[composite_offset:composite_offset + size].tobytes()
+            composite_offset += size
+            if have_instructions:
+                [instruction_length], glyph_offset = decode_255uint16_many(glyph_stream, glyph_offset, 1)
+                glyph_data += instruction_length.to_bytes(2, 'big', signed=False)
+                glyph_data += _read_instructions(instruction_stream, instruction_offset, instruction_length)
+                instruction_offset += instruction_length
+        else:
+            raise ValueError(f'illegal number of contours {n_contour} for glyph {glyph_index}')
+
+        x_mins[glyph_index] = bbox[0]
+        glyf += n_contour.to_bytes(2, 'big', signed=True)
+        for value in bbox:
+            glyf += value.to_bytes(2, 'big', signed=True)
+        glyf += glyph_data
+        glyf += bytes(3 - (len(glyf) + 3) % 4)
+    loca.append(len(glyf))
+
+    loca_stream = BufferedStream()
+    if header.index_format == 0:
+        if loca[-1] > 0x1FFFE:
+            raise ValueError("glyf table is too large for short 'loca' format")
+        loca_stream.write_uint16_array([offset >> 1 for offset in loca])
+    else:
+        loca_stream.write_uint32_array(loca)
+    return bytes(glyf), loca_stream.get_value(), x_mins
+
+
+def _encode_triplets(on_curves: bytearray, x_coordinates: array, y_coordinates: array, flag_stream: bytearray, glyph_stream: bytearray):
+    last_x = 0
+    last_y = 0
+    for on_curve, x, y in zip(on_curves, x_coordinates, y_coordinates):
+        dx = x - last_x
+        dy = y - last_y
+        last_x = x
+        last_y = y
+        abs_x = abs(dx)
+        abs_y = abs(dy)
+        on_curve_bit = 0 if on_curve else 0x80
+        x_sign_bit = 0 if dx < 0 else 1
+        y_sign_bit = 0 if dy < 0 else 2
+        xy_sign_bits = x_sign_bit + y_sign_bit
+        if dx == 0 and abs_y < 1280:
+            flag_stream.append(on_curve_bit + ((abs_y & 0xF00) >> 7) + (y_sign_bit >> 1))
+            glyph_stream.append(abs_y & 0xFF)
+        elif dy == 0 and abs_x < 1280:
+            flag_stream.append(on_curve_bit + 10 + ((abs_x & 0xF00) >> 7) + x_sign_bit)
+            glyph_stream.append(abs_x & 0xFF)
+        elif abs_x < 65 and abs_y < 65:
+            flag_stream.append(on_curve_bit + 20 + ((abs_x - 1) & 0x30) + (((abs_y - 1) & 0x30) >> 2) + xy_sign_bits)
+            glyph_stream.append((((abs_x - 1) & 0x0F) << 4) | ((abs_y - 1) & 0x0F))
+        elif abs_x < 769 and abs_y < 769:
+            flag_stream.append(on_curve_bit + 84 + 12 * (((abs_x - 1) & 0x300) >> 8) + (((abs_y - 1) & 0x300) >> 6) + xy_sign_bits)
+            glyph_stream.append((abs_x - 1) & 0xFF)
+            glyph_stream.append((abs_y - 1) & 0xFF)
+        elif abs_x < 4096 and abs_y < 4096:
+            flag_stream.append(on_curve_bit + 120 + xy_sign_bits)
+            glyph_stream.append(abs_x >> 4)
+            glyph_stream.append(((abs_x & 0x0F) << 4) | (abs_y >> 8))
+            glyph_stream.append(abs_y & 0xFF)
+        else:
+            flag_stream.append(on_curve_bit + 124 + xy_sign_bits)
+            glyph_stream += abs_x.to_bytes(2, 'big', signed=False)
+            glyph_stream += abs_y.to_bytes(2, 'big', signed=False)
+
+
+def transform_glyf_loca(glyf: bytes | memoryview, loca: bytes | memoryview, index_format: int, num_glyphs: int) -> tuple[bytes, array]:
+    glyf = memoryview(glyf)
+    offsets = read_loca_offsets(loca, index_format, num_glyphs)
+
+    n_contour_stream = array('h')
+    n_points = []
+    flag_stream = bytearray()
+    glyph_stream = bytearray()
+    composite_stream = bytearray()
+    bbox_bitmap = bytearray(((num_glyphs + 31) >> 5) << 2)
+    bbox_stream = BufferedStream()
+    instruction_stream = bytearray()
+    overlap_simple_bitmap = bytearray((num_glyphs + 7) >> 3)
+    has_overlap_simple = False
+    x_mins = array('h', [0]) * num_glyphs
+
+    for glyph_index in range(num_glyphs):
+        start, end = offsets[glyph_index], offsets[glyph_index + 1]
+        if end < start or end > len(glyf):
+            raise ValueError(f'bad loca offsets for glyph {glyph_index}')
+        if start == end:
+            n_contour_stream.append(0)
+            continue
+
+        glyph_stream_view = BufferStream(glyf[start:end])
+        n_contours = glyph_stream_view.read_int16()
+        bbox = glyph_stream_view.read_int16_array(4, as_tuple=True)
+        x_mins[glyph_index] = bbox[0]
+        n_contour_stream.append(n_contours)
+        glyph_data = glyf[start + 10:end]
+
+        if n_contours > 0:
+            end_points, instructions, on_curves, x_coordinates, y_coordinates, overlap_simple = decode_simple_glyph_data(glyph_data, n_contours)
+            last_end_point = -1
+            for end_point in end_points:
+                n_points.append(end_point - last_end_point)
+                last_end_point = end_point
+            _encode_triplets(on_curves, x_coordinates, y_coordinates, flag_stream, glyph_stream)
+            glyph_stream += encode_255uint16_many([len(instructions)])
+            instruction_stream += instructions
+            if len(x_coordinates) > 0:
+                calculated_bbox = min(x_coordinates), min(y_coordinates), max(x_coordinates), max(y_coordinates)
+            else:
+                calculated_bbox = 0, 0, 0, 0
+            if bbox != calculated_bbox:
+                bbox_bitmap[glyph_index >> 3] |= 0x80 >> (glyph_index & 7)
+                bbox_stream.write_int16_array(bbox)
+            if overlap_simple:
+                overlap_simple_bitmap[glyph_index >> 3] |= 0x80 >> (glyph_index & 7)
+                has_overlap_simple = True
+        elif n_contours == -1:
+            size, have_instructions = calculate_composite_glyph_size(glyph_data, 0)
+            composite_stream += glyph_data[:size]
+            if have_instructions:
+                instruction_data = BufferStream(glyph_data[size:])
+                instruction_length = instruction_data.read_uint16()
+                glyph_stream += encode_255uint16_many([instruction_length])
+                instruction_stream += instruction_data.read_view(instruction_length)
+            bbox_bitmap[glyph_index >> 3] |= 0x80 >> (glyph_index & 7)
+            bbox_stream.write_int16_array(bbox)
+        else:
+            raise ValueError(f'illegal number of contours {n_contours} for glyph {glyph_index}')
+
+    n_contour_data = BufferedStream()
+    n_contour_data.write_int16_array(n_contour_stream)
+    n_contour_data = n_contour_data.get_value()
+    n_points_data = encode_255uint16_many(n_points)
+    bbox_data = bytes(bbox_bitmap) + bbox_stream.get_value()
+
+    stream = BufferedStream()
+    stream.write_record(GLYF_TRANSFORM_HEADER_SCHEMA, GLYF_TRANSFORM_HEADER_SCHEMA.new_record(
+        0,
+        OPTION_FLAG_OVERLAP_SIMPLE_BITMAP if has_overlap_simple else 0,
+        num_glyphs,
+        index_format,
+        len(n_contour_data),
+        len(n_points_data),
+        len(flag_stream),
+        len(glyph_stream),
+        len(composite_stream),
+        len(bbox_data),
+        len(instruction_stream),
+    ))
+    stream.write(n_contour_data)
+    stream.write(n_points_data)
+    stream.write(flag_stream)
+    stream.write(glyph_stream)
+    stream.write(composite_stream)
+    stream.write(bbox_data)
+    stream.write(instruction_stream)
+    if has_overlap_simple:
+        stream.write(overlap_simple_bitmap)
+    return stream.get_value(), x_mins
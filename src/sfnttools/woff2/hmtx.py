@@ -0,0 +1,64 @@
+from array import array
+
+from sfnttools.utils.stream import BufferStream, BufferedStream
+
+HMTX_TRANSFORM_FLAG_NO_PROPORTIONAL_LSBS = 0x01
+HMTX_TRANSFORM_FLAG_NO_MONOSPACED_LSBS = 0x02
+
+
+def reconstruct_hmtx(data: bytes | memoryview, num_glyphs: int, num_h_metrics: int, x_mins: array) -> bytes:
+    stream = BufferStream(data)
+    flags = stream.read_uint8()
+    if flags & 0xFC != 0:
+        raise ValueError("reserved flags of transformed 'hmtx' table must be zero")
+    if flags & 0x03 == 0:
+        raise ValueError("transformed 'hmtx' table must omit at least one left side bearing array")
+    if num_h_metrics < 1 or num_h_metrics > num_glyphs:
+        raise ValueError('number of h metrics requires 1 <= integer <= number of glyphs')
+
+    if len(x_mins) != num_glyphs:
+        raise ValueError("'glyf' table glyph count does not match 'maxp' table")
+
+    advance_widths = stream.read_uint16_array(num_h_metrics)
+    if flags & HMTX_TRANSFORM_FLAG_NO_PROPORTIONAL_LSBS:
+        proportional_lsbs = x_mins[:num_h_metrics]
+    else:
+        proportional_lsbs = stream.read_int16_array(num_h_metrics)
+    if flags & HMTX_TRANSFORM_FLAG_NO_MONOSPACED_LSBS:
+        monospaced_lsbs = x_mins[num_h_metrics:num_glyphs]
+    else:
+        monospaced_lsbs = stream.read_int16_array(num_glyphs - num_h_metrics)
+
+    output = BufferedStream()
+    for advance_width, lsb in zip(advance_widths, proportional_lsbs):
+        output.write_uint16(advance_width)
+        output.write_int16(lsb)
+    output.write_int16_array(monospaced_lsbs)
+    return output.get_value()
+
+
+def transform_hmtx(data: bytes | memoryview, num_glyphs: int, num_h_metrics: int, x_mins: array) -> bytes | None:
+    stream = BufferStream(data)
+    advance_widths = array('H')
+    proportional_lsbs = array('h')
+    for _ in range(num_h_metrics):
+        advance_widths.append(stream.read_uint16())
+        proportional_lsbs.append(stream.read_int16())
+    monospaced_lsbs = stream.read_int16_array(num_glyphs - num_h_metrics)
+
+    flags = 0
+    if proportional_lsbs == x_mins[:num_h_metrics]:
+        flags |= HMTX_TRANSFORM_FLAG_NO_PROPORTIONAL_LSBS
+    if monospaced_lsbs == x_mins[num_h_metrics:num_glyphs]:
+        flags |= HMTX_TRANSFORM_FLAG_NO_MONOSPACED_LSBS
+    if flags == 0:
+        return None
+
+    output = BufferedStream()
+    output.write_uint8(flags)
+    output.write_uint16_array(advance_widths)
+    if not flags & HMTX_TRANSFORM_FLAG_NO_PROPORTIONAL_LSBS:
+        output.write_int16_array(proportional_lsbs)
+    if not flags & HMTX_TRANSFORM_FLAG_NO_MONOSPACED_LSBS:
+        output.write_int16_array(monospaced_lsbs)
+    return output.get_value()
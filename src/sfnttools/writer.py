@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from io import BytesIO
+from typing import Any, BinaryIO
+
+from sfnttools.directory import OFFSET_TABLE_SCHEMA, TABLE_RECORD_SCHEMA, HEAD_CHECKSUM_ADJUSTMENT_OFFSET, new_offset_table
+from sfnttools.utils.checksum import calculate_checksum, calculate_checksum_adjustment
+from sfnttools.utils.profiler import profile_table
+from sfnttools.utils.stream import BufferedStream
+
+
+class SfntWriter:
+    stream: BufferedStream
+    offset_table: Any
+    table_records: list[Any]
+    head_offset: int | None
+
+    def __init__(self, target: BinaryIO, sfnt_version: str, num_tables: int):
+        self.stream = BufferedStream(target)
+        self.offset_table = new_offset_table(sfnt_version, num_tables)
+        self.table_records = []
+        self.head_offset = None
+
+        self.stream.write_record(OFFSET_TABLE_SCHEMA, self.offset_table)
+        self.stream.reserve(TABLE_RECORD_SCHEMA.size * num_tables)
+
+    def __enter__(self) -> SfntWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def write_table(self, tag: str, data: bytes | bytearray | memoryview) -> Any:
+        if len(self.table_records) >= self.offset_table.num_tables:
+            raise ValueError(f'too many tables, expected {self.offset_table.num_tables}')
+        if any(table_record.tag == tag for table_record in self.table_records):
+            raise ValueError(f'duplicate table: {tag!r}')
+
+        with profile_table(tag, len(data)):
+            offset = self.stream.tell()
+            if tag == 'head':
+                self.head_offset = offset
+                data = bytearray(data)
+                data[HEAD_CHECKSUM_ADJUSTMENT_OFFSET:HEAD_CHECKSUM_ADJUSTMENT_OFFSET + 4] = bytes(4)
+            table_record = TABLE_RECORD_SCHEMA.new_record(tag, calculate_checksum(data), offset, len(data))
+            self.stream.write(data)
+            self.stream.align_to_4_byte_with_nulls()
+        self.table_records.append(table_record)
+        return table_record
+
+    def close(self):
+        if len(self.table_records) != self.offset_table.num_tables:
+            raise ValueError(f'expected {self.offset_table.num_tables} tables, got {len(self.table_records)}')
+
+        table_records = sorted(self.table_records, key=lambda table_record: table_record.tag)
+        header_data = OFFSET_TABLE_SCHEMA.pack(self.offset_table) + TABLE_RECORD_SCHEMA.pack_many(table_records)
+        self.stream.patch(0, header_data)
+        if self.head_offset is not None:
+            checksum_adjustment = calculate_checksum_adjustment([
+                calculate_checksum(header_data),
+                *(table_record.checksum for table_record in table_records),
+            ])
+            self.stream.patch_uint32(self.head_offset + HEAD_CHECKSUM_ADJUSTMENT_OFFSET, checksum_adjustment)
+        self.stream.flush()
+
+
+def write_sfnt(target: BinaryIO, tables: Mapping[str, bytes | bytearray | memoryview], sfnt_version: str):
+    with SfntWriter(target, sfnt_version, len(tables)) as writer:
+        for tag in sorted(tables):
+            writer.write_table(tag, tables[tag])
+
+
+def dump_sfnt(tables: Mapping[str, bytes | bytearray | memoryview], sfnt_version: str) -> bytes:
+    target = BytesIO()
+    write_sfnt(target, tables, sfnt_version)
+    return target.getvalue()
@@ -0,0 +1,307 @@
+from collections.abc import Callable
+
+import pytest
+
+from sfnttools.utils.checksum import calculate_checksum, calculate_checksum_adjustment
+from sfnttools.utils.stream import Stream
+
+_GLYPHS = [
+    # .notdef
+    (2, (50, 0, 450, 700), [[(50, 0, True), (50, 700, True), (450, 700, True), (450, 0, True)], [(100, 50, True), (400, 50, True), (400, 650, True), (100, 650, True)]], b''),
+    # space
+    (0, None, None, None),
+    # A
+    (1, (0, 0, 1000, 700), [[(0, 0, True), (500, 700, True), (1000, 0, True)]], b'\xb0\x01'),
+    # B
+    (1, (-300, -4500, 1600, 5000), [[(-300, 0, True), (1600, 5000, False), (1600, -4500, True), (0, 1, False), (10, 4, True)]], b''),
+    # Aacute
+    (-1, (0, 0, 1300, 900), [(0x0002 | 0x0020, 2, 0, 0, b''), (0x0002 | 0x0008 | 0x0001, 3, 300, 200, b'\x20\x00')], None),
+]
+
+_CMAP = {0x20: 1, 0x41: 2, 0x42: 3, 0xC1: 4, 0x1F600: 2}
+
+_NAMES = {
+    1: 'Test Sans',
+    2: 'Regular',
+    4: 'Test Sans Regular',
+    6: 'TestSans-Regular',
+}
+
+_ADVANCE_WIDTHS = [500, 250, 1000, 1900, 1300]
+_NUM_H_METRICS = 3
+
+
+def _build_glyf_loca() -> tuple[bytes, bytes]:
+    glyf = Stream()
+    offsets = []
+    for n_contours, bbox, outline, instructions in _GLYPHS:
+        offsets.append(glyf.tell())
+        if n_contours == 0:
+            continue
+        glyf.write_int16(n_contours)
+        for value in bbox:
+            glyf.write_int16(value)
+        if n_contours > 0:
+            end_point = -1
+            for contour in outline:
+                end_point += len(contour)
+                glyf.write_uint16(end_point)
+            glyf.write_uint16(len(instructions))
+            glyf.write(instructions)
+            points = [point for contour in outline for point in contour]
+            for _, _, on_curve in points:
+                glyf.write_uint8(0x01 if on_curve else 0x00)
+            last_x = 0
+            for x, _, _ in points:
+                glyf.write_int16(x - last_x)
+                last_x = x
+            last_y = 0
+            for _, y, _ in points:
+                glyf.write_int16(y - last_y)
+                last_y = y
+        else:
+            for flags, glyph_index, arg1, arg2, transform in outline:
+                glyf.write_uint16(flags)
+                glyf.write_uint16(glyph_index)
+                if flags & 0x0001:
+                    glyf.write_int16(arg1)
+                    glyf.write_int16(arg2)
+                else:
+                    glyf.write_int8(arg1)
+                    glyf.write_int8(arg2)
+                glyf.write(transform)
+        glyf.align_to_4_byte_with_nulls()
+    offsets.append(glyf.tell())
+
+    loca = Stream()
+    for offset in offsets:
+        loca.write_offset16(offset // 2)
+    return glyf.get_value(), loca.get_value()
+
+
+def _build_cmap() -> bytes:
+    bmp_mapping = sorted((code_point, glyph_index) for code_point, glyph_index in _CMAP.items() if code_point <= 0xFFFF)
+    segments = [(code_point, code_point, glyph_index - code_point) for code_point, glyph_index in bmp_mapping]
+    segments.append((0xFFFF, 0xFFFF, 1))
+    seg_count = len(segments)
+    entry_selector = seg_count.bit_length() - 1
+    search_range = (1 << entry_selector) * 2
+
+    format_4 = Stream()
+    format_4.write_uint16(4)
+    format_4.write_uint16(16 + seg_count * 8)
+    format_4.write_uint16(0)
+    format_4.write_uint16(seg_count * 2)
+    format_4.write_uint16(search_range)
+    format_4.write_uint16(entry_selector)
+    format_4.write_uint16(seg_count * 2 - search_range)
+    format_4.write_uint16_array([end_code for _, end_code, _ in segments])
+    format_4.write_uint16(0)
+    format_4.write_uint16_array([start_code for start_code, _, _ in segments])
+    format_4.write_int16_array([id_delta if id_delta < 0x8000 else id_delta - 0x10000 for _, _, id_delta in segments])
+    format_4.write_uint16_array([0] * seg_count)
+
+    groups = sorted((code_point, code_point, glyph_index) for code_point, glyph_index in _CMAP.items())
+    format_12 = Stream()
+    format_12.write_uint16(12)
+    format_12.write_uint16(0)
+    format_12.write_uint32(16 + len(groups) * 12)
+    format_12.write_uint32(0)
+    format_12.write_uint32(len(groups))
+    for group in groups:
+        format_12.write_uint32_array(group)
+
+    cmap = Stream()
+    cmap.write_uint16(0)
+    cmap.write_uint16(2)
+    cmap.write_uint16(3)
+    cmap.write_uint16(1)
+    cmap.write_offset32(4 + 8 * 2)
+    cmap.write_uint16(3)
+    cmap.write_uint16(10)
+    cmap.write_offset32(4 + 8 * 2 + len(format_4.get_value()))
+    cmap.write(format_4.get_value())
+    cmap.write(format_12.get_value())
+    return cmap.get_value()
+
+
+def _build_name() -> bytes:
+    strings = Stream()
+    records = Stream()
+    for name_id, value in _NAMES.items():
+        data = value.encode('utf-16-be')
+        records.write_uint16(3)
+        records.write_uint16(1)
+        records.write_uint16(0x0409)
+        records.write_uint16(name_id)
+        records.write_uint16(len(data))
+        records.write_offset16(strings.tell())
+        strings.write(data)
+
+    name = Stream()
+    name.write_uint16(0)
+    name.write_uint16(len(_NAMES))
+    name.write_offset16(6 + 12 * len(_NAMES))
+    name.write(records.get_value())
+    name.write(strings.get_value())
+    return name.get_value()
+
+
+def _build_tables() -> dict[str, bytes]:
+    glyf, loca = _build_glyf_loca()
+
+    head = Stream()
+    head.write_uint16(1)
+    head.write_uint16(0)
+    head.write_fixed(1.5)
+    head.write_uint32(0)
+    head.write_uint32(0x5F0F3CF5)
+    head.write_uint16(0x000B)
+    head.write_uint16(1000)
+    head.write_long_datetime(3786912000)
+    head.write_long_datetime(3786912000)
+    head.write_int16(-300)
+    head.write_int16(-4500)
+    head.write_int16(1600)
+    head.write_int16(5000)
+    head.write_uint16(0)
+    head.write_uint16(8)
+    head.write_int16(2)
+    head.write_int16(0)
+    head.write_int16(0)
+
+    hhea = Stream()
+    hhea.write_uint16(1)
+    hhea.write_uint16(0)
+    hhea.write_fword(900)
+    hhea.write_fword(-300)
+    hhea.write_fword(0)
+    hhea.write_ufword(max(_ADVANCE_WIDTHS))
+    hhea.write_fword(-300)
+    hhea.write_fword(0)
+    hhea.write_fword(1600)
+    hhea.write_int16(1)
+    hhea.write_int16(0)
+    hhea.write_int16(0)
+    hhea.write_nulls(8)
+    hhea.write_int16(0)
+    hhea.write_uint16(_NUM_H_METRICS)
+
+    maxp = Stream()
+    maxp.write_version_16dot16((1, 0))
+    maxp.write_uint16(len(_GLYPHS))
+    maxp.write_uint16(8)
+    maxp.write_uint16(2)
+    maxp.write_uint16(8)
+    maxp.write_uint16(2)
+    maxp.write_uint16(2)
+    maxp.write_nulls(10)
+    maxp.write_uint16(2)
+    maxp.write_uint16(2)
+    maxp.write_uint16(1)
+
+    hmtx = Stream()
+    for glyph_index, (_, bbox, _, _) in enumerate(_GLYPHS):
+        lsb = 0 if bbox is None else bbox[0]
+        if glyph_index < _NUM_H_METRICS:
+            hmtx.write_ufword(_ADVANCE_WIDTHS[glyph_index])
+        hmtx.write_fword(lsb)
+
+    os2 = Stream()
+    os2.write_uint16(4)
+    os2.write_int16(800)
+    os2.write_uint16(400)
+    os2.write_uint16(5)
+    os2.write_uint16(0)
+    os2.write_nulls(20)
+    os2.write_int16(0)
+    os2.write_nulls(10)
+    os2.write_uint32(0x00000003)
+    os2.write_uint32(0x02000000)
+    os2.write_uint32(0)
+    os2.write_uint32(0)
+    os2.write_tag('TEST')
+    os2.write_uint16(0x0040)
+    os2.write_uint16(0x20)
+    os2.write_uint16(0xFFFF)
+    os2.write_int16(800)
+    os2.write_int16(-200)
+    os2.write_int16(0)
+    os2.write_uint16(900)
+    os2.write_uint16(300)
+    os2.write_uint32(0x00000001)
+    os2.write_uint32(0)
+    os2.write_int16(500)
+    os2.write_int16(700)
+    os2.write_uint16(0)
+    os2.write_uint16(0x20)
+    os2.write_uint16(2)
+
+    post = Stream()
+    post.write_version_16dot16((3, 0))
+    post.write_fixed(0)
+    post.write_fword(-100)
+    post.write_fword(50)
+    post.write_uint32(0)
+    post.write_nulls(16)
+
+    return {
+        'OS/2': os2.get_value(),
+        'cmap': _build_cmap(),
+        'glyf': glyf,
+        'head': head.get_value(),
+        'hhea': hhea.get_value(),
+        'hmtx': hmtx.get_value(),
+        'loca': loca,
+        'maxp': maxp.get_value(),
+        'name': _build_name(),
+        'post': post.get_value(),
+    }
+
+
+def _build_sfnt(tables: dict[str, bytes], sfnt_version: str = '\x00\x01\x00\x00') -> bytes:
+    tags = sorted(tables)
+    entry_selector = len(tags).bit_length() - 1
+    search_range = (1 << entry_selector) * 16
+
+    stream = Stream()
+    stream.write_tag(sfnt_version)
+    stream.write_uint16(len(tags))
+    stream.write_uint16(search_range)
+    stream.write_uint16(entry_selector)
+    stream.write_uint16(len(tags) * 16 - search_range)
+    offset = 12 + 16 * len(tags)
+    for tag in tags:
+        data = tables[tag]
+        if tag == 'head':
+            data = data[:8] + b'\x00\x00\x00\x00' + data[12:]
+        stream.write_tag(tag)
+        stream.write_uint32(calculate_checksum(data))
+        stream.write_offset32(offset)
+        stream.write_uint32(len(data))
+        offset += (len(data) + 3) // 4 * 4
+    for tag in tags:
+        stream.write(tables[tag])
+        stream.align_to_4_byte_with_nulls()
+
+    data = bytearray(stream.get_value())
+    if 'head' in tables:
+        head_offset = int.from_bytes(data[12 + 16 * tags.index('head') + 8:][:4], 'big')
+        checksum_adjustment = calculate_checksum_adjustment([calculate_checksum(data)])
+        data[head_offset + 8:head_offset + 12] = checksum_adjustment.to_bytes(4, 'big')
+    return bytes(data)
+
+
+@pytest.fixture()
+def font_tables() -> dict[str, bytes]:
+    return _build_tables()
+
+
+@pytest.fixture()
+def font_data(font_tables: dict[str, bytes]) -> bytes:
+    return _build_sfnt(font_tables)
+
+
+@pytest.fixture()
+def build_sfnt() -> Callable[..., bytes]:
+    return _build_sfnt
@@ -0,0 +1,31 @@
+import pytest
+
+from sfnttools.tables.avar import AvarTable, map_axis_value, parse_avar_table, dump_avar_table
+
+
+def test_avar():
+    table = AvarTable([
+        [(-1.0, -1.0), (0.0, 0.0), (0.5, 0.25), (1.0, 1.0)],
+        [],
+    ])
+    data = dump_avar_table(table)
+    assert data == bytes.fromhex('0001 0000 0000 0002 0004 c000 c000 0000 0000 2000 1000 4000 4000 0000')
+    assert parse_avar_table(data).segment_maps == table.segment_maps
+
+    assert table.map_coordinates([0.5, 0.5]) == [0.25, 0.5]
+    assert table.map_coordinates([0.75, -0.2]) == [0.625, -0.2]
+    assert table.map_coordinates([-0.5, 0]) == [-0.5, 0]
+    with pytest.raises(ValueError):
+        table.map_coordinates([0.0])
+    with pytest.raises(ValueError):
+        parse_avar_table(b'\x00\x02' + data[2:])
+
+
+def test_map_axis_value():
+    segment_map = [(-1.0, -1.0), (-0.5, -0.75), (0.0, 0.0), (1.0, 1.0)]
+    assert map_axis_value(segment_map, -1.0) == -1.0
+    assert map_axis_value(segment_map, -0.75) == -0.875
+    assert map_axis_value(segment_map, -0.5) == -0.75
+    assert map_axis_value(segment_map, -0.25) == -0.375
+    assert map_axis_value(segment_map, 1.0) == 1.0
+    assert map_axis_value([], 0.3) == 0.3
@@ -0,0 +1,84 @@
+import pytest
+
+from sfnttools.tables.cmap import CmapIndex, parse_cmap_table, build_cmap_table
+from sfnttools.utils.stream import Stream
+
+_MAPPING = {0x20: 1, 0x41: 2, 0x42: 3, 0xC1: 4, 0x1F600: 2}
+
+
+def _build_format_4_with_glyph_ids() -> bytes:
+    # Segment 0x30..0x33 maps through glyphIdArray, segment 0xFFFF is the terminator.
+    stream = Stream()
+    stream.write_uint16(4)
+    stream.write_uint16(16 + 2 * 8 + 4 * 2)
+    stream.write_uint16(0)
+    stream.write_uint16(4)
+    stream.write_uint16(4)
+    stream.write_uint16(1)
+    stream.write_uint16(0)
+    stream.write_uint16_array([0x33, 0xFFFF])
+    stream.write_uint16(0)
+    stream.write_uint16_array([0x30, 0xFFFF])
+    stream.write_int16_array([10, 1])
+    stream.write_uint16_array([4, 0])
+    stream.write_uint16_array([7, 0, 9, 0xFFFF])
+    return stream.get_value()
+
+
+def test_cmap(font_tables: dict[str, bytes]):
+    table = parse_cmap_table(font_tables['cmap'])
+    assert [(record.platform_id, record.encoding_id) for record in table.encoding_records] == [(3, 1), (3, 10)]
+    assert [table.get_subtable_format(record) for record in table.encoding_records] == [4, 12]
+
+    index = table.get_index()
+    assert table.get_index() is index
+    assert index.glyph_mask == 0xFFFFFFFF
+    assert dict(index.iter_mappings()) == _MAPPING
+    assert [code_point for start, end in index.iter_ranges() for code_point in range(start, end + 1)] == sorted(_MAPPING)
+
+    bmp_index = table.get_index(3, 1)
+    assert bmp_index.glyph_mask == 0xFFFF
+    assert dict(bmp_index.iter_mappings()) == {code_point: glyph_index for code_point, glyph_index in _MAPPING.items() if code_point <= 0xFFFF}
+    assert table.get_index(0) is None
+
+    code_points = [0, 0x1F, 0x20, 0x41, 0x43, 0xC1, 0xFFFF, 0x1F600, 0x10FFFF]
+    for code_point in code_points:
+        assert index.lookup(code_point) == _MAPPING.get(code_point, 0)
+    assert index.map_many(code_points) == [_MAPPING.get(code_point, 0) for code_point in code_points]
+    assert bmp_index.map_many(code_points) == [0, 0, 1, 2, 0, 4, 0, 0, 0]
+
+
+def test_format_4_glyph_ids():
+    index = CmapIndex.from_format_4(_build_format_4_with_glyph_ids())
+    assert index.map_many(range(0x2F, 0x35)) == [0, 17, 0, 19, 9, 0]
+    assert dict(index.iter_mappings()) == {0x30: 17, 0x32: 19, 0x33: 9}
+    assert list(index.iter_ranges()) == [(0x30, 0x30), (0x32, 0x33)]
+    with pytest.raises(ValueError):
+        CmapIndex.from_format_12(_build_format_4_with_glyph_ids())
+
+
+def test_errors(font_tables: dict[str, bytes]):
+    with pytest.raises(ValueError):
+        parse_cmap_table(b'\x00\x01\x00\x00')
+    with pytest.raises(EOFError):
+        parse_cmap_table(font_tables['cmap'][:16])
+
+
+def test_build_cmap_table():
+    table = parse_cmap_table(build_cmap_table(_MAPPING))
+    assert [(record.platform_id, record.encoding_id) for record in table.encoding_records] == [(3, 1), (3, 10)]
+    assert dict(table.get_index().iter_mappings()) == _MAPPING
+    assert len(table.get_index(3, 1).starts) == 4
+
+    mapping = {code_point: code_point - 0x3000 for code_point in range(0x4E00, 0x4E40)}
+    mapping.update({0x41: 3, 0x42: 4, 0x44: 5, 0xFFFF: 9, 0x20: 0})
+    table = parse_cmap_table(build_cmap_table(mapping))
+    assert [(record.platform_id, record.encoding_id) for record in table.encoding_records] == [(3, 1)]
+    index = table.get_index()
+    assert dict(index.iter_mappings()) == {code_point: glyph_index for code_point, glyph_index in mapping.items() if code_point != 0xFFFF and glyph_index != 0}
+    assert len(index.starts) == 4
+
+    mapping = {code_point * 2: code_point for code_point in range(1, 9000)}
+    table = parse_cmap_table(build_cmap_table(mapping))
+    assert [(record.platform_id, record.encoding_id) for record in table.encoding_records] == [(3, 10)]
+    assert dict(table.get_index().iter_mappings()) == mapping
@@ -0,0 +1,53 @@
+import pytest
+
+from sfnttools.tables.fvar import VARIATION_AXIS_RECORD_SCHEMA, FvarInstance, FvarTable, normalize_axis_value, parse_fvar_table, dump_fvar_table
+
+
+def _build_table() -> FvarTable:
+    return FvarTable([
+        VARIATION_AXIS_RECORD_SCHEMA.new_record('wght', 100.0, 400.0, 900.0, 0, 256),
+        VARIATION_AXIS_RECORD_SCHEMA.new_record('wdth', 75.0, 100.0, 100.0, 0, 257),
+    ], [
+        FvarInstance(258, 0, [700.0, 100.0], 259),
+        FvarInstance(2, 0, [400.0, 87.5]),
+    ])
+
+
+def test_fvar():
+    table = _build_table()
+    data = dump_fvar_table(table)
+    assert len(data) == 16 + 20 * 2 + 14 * 2
+
+    parsed = parse_fvar_table(data)
+    assert parsed.axes == table.axes
+    assert parsed.axis_tags == ['wght', 'wdth']
+    assert parsed.instances == [
+        FvarInstance(258, 0, [700.0, 100.0], 259),
+        FvarInstance(2, 0, [400.0, 87.5], 0xFFFF),
+    ]
+
+    table.instances[0].post_script_name_id = None
+    data = dump_fvar_table(table)
+    assert len(data) == 16 + 20 * 2 + 12 * 2
+    assert parse_fvar_table(data).instances == table.instances
+
+    with pytest.raises(ValueError):
+        parse_fvar_table(b'\x00\x02' + data[2:])
+    table.instances[0].coordinates.append(1.0)
+    with pytest.raises(ValueError):
+        dump_fvar_table(table)
+
+
+def test_normalize():
+    assert normalize_axis_value(400, 100, 400, 900) == 0
+    assert normalize_axis_value(100, 100, 400, 900) == -1
+    assert normalize_axis_value(250, 100, 400, 900) == -0.5
+    assert normalize_axis_value(650, 100, 400, 900) == 0.5
+    assert normalize_axis_value(1000, 100, 400, 900) == 1
+    assert normalize_axis_value(0, 100, 400, 900) == -1
+
+    table = _build_table()
+    assert table.normalize_location({}) == [0, 0]
+    assert table.normalize_location({'wght': 900, 'wdth': 87.5}) == [1, -0.5]
+    with pytest.raises(ValueError):
+        table.normalize_location({'slnt': 0})
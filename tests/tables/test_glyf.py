@@ -0,0 +1,74 @@
+from array import array
+
+import pytest
+
+from sfnttools.font import SfntFont
+from sfnttools.tables.glyf import SimpleGlyph, CompositeGlyph, encode_simple_glyph_data, decode_simple_glyph_data, parse_glyph, parse_glyf_table, dump_glyf_table
+
+
+def test_encode_simple_glyph_data():
+    x_coordinates = [0, 0, 0, 10, 300, 300, -1000] + [5] * 300
+    y_coordinates = [0, 0, 0, -10, 300, 300, 1000] + [5] * 300
+    on_curves = bytes([1] * len(x_coordinates))
+    data = encode_simple_glyph_data([len(x_coordinates) - 1], b'\x01', on_curves, x_coordinates, y_coordinates)
+    assert data[:9].hex(' ') == '01 32 00 01 01 39 02 17 01'
+    assert data[9:16].hex(' ') == '31 09 01 39 ff 39 2a'
+    assert decode_simple_glyph_data(data, 1)[3].tolist() == x_coordinates
+    assert decode_simple_glyph_data(data, 1)[4].tolist() == y_coordinates
+
+
+def test_glyf(font_tables: dict[str, bytes]):
+    table = parse_glyf_table(font_tables['glyf'], font_tables['loca'], 0, 5)
+    assert len(table) == 5
+
+    notdef = table.get_glyph(0)
+    assert isinstance(notdef, SimpleGlyph)
+    assert notdef.number_of_contours == 2
+    assert notdef.end_points.tolist() == [3, 7]
+    assert notdef.x_coordinates.typecode == 'h'
+    assert notdef.x_coordinates.tolist() == [50, 50, 450, 450, 100, 400, 400, 100]
+    assert notdef.on_curves == bytearray([1] * 8)
+    assert table.get_glyph(1) is None
+    assert table.get_glyph(2).instructions == b'\xb0\x01'
+    assert table.get_glyph(3).on_curves == bytearray([1, 0, 1, 0, 1])
+
+    composite = table.get_glyph(4)
+    assert isinstance(composite, CompositeGlyph)
+    assert composite.component_glyph_indices == [2, 3]
+    assert (composite.x_min, composite.y_min, composite.x_max, composite.y_max) == (0, 0, 1300, 900)
+
+    assert dump_glyf_table(table, 0) == (font_tables['glyf'], font_tables['loca'])
+
+
+def test_set_glyph(font_tables: dict[str, bytes]):
+    table = parse_glyf_table(font_tables['glyf'], font_tables['loca'], 0, 5)
+    glyph = table.get_glyph(3)
+    glyph.x_coordinates[0] = -400
+    glyph.recalculate_bounds()
+    assert glyph.x_min == -400
+    table.set_glyph(3, glyph)
+    table.set_glyph(0, None)
+    with pytest.raises(IndexError):
+        table.set_glyph(5, None)
+
+    glyf, loca = dump_glyf_table(table, 1)
+    assert len(glyf) < len(font_tables['glyf'])
+    parsed_table = parse_glyf_table(glyf, loca, 1, 5)
+    assert parsed_table.get_glyph(0) is None
+    assert parsed_table.get_glyph(3).x_coordinates == array('h', [-400, 1600, 1600, 0, 10])
+    assert parsed_table.get_glyph(3).y_coordinates.tolist() == [0, 5000, -4500, 1, 4]
+    assert parsed_table.get_glyph(4).dump() == table.get_glyph(4).dump()
+    assert parse_glyph(table.get_glyph(2).dump()).instructions == b'\xb0\x01'
+
+
+def test_font_glyf(font_data: bytes):
+    font = SfntFont.parse(font_data)
+    assert font.glyf is font.glyf
+    assert font.glyf.get_glyph(4).component_glyph_indices == [2, 3]
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        parse_glyph(b'\xff\xfe' + bytes(8))
+    with pytest.raises(EOFError):
+        parse_glyph(b'\xff\xff' + bytes(8) + b'\x00\x20\x00\x01')
@@ -0,0 +1,123 @@
+from array import array
+
+import pytest
+
+from sfnttools.tables.gvar import (
+    GvarTable,
+    TupleVariation,
+    calculate_tuple_scalar,
+    decode_glyph_variation_data,
+    dump_gvar_table,
+    encode_glyph_variation_data,
+    encode_packed_deltas,
+    encode_packed_point_numbers,
+    parse_gvar_table,
+    read_packed_deltas,
+    read_packed_point_numbers,
+)
+from sfnttools.utils.stream import BufferStream
+
+
+def test_packed_point_numbers():
+    assert encode_packed_point_numbers(None) == b'\x00'
+    assert read_packed_point_numbers(BufferStream(b'\x00')) is None
+
+    data = encode_packed_point_numbers([1, 3, 600, 601])
+    assert data == bytes.fromhex('04 01 01 02 80 0255 00 01')
+    assert read_packed_point_numbers(BufferStream(data)).tolist() == [1, 3, 600, 601]
+
+    point_numbers = list(range(0, 400, 2))
+    data = encode_packed_point_numbers(point_numbers)
+    assert data[:2] == bytes.fromhex('80 c8')
+    assert read_packed_point_numbers(BufferStream(data)).tolist() == point_numbers
+
+    with pytest.raises(ValueError):
+        read_packed_point_numbers(BufferStream(bytes.fromhex('01 01 01 02')))
+
+
+def test_packed_deltas():
+    deltas = [0, 0, 0, 1, -128, 127, 128, -32768, 40000, 0]
+    data = encode_packed_deltas(deltas)
+    assert data == bytes.fromhex('82 02 01 80 7f 41 0080 8000 c0 00009c40 80')
+    values = read_packed_deltas(BufferStream(data), len(deltas))
+    assert values.typecode in ('i', 'l')
+    assert values.tolist() == deltas
+
+    deltas = list(range(100))
+    assert read_packed_deltas(BufferStream(encode_packed_deltas(deltas)), 100).tolist() == deltas
+
+    with pytest.raises(ValueError):
+        read_packed_deltas(BufferStream(bytes.fromhex('81')), 1)
+
+
+def test_tuple_scalar():
+    assert calculate_tuple_scalar([0.0], [1.0]) == 0
+    assert calculate_tuple_scalar([0.5], [1.0]) == 0.5
+    assert calculate_tuple_scalar([1.0], [1.0]) == 1
+    assert calculate_tuple_scalar([-0.5], [1.0]) == 0
+    assert calculate_tuple_scalar([-0.5], [-1.0]) == 0.5
+    assert calculate_tuple_scalar([0.5, 0.5], [1.0, 0.0]) == 0.5
+    assert calculate_tuple_scalar([0.5, 0.5], [1.0, 1.0]) == 0.25
+
+    assert calculate_tuple_scalar([0.25], [0.5], [0.0], [1.0]) == 0.5
+    assert calculate_tuple_scalar([0.75], [0.5], [0.0], [1.0]) == 0.5
+    assert calculate_tuple_scalar([1.0], [0.5], [0.25], [0.75]) == 0
+    assert calculate_tuple_scalar([0.75], [0.5], [-0.5], [1.0]) == 1
+
+
+def test_glyph_variation_data():
+    shared_tuples = [(1.0, 0.0)]
+    variations = [
+        TupleVariation((1.0, 0.0), array('i', [10, 0, -10]), array('i', [0, 5, 0])),
+        TupleVariation((0.0, -1.0), array('i', [300, -2]), array('i', [1, 0]), point_numbers=array('H', [0, 2])),
+        TupleVariation((0.5, 0.0), array('i', [1, 2, 3]), array('i', [4, 5, 6]), start=(0.0, 0.0), end=(1.0, 0.0)),
+    ]
+    data = encode_glyph_variation_data(variations, shared_tuples)
+    assert len(data) % 2 == 0
+    assert decode_glyph_variation_data(data, 2, shared_tuples, 3) == variations
+    assert decode_glyph_variation_data(data, 2, shared_tuples, 3, [0.5, 0.0]) == [variations[0], variations[2]]
+    assert decode_glyph_variation_data(data, 2, shared_tuples, 3, [0.0, 0.0]) == []
+    assert decode_glyph_variation_data(b'', 2, shared_tuples, 3) == []
+    assert encode_glyph_variation_data([]) == b''
+
+    with pytest.raises(ValueError):
+        decode_glyph_variation_data(data, 2, [], 3)
+
+
+def test_shared_point_numbers():
+    data = bytes.fromhex('8002 0010 0004 8000 4000 0004 8000 c000') + bytes.fromhex('02 01 00 01') + bytes.fromhex('01 01 00 81') + bytes.fromhex('01 05 00 81')
+    variations = decode_glyph_variation_data(data, 1, [], 4)
+    assert variations == [
+        TupleVariation((1.0,), array('i', [1, 0]), array('i', [0, 0]), point_numbers=array('H', [0, 1])),
+        TupleVariation((-1.0,), array('i', [5, 0]), array('i', [0, 0]), point_numbers=array('H', [0, 1])),
+    ]
+
+
+def test_gvar():
+    shared_tuples = [(1.0,), (-1.0,)]
+    glyph_datas = [
+        b'',
+        encode_glyph_variation_data([TupleVariation((1.0,), array('i', [1, 2, 3, 4]), array('i', [5, 6, 7, 8]))], shared_tuples),
+        b'',
+        encode_glyph_variation_data([TupleVariation((0.5,), array('i', [-1000]), array('i', [0]), point_numbers=array('H', [1]))], shared_tuples),
+    ]
+    offsets = array('I', [0])
+    for glyph_data in glyph_datas:
+        offsets.append(offsets[-1] + len(glyph_data))
+    table = GvarTable(1, shared_tuples, b''.join(glyph_datas), offsets)
+    data = dump_gvar_table(table)
+
+    parsed = parse_gvar_table(data)
+    assert len(parsed) == 4
+    assert parsed.axis_count == 1
+    assert parsed.shared_tuples == shared_tuples
+    assert parsed.offsets == offsets
+    assert parsed.get_tuple_variations(0, 4) == []
+    assert parsed.get_tuple_variations(1, 4)[0].x_deltas.tolist() == [1, 2, 3, 4]
+    assert parsed.get_tuple_variations(3, 5)[0].point_numbers.tolist() == [1]
+    assert parsed.get_tuple_variations(3, 5, [-0.5]) == []
+    assert dump_gvar_table(parsed) == data
+
+    long_table = GvarTable(1, shared_tuples, bytes(0x20000), array('I', [0, 0x20000]))
+    long_data = dump_gvar_table(long_table)
+    assert parse_gvar_table(long_data).offsets.tolist() == [0, 0x20000]
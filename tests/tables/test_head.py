@@ -0,0 +1,41 @@
+import pytest
+
+from sfnttools.tables.head import parse_head_table, dump_head_table
+from sfnttools.tables.hhea import parse_hhea_table, dump_hhea_table
+from sfnttools.tables.maxp import MAXP_VERSION_0_5, parse_maxp_table, dump_maxp_table
+
+
+def test_head(font_tables: dict[str, bytes]):
+    table = parse_head_table(font_tables['head'])
+    assert table.font_revision == 1.5
+    assert table.units_per_em == 1000
+    assert (table.x_min, table.y_min, table.x_max, table.y_max) == (-300, -4500, 1600, 5000)
+    assert table.index_to_loc_format == 0
+    assert dump_head_table(table) == font_tables['head']
+    with pytest.raises(ValueError):
+        parse_head_table(font_tables['head'][:12] + b'\x00\x00\x00\x00' + font_tables['head'][16:])
+    with pytest.raises(EOFError):
+        parse_head_table(font_tables['head'][:50])
+
+
+def test_hhea(font_tables: dict[str, bytes]):
+    table = parse_hhea_table(font_tables['hhea'])
+    assert table.ascender == 900
+    assert table.descender == -300
+    assert table.number_of_h_metrics == 3
+    assert dump_hhea_table(table) == font_tables['hhea']
+
+
+def test_maxp(font_tables: dict[str, bytes]):
+    table = parse_maxp_table(font_tables['maxp'])
+    assert table.num_glyphs == 5
+    assert table.max_component_depth == 1
+    assert dump_maxp_table(table) == font_tables['maxp']
+
+    data = b'\x00\x00\x50\x00\x01\x00'
+    table = parse_maxp_table(data)
+    assert table.version == MAXP_VERSION_0_5
+    assert table.num_glyphs == 256
+    assert dump_maxp_table(table) == data
+    with pytest.raises(ValueError):
+        parse_maxp_table(b'\x00\x02\x00\x00\x00\x01')
@@ -0,0 +1,27 @@
+from array import array
+
+import pytest
+
+from sfnttools.tables.hmtx import HmtxTable, parse_hmtx_table, dump_hmtx_table
+
+
+def test_hmtx(font_tables: dict[str, bytes]):
+    table = parse_hmtx_table(font_tables['hmtx'], 5, 3)
+    assert len(table) == 5
+    assert table.advance_widths.tolist() == [500, 250, 1000, 1000, 1000]
+    assert table.lsbs.tolist() == [50, 0, 0, -300, 0]
+    assert table.num_h_metrics == 3
+    assert dump_hmtx_table(table) == font_tables['hmtx']
+
+    with pytest.raises(ValueError):
+        parse_hmtx_table(font_tables['hmtx'], 5, 0)
+    with pytest.raises(EOFError):
+        parse_hmtx_table(font_tables['hmtx'][:10], 5, 3)
+
+
+def test_num_h_metrics():
+    table = HmtxTable(array('H', [500, 600, 600, 600]), array('h', [1, 2, 3, 4]))
+    assert table.num_h_metrics == 2
+    assert dump_hmtx_table(table) == bytes.fromhex('01f4 0001 0258 0002 0003 0004')
+    assert HmtxTable(array('H', [500]), array('h', [0])).num_h_metrics == 1
+    assert HmtxTable().num_h_metrics == 0
@@ -0,0 +1,28 @@
+from sfnttools.tables.name import NAME_ID_FAMILY, NAME_ID_FULL_NAME, NameRecord, NameTable, parse_name_table, dump_name_table
+
+
+def test_name(font_tables: dict[str, bytes]):
+    table = parse_name_table(font_tables['name'])
+    assert table.format == 0
+    assert len(table.records) == 4
+    assert table.get_name(NAME_ID_FAMILY) == 'Test Sans'
+    assert table.get_name(NAME_ID_FULL_NAME) == 'Test Sans Regular'
+    assert table.get_name(NAME_ID_FULL_NAME, platform_id=1) == 'Test Sans Regular'
+    assert table.get_name(100) is None
+    assert dump_name_table(table) == font_tables['name']
+
+
+def test_name_format_1():
+    table = NameTable([
+        NameRecord(1, 0, 0, 1, 'Caf\xe9'.encode('mac-roman')),
+        NameRecord(3, 1, 0x0409, 2, 'Test'.encode('utf-16-be')),
+        NameRecord(3, 1, 0x8000, 1, 'Test'.encode('utf-16-be')),
+    ], [b'\x00e\x00n'])
+    data = dump_name_table(table)
+    assert data.count('Test'.encode('utf-16-be')) == 1
+    parsed_table = parse_name_table(data)
+    assert parsed_table.format == 1
+    assert parsed_table.records == table.records
+    assert parsed_table.lang_tags == [b'\x00e\x00n']
+    assert parsed_table.records[0].value == 'Caf\xe9'
+    assert parsed_table.get_name(1, platform_id=3, language_id=None) == 'Test'
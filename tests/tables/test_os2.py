@@ -0,0 +1,25 @@
+import pytest
+
+from sfnttools.tables.os2 import parse_os2_table, dump_os2_table, get_unicode_ranges
+
+
+def test_os2(font_tables: dict[str, bytes]):
+    table = parse_os2_table(font_tables['OS/2'])
+    assert table.version == 4
+    assert table.us_weight_class == 400
+    assert table.us_width_class == 5
+    assert table.ach_vend_id == 'TEST'
+    assert table.us_max_context == 2
+    assert table.us_lower_optical_point_size == 0
+    assert get_unicode_ranges(table) == {0, 1, 57}
+    assert dump_os2_table(table) == font_tables['OS/2']
+
+
+def test_os2_version_0(font_tables: dict[str, bytes]):
+    data = b'\x00\x00' + font_tables['OS/2'][2:78]
+    table = parse_os2_table(data)
+    assert table.us_weight_class == 400
+    assert table.ul_code_page_range_1 == 0
+    assert dump_os2_table(table) == data
+    with pytest.raises(EOFError):
+        parse_os2_table(data[:70])
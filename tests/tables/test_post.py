@@ -0,0 +1,22 @@
+from sfnttools.tables.post import POST_VERSION_2_0, POST_VERSION_3_0, POST_HEADER_SCHEMA, PostTable, parse_post_table, dump_post_table
+
+
+def test_post(font_tables: dict[str, bytes]):
+    table = parse_post_table(font_tables['post'])
+    assert table.header.version == POST_VERSION_3_0
+    assert table.header.underline_position == -100
+    assert table.glyph_name_indices is None
+    assert dump_post_table(table) == font_tables['post']
+
+
+def test_post_version_2():
+    header = POST_HEADER_SCHEMA.new_record(POST_VERSION_2_0, -12.5, -100, 50, 0, 0, 0, 0, 0)
+    table = PostTable(header, [0, 258, 36, 259], [b'foo', b'bar'])
+    data = dump_post_table(table)
+    parsed_table = parse_post_table(data)
+    assert parsed_table.header == header
+    assert parsed_table.glyph_name_indices == [0, 258, 36, 259]
+    assert parsed_table.names == [b'foo', b'bar']
+    assert parsed_table.get_glyph_name(1) == b'foo'
+    assert parsed_table.get_glyph_name(2) is None
+    assert dump_post_table(parsed_table) == data
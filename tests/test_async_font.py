@@ -0,0 +1,66 @@
+import asyncio
+from io import BytesIO
+
+import pytest
+
+from sfnttools.async_font import AsyncSfntFont
+from sfnttools.tables.name import NAME_ID_FAMILY
+from sfnttools.utils.async_stream import AsyncStream
+
+
+class RecordingBytesIO(BytesIO):
+    ranges: list[tuple[int, int]]
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.ranges = []
+
+    def read(self, size: int = -1) -> bytes:
+        offset = self.tell()
+        values = super().read(size)
+        self.ranges.append((offset, len(values)))
+        return values
+
+
+def test_font(font_tables: dict[str, bytes], font_data: bytes):
+    async def load(source: RecordingBytesIO):
+        font = await AsyncSfntFont.open(AsyncStream(source))
+        assert font.sfnt_version == '\x00\x01\x00\x00'
+        assert font.tags == sorted(font_tables)
+        assert 'glyf' in font
+        source.ranges.clear()
+
+        assert await font.get_table_data('maxp') == font_tables['maxp']
+        table_record = font.table_records['maxp']
+        assert source.ranges == [(table_record.offset, table_record.length)]
+        assert await font.get_table_data('maxp') == font_tables['maxp']
+        assert len(source.ranges) == 1
+
+        assert (await font.get_table('name')).get_name(NAME_ID_FAMILY) == 'Test Sans'
+        assert (await font.get_table('maxp')).num_glyphs == 5
+        with pytest.raises(ValueError):
+            await font.get_table('glyf')
+
+    asyncio.run(load(RecordingBytesIO(font_data)))
+
+
+def test_font_stream_reader(font_tables: dict[str, bytes], font_data: bytes):
+    async def load() -> dict[str, bytes]:
+        reader = asyncio.StreamReader()
+        reader.feed_data(font_data)
+        reader.feed_eof()
+        font = await AsyncSfntFont.open(AsyncStream(reader))
+        return await font.get_table_datas(['name', 'OS/2', 'cmap'])
+
+    table_datas = asyncio.run(load())
+    assert list(table_datas) == ['name', 'OS/2', 'cmap']
+    for tag, data in table_datas.items():
+        assert data == font_tables[tag]
+
+
+def test_unknown_version():
+    async def load():
+        await AsyncSfntFont.open(AsyncStream(BytesIO(b'ABCD' + bytes(8))))
+
+    with pytest.raises(ValueError):
+        asyncio.run(load())
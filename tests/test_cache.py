@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from sfnttools.cache import SubsetCache, calculate_font_hash, make_subset_key, normalize_code_points
+from sfnttools.font import SfntFont
+from sfnttools.subset import subset_font
+from sfnttools.woff.decoder import decode_woff
+from sfnttools.woff2.decoder import decode_woff2
+
+
+def test_subset_key():
+    assert normalize_code_points([0x43, 0x41, 0x42, 0x20, 0x41]) == [(0x20, 0x20), (0x41, 0x43)]
+    key = make_subset_key('0' * 64, [0x41, 0x42, 0x43], 'woff2')
+    assert key == make_subset_key('0' * 64, [0x43, 0x42, 0x41, 0x41], 'woff2')
+    assert key != make_subset_key('0' * 64, [0x41, 0x42, 0x43], 'woff')
+    assert key != make_subset_key('0' * 64, [0x41, 0x42], 'woff2', [3])
+    assert key != make_subset_key('1' * 64, [0x41, 0x42, 0x43], 'woff2')
+
+
+def test_font_hash(font_data: bytes, font_tables: dict[str, bytes], build_sfnt):
+    font_hash = calculate_font_hash(SfntFont.parse(font_data))
+    assert font_hash == calculate_font_hash(SfntFont.parse(font_data + b'\x00' * 4))
+    font_tables['name'] += b'\x00\x00'
+    assert font_hash != calculate_font_hash(SfntFont.parse(build_sfnt(font_tables)))
+
+
+def test_lru():
+    cache = SubsetCache(max_size=10)
+    cache.put('a', b'1234')
+    cache.put('b', b'1234')
+    assert cache.get('a') == b'1234'
+    cache.put('c', b'1234')
+    assert 'b' not in cache
+    assert list(cache._entries) == ['a', 'c']
+    assert cache.size == 8
+    cache.put('d', b'12345678901')
+    assert 'd' not in cache
+    cache.put('a', b'12')
+    assert cache.size == 6
+    assert cache.get('b') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_get_subset(font_data: bytes, tmp_path):
+    font = SfntFont.parse(font_data)
+    cache = SubsetCache(cache_dir=tmp_path)
+    expected = subset_font(font, [0x41, 0xC1])
+    assert cache.get_subset(font, [0xC1, 0x41], 'ttf') == expected
+    assert cache.get_subset(font, [0x41, 0xC1], 'ttf') is cache.get_subset(font, [0x41, 0xC1], 'ttf')
+    assert decode_woff(cache.get_subset(font, [0x41, 0xC1], 'woff')) == expected
+    woff2_data = cache.get_subset(font, [0x41, 0xC1])
+    assert SfntFont.parse(decode_woff2(woff2_data)).maxp.num_glyphs == 4
+    assert (cache.hits, cache.misses) == (2, 3)
+    assert len(list(tmp_path.rglob('*'))) == 6
+
+    disk_cache = SubsetCache(cache_dir=tmp_path)
+    assert disk_cache.get_subset(font, [0x41, 0xC1]) == woff2_data
+    assert (disk_cache.hits, disk_cache.misses) == (1, 0)
+    assert len(disk_cache) == 1
+
+    with pytest.raises(ValueError):
+        cache.get_subset(font, [0x41], 'otf')
+
+
+def test_put_failure(tmp_path, monkeypatch: pytest.MonkeyPatch):
+    cache = SubsetCache(cache_dir=tmp_path)
+
+    def replace(src, dst):
+        raise OSError(28, 'No space left on device')
+
+    monkeypatch.setattr(os, 'replace', replace)
+    with pytest.raises(OSError):
+        cache.put('ab' * 32, b'data')
+    assert list(tmp_path.joinpath('ab').iterdir()) == []
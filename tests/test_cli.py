@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+
+from sfnttools.cli import detect_font_format, find_font_files, validate_font_data, dump_font_data, run_jobs, main
+from sfnttools.font import SfntFont
+from sfnttools.woff.decoder import decode_woff
+from sfnttools.woff2.decoder import decode_woff2
+
+
+def _write_corpus(tmp_path: Path, font_data: bytes) -> Path:
+    input_dir = tmp_path.joinpath('input')
+    input_dir.joinpath('sub').mkdir(parents=True)
+    input_dir.joinpath('a.ttf').write_bytes(font_data)
+    input_dir.joinpath('sub', 'b.ttf').write_bytes(font_data)
+    input_dir.joinpath('readme.txt').write_text('not a font')
+    return input_dir
+
+
+def test_find_font_files(tmp_path: Path, font_data: bytes):
+    input_dir = _write_corpus(tmp_path, font_data)
+    assert find_font_files([input_dir]) == [
+        (input_dir.joinpath('a.ttf'), Path('a.ttf')),
+        (input_dir.joinpath('sub', 'b.ttf'), Path('sub', 'b.ttf')),
+    ]
+    assert find_font_files([input_dir.joinpath('sub', 'b.ttf')]) == [(input_dir.joinpath('sub', 'b.ttf'), Path('b.ttf'))]
+
+
+def test_validate(font_data: bytes):
+    assert detect_font_format(font_data) == 'sfnt'
+    assert validate_font_data(font_data) == []
+
+    data = bytearray(font_data)
+    table_record = dump_font_data(font_data)['tables'][-1]
+    data[table_record['offset']] ^= 0xFF
+    problems = validate_font_data(data)
+    assert len(problems) == 2
+    assert problems[0].startswith(f'{table_record["tag"]!r} checksum mismatch')
+    assert problems[1].startswith('checkSumAdjustment mismatch')
+
+
+@pytest.mark.parametrize('jobs', ['1', '2'])
+def test_convert(tmp_path: Path, font_data: bytes, font_tables: dict[str, bytes], jobs: str, capsys: pytest.CaptureFixture[str]):
+    input_dir = _write_corpus(tmp_path, font_data)
+    assert main(['-j', jobs, 'convert', '-f', 'woff2', '-o', str(tmp_path.joinpath('woff2')), str(input_dir)]) == 0
+    assert main(['-j', jobs, 'convert', '-f', 'woff', '-o', str(tmp_path.joinpath('woff')), str(tmp_path.joinpath('woff2'))]) == 0
+    for name in ['a', 'sub/b']:
+        woff2_data = tmp_path.joinpath('woff2', f'{name}.woff2').read_bytes()
+        woff_data = tmp_path.joinpath('woff', f'{name}.woff').read_bytes()
+        assert detect_font_format(woff2_data) == 'woff2'
+        assert detect_font_format(woff_data) == 'woff'
+        woff_font = SfntFont.parse(decode_woff(woff_data))
+        woff2_font = SfntFont.parse(decode_woff2(woff2_data))
+        assert woff_font.tags == woff2_font.tags == sorted(font_tables)
+        for tag in woff_font.tags:
+            if tag != 'head':
+                assert woff_font.get_table_data(tag) == woff2_font.get_table_data(tag)
+    assert capsys.readouterr().err.count(' ok ') == 4
+
+    assert main(['-j', jobs, 'validate', str(tmp_path)]) == 0
+
+
+def test_dump(tmp_path: Path, font_data: bytes, font_tables: dict[str, bytes], capsys: pytest.CaptureFixture[str]):
+    input_dir = _write_corpus(tmp_path, font_data)
+    assert main(['-j1', '-q', 'dump', str(input_dir.joinpath('a.ttf'))]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == str(input_dir.joinpath('a.ttf'))
+    assert lines[1] == f"format=sfnt flavor='\\x00\\x01\\x00\\x00' num_tables={len(font_tables)}"
+    assert len(lines) == len(font_tables) + 2
+
+
+def test_run_jobs_failure(tmp_path: Path, font_data: bytes, capsys: pytest.CaptureFixture[str]):
+    small_file_path = tmp_path.joinpath('small.ttf')
+    small_file_path.write_bytes(b'\x00\x01\x00\x00')
+    large_file_path = tmp_path.joinpath('large.ttf')
+    large_file_path.write_bytes(font_data)
+    results = list(run_jobs([(small_file_path, lambda: (True, 'small')), (large_file_path, lambda: (True, 'large'))], 1))
+    assert results == [(large_file_path, True, 'large'), (small_file_path, True, 'small')]
+
+    assert main(['-j1', 'validate', str(tmp_path)]) == 1
+    err = capsys.readouterr().err
+    assert f'FAILED {small_file_path}: offset table is truncated' in err
+    assert f'ok {large_file_path}' in err
@@ -0,0 +1,54 @@
+import pytest
+
+from sfnttools.collection import SfntCollection, dump_collection, write_collection
+from sfnttools.utils.checksum import calculate_checksum
+
+
+def _build_fonts(font_tables: dict[str, bytes]) -> list[tuple[str, dict[str, bytes]]]:
+    bold_tables = dict(font_tables)
+    bold_tables['OS/2'] = font_tables['OS/2'][:4] + (700).to_bytes(2, 'big') + font_tables['OS/2'][6:]
+    bold_tables['head'] = font_tables['head'][:44] + b'\x00\x01' + font_tables['head'][46:]
+    return [('\x00\x01\x00\x00', font_tables), ('\x00\x01\x00\x00', bold_tables)]
+
+
+def test_collection(font_tables: dict[str, bytes]):
+    fonts = _build_fonts(font_tables)
+    data = dump_collection(fonts)
+    assert len(data) < sum(len(table_data) for _, tables in fonts for table_data in tables.values())
+
+    with SfntCollection.parse(data) as collection:
+        assert collection.header.num_fonts == 2
+        assert len(collection) == 2
+        assert len(collection.table_records) == len(font_tables) + 2
+        regular, bold = collection
+        for tag in font_tables:
+            if tag not in ('head', 'OS/2'):
+                assert regular.table_records[tag] is bold.table_records[tag]
+                assert regular.get_table_data(tag) == font_tables[tag]
+        assert regular.os2.us_weight_class == 400
+        assert bold.os2.us_weight_class == 700
+        assert bold.head.mac_style == 1
+
+        for offset, font in zip(collection.table_offsets, collection):
+            header_size = 12 + 16 * len(font.table_records)
+            checksum = calculate_checksum(data[offset:offset + header_size])
+            for table_record in font.table_records.values():
+                checksum += calculate_checksum(data[table_record.offset:table_record.offset + table_record.length])
+            assert checksum & 0xFFFFFFFF == 0xB1B0AFBA
+
+
+def test_collection_shared_head(font_tables: dict[str, bytes], tmp_path):
+    file_path = tmp_path.joinpath('font.ttc')
+    with file_path.open('wb') as file:
+        write_collection(file, [('\x00\x01\x00\x00', font_tables), ('\x00\x01\x00\x00', font_tables)])
+    with SfntCollection.load(file_path) as collection:
+        assert len(collection.table_records) == len(font_tables)
+        assert collection[0].head.checksum_adjustment == 0
+        assert collection[1].maxp.num_glyphs == 5
+
+
+def test_collection_errors(font_data: bytes):
+    with pytest.raises(ValueError):
+        SfntCollection.parse(font_data)
+    with pytest.raises(ValueError):
+        SfntCollection.parse(b'ttcf\x00\x03\x00\x00\x00\x00\x00\x00')
@@ -0,0 +1,47 @@
+import pytest
+
+from sfnttools.font import SfntFont
+from sfnttools.tables.name import NAME_ID_FAMILY
+
+
+def test_font(font_tables: dict[str, bytes], font_data: bytes):
+    font = SfntFont.parse(font_data)
+    assert font.sfnt_version == '\x00\x01\x00\x00'
+    assert font.tags == sorted(font_tables)
+    assert 'glyf' in font
+    assert 'CFF ' not in font
+    for tag, data in font_tables.items():
+        if tag != 'head':
+            assert font.get_table_data(tag) == data
+    assert font.get_table_data('glyf').obj is font_data
+
+    assert font._tables == {}
+    assert font.name.get_name(NAME_ID_FAMILY) == 'Test Sans'
+    assert font.os2.us_weight_class == 400
+    assert list(font._tables) == ['name', 'OS/2']
+    assert font.name is font.name
+    assert font.head.units_per_em == 1000
+    assert font.hhea.number_of_h_metrics == 3
+    assert font.maxp.num_glyphs == 5
+    assert font.post.header.underline_thickness == 50
+    with pytest.raises(ValueError):
+        font.get_table('gasp')
+    with pytest.raises(KeyError):
+        font.get_table_data('gasp')
+
+
+def test_load(font_data: bytes, tmp_path):
+    file_path = tmp_path.joinpath('font.ttf')
+    file_path.write_bytes(font_data)
+    with SfntFont.load(file_path) as font:
+        assert font.maxp.num_glyphs == 5
+
+
+def test_errors(font_data: bytes):
+    with pytest.raises(ValueError):
+        SfntFont.parse(b'abcd' + font_data[4:])
+    with pytest.raises(EOFError):
+        SfntFont.parse(font_data[:20])
+    font = SfntFont.parse(font_data[:200])
+    with pytest.raises(EOFError):
+        font.get_table_data('post')
@@ -0,0 +1,178 @@
+from array import array
+from collections.abc import Callable
+
+import pytest
+
+import sfnttools.instancer
+from sfnttools.font import SfntFont
+from sfnttools.instancer import instantiate_font, interpolate_untouched_deltas, normalize_location
+from sfnttools.tables.avar import AvarTable, dump_avar_table
+from sfnttools.tables.fvar import VARIATION_AXIS_RECORD_SCHEMA, FvarInstance, FvarTable, dump_fvar_table
+from sfnttools.tables.gvar import GvarTable, TupleVariation, dump_gvar_table, encode_glyph_variation_data
+from sfnttools.tables.hmtx import parse_hmtx_table
+
+
+def _build_variable_font(font_tables: dict[str, bytes], build_sfnt: Callable[..., bytes], with_avar: bool = False, glyph_datas: list[bytes] | None = None) -> SfntFont:
+    fvar = FvarTable([
+        VARIATION_AXIS_RECORD_SCHEMA.new_record('wght', 100.0, 400.0, 900.0, 0, 256),
+    ], [
+        FvarInstance(2, 0, [400.0]),
+        FvarInstance(257, 0, [900.0]),
+    ])
+    glyph_datas = glyph_datas or [
+        b'',
+        b'',
+        encode_glyph_variation_data([
+            TupleVariation((1.0,), array('i', [0, 100, 200, 0, 200, 0, 0]), array('i', [0, 50, 0, 0, 0, 0, 0])),
+            TupleVariation((-1.0,), array('i', [0, 100]), array('i', [0, 0]), point_numbers=array('H', [0, 2])),
+        ]),
+        b'',
+        encode_glyph_variation_data([
+            TupleVariation((1.0,), array('i', [100]), array('i', [50]), point_numbers=array('H', [1])),
+        ]),
+    ]
+    offsets = array('I', [0])
+    for glyph_data in glyph_datas:
+        offsets.append(offsets[-1] + len(glyph_data))
+
+    tables = dict(font_tables)
+    tables['fvar'] = dump_fvar_table(fvar)
+    tables['gvar'] = dump_gvar_table(GvarTable(1, [], b''.join(glyph_datas), offsets))
+    if with_avar:
+        tables['avar'] = dump_avar_table(AvarTable([[(-1.0, -1.0), (0.0, 0.0), (0.5, 0.25), (1.0, 1.0)]]))
+    return SfntFont.parse(build_sfnt(tables))
+
+
+def _get_metrics(font: SfntFont) -> tuple[list[int], list[int]]:
+    hmtx = parse_hmtx_table(font.get_table_data('hmtx'), font.maxp.num_glyphs, font.hhea.number_of_h_metrics)
+    return hmtx.advance_widths.tolist(), hmtx.lsbs.tolist()
+
+
+def test_normalize_location(font_tables: dict[str, bytes], build_sfnt: Callable[..., bytes]):
+    font = _build_variable_font(font_tables, build_sfnt, with_avar=True)
+    assert font.fvar.axis_tags == ['wght']
+    assert normalize_location(font.fvar, None, {'wght': 650}) == [0.5]
+    assert normalize_location(font.fvar, font.avar, {'wght': 650}) == [0.25]
+    assert normalize_location(font.fvar, font.avar, {'wght': 1000}) == [1.0]
+    assert normalize_location(font.fvar, None, {'wght': 500}) == [3277 / 16384]
+    with pytest.raises(ValueError):
+        normalize_location(font.fvar, None, {'wdth': 100})
+
+
+def test_interpolate_untouched_deltas():
+    coordinates = array('d', [0, 500, 1000, 250, 750])
+    deltas = interpolate_untouched_deltas(coordinates, [2, 4], [0, 2, 3], [0, 100, 10], 5)
+    assert list(deltas) == [0, 50, 100, 10, 10]
+    deltas = interpolate_untouched_deltas(coordinates, [2, 4], [], [], 5)
+    assert list(deltas) == [0, 0, 0, 0, 0]
+
+
+def test_instantiate_default(font_tables: dict[str, bytes], build_sfnt: Callable[..., bytes]):
+    font_tables = dict(font_tables)
+    font_tables['OS/2'] = font_tables['OS/2'][:4] + (350).to_bytes(2, 'big') + font_tables['OS/2'][6:]
+    font = _build_variable_font(font_tables, build_sfnt)
+    instance = SfntFont.parse(instantiate_font(font, {}))
+    assert instance.tags == ['OS/2', 'cmap', 'glyf', 'head', 'hhea', 'hmtx', 'loca', 'maxp', 'name', 'post']
+    assert instance.os2.us_weight_class == 350
+    assert SfntFont.parse(instantiate_font(font, {'wght': 400})).os2.us_weight_class == 400
+    for glyph_index in range(4):
+        assert instance.glyf.get_glyph_data(glyph_index) == font.glyf.get_glyph_data(glyph_index)
+    composite = instance.glyf.get_glyph(4)
+    assert (composite.x_min, composite.y_min, composite.x_max, composite.y_max) == (0, -2050, 1100, 2700)
+    assert _get_metrics(instance) == _get_metrics(font)
+
+
+def test_instantiate_font(font_tables: dict[str, bytes], build_sfnt: Callable[..., bytes]):
+    font = _build_variable_font(font_tables, build_sfnt)
+    instance = SfntFont.parse(instantiate_font(font, {'wght': 900}))
+    assert instance.os2.us_weight_class == 900
+    assert 'fvar' not in instance
+    assert 'gvar' not in instance
+
+    glyph = instance.glyf.get_glyph(2)
+    assert glyph.x_coordinates.tolist() == [0, 600, 1200]
+    assert glyph.y_coordinates.tolist() == [0, 750, 0]
+    assert (glyph.x_min, glyph.y_min, glyph.x_max, glyph.y_max) == (0, 0, 1200, 750)
+
+    composite = instance.glyf.get_glyph(4)
+    assert composite.component_glyph_indices == [2, 3]
+    assert (composite.x_min, composite.y_min, composite.x_max, composite.y_max) == (0, -2000, 1200, 2750)
+
+    advance_widths, lsbs = _get_metrics(instance)
+    assert advance_widths == [500, 250, 1200, 1000, 1000]
+    assert lsbs == [50, 0, 0, -300, 0]
+    assert instance.hhea.advance_width_max == 1200
+    assert instance.hhea.number_of_h_metrics == 4
+    assert (instance.head.x_min, instance.head.y_min, instance.head.x_max, instance.head.y_max) == (-300, -4500, 1600, 5000)
+
+    instance = SfntFont.parse(instantiate_font(font, {'wght': 650}))
+    glyph = instance.glyf.get_glyph(2)
+    assert glyph.x_coordinates.tolist() == [0, 550, 1100]
+    assert glyph.y_coordinates.tolist() == [0, 725, 0]
+    assert _get_metrics(instance)[0][2] == 1100
+
+    instance = SfntFont.parse(instantiate_font(font, {'wght': 100}))
+    assert instance.os2.us_weight_class == 100
+    glyph = instance.glyf.get_glyph(2)
+    assert glyph.x_coordinates.tolist() == [0, 550, 1100]
+    assert glyph.y_coordinates.tolist() == [0, 700, 0]
+    assert _get_metrics(instance)[0][2] == 1000
+
+
+def test_instantiate_shifted_component(font_tables: dict[str, bytes], build_sfnt: Callable[..., bytes]):
+    font = _build_variable_font(font_tables, build_sfnt, glyph_datas=[
+        b'',
+        b'',
+        encode_glyph_variation_data([
+            TupleVariation((1.0,), array('i', [-100, -100]), array('i', [0, 0]), point_numbers=array('H', [0, 3])),
+        ]),
+        b'',
+        b'',
+    ])
+    instance = SfntFont.parse(instantiate_font(font, {'wght': 900}))
+
+    glyph = instance.glyf.get_glyph(2)
+    assert glyph.x_coordinates.tolist() == [-100, 400, 900]
+    composite = instance.glyf.get_glyph(4)
+    assert (composite.x_min, composite.x_max) == (-100, 1100)
+
+    advance_widths, lsbs = _get_metrics(instance)
+    assert advance_widths == [500, 250, 1100, 1000, 1000]
+    assert lsbs == [50, 0, 0, -300, -100]
+    assert instance.hhea.min_left_side_bearing == -300
+    assert instance.hhea.min_right_side_bearing == -600
+    assert instance.hhea.x_max_extent == 1600
+
+
+def test_instantiate_with_avar(font_tables: dict[str, bytes], build_sfnt: Callable[..., bytes]):
+    font = _build_variable_font(font_tables, build_sfnt, with_avar=True)
+    instance = SfntFont.parse(instantiate_font(font, {'wght': 650}))
+    assert 'avar' not in instance
+    glyph = instance.glyf.get_glyph(2)
+    assert glyph.x_coordinates.tolist() == [0, 525, 1050]
+
+
+def test_instantiate_layout_variations(font_tables: dict[str, bytes], build_sfnt: Callable[..., bytes]):
+    font_tables = dict(font_tables)
+    font_tables['GDEF'] = bytes.fromhex('0001 0003 0000 0000 0000 0000 0000 00000014') + bytes.fromhex('0001 0000 0000 0000')
+    font_tables['GPOS'] = bytes.fromhex('0001 0001 0000 0000 0000 0000000e 0000')
+    font_tables['GSUB'] = bytes.fromhex('0001 0000 0000 0000 0000')
+    font = _build_variable_font(font_tables, build_sfnt)
+    with pytest.warns(UserWarning, match="'GDEF' item variation store, 'GPOS' feature variations"):
+        instance = SfntFont.parse(instantiate_font(font, {'wght': 900}))
+    assert instance.get_table_data('GDEF') == bytes.fromhex('0001 0003 0000 0000 0000 0000 0000 00000000 0001 0000 0000 0000')
+    assert instance.get_table_data('GPOS') == bytes.fromhex('0001 0001 0000 0000 0000 00000000 0000')
+    assert instance.get_table_data('GSUB') == font_tables['GSUB']
+
+
+def test_instantiate_errors(font_data: bytes):
+    with pytest.raises(ValueError):
+        instantiate_font(SfntFont.parse(font_data), {'wght': 400})
+
+
+def test_instantiate_without_numpy(font_tables: dict[str, bytes], build_sfnt: Callable[..., bytes], monkeypatch: pytest.MonkeyPatch):
+    pytest.importorskip('numpy')
+    font = _build_variable_font(font_tables, build_sfnt)
+    expected = instantiate_font(font, {'wght': 250})
+    monkeypatch.setattr(sfnttools.instancer, 'numpy', None)
+    assert instantiate_font(font, {'wght': 250}) == expected
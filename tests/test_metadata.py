@@ -0,0 +1,109 @@
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from sfnttools.collection import write_collection
+from sfnttools.font import SfntFont
+from sfnttools.metadata import FontMetadata, MetadataIndex, dump_metadata_index, extract_file_metadata, extract_font_metadata, get_coverage_ranges
+from sfnttools.tables.cmap import build_cmap_table, parse_cmap_table
+from sfnttools.utils.profiler import StreamProfiler
+
+_COVERAGE = [(0x20, 0x20), (0x41, 0x42), (0xC1, 0xC1), (0x1F600, 0x1F600)]
+
+
+def test_coverage_ranges():
+    mapping = {code_point: 1 + code_point % 7 for code_point in [*range(0x20, 0x7F), *range(0x100, 0x180), 0x1F600, 0x1F601]}
+    mapping[0x30] = 0
+    cmap = parse_cmap_table(build_cmap_table(mapping))
+    assert get_coverage_ranges(cmap.get_index()) == [(0x20, 0x2F), (0x31, 0x7E), (0x100, 0x17F), (0x1F600, 0x1F601)]
+    assert get_coverage_ranges(cmap.get_index(3, 1)) == [(0x20, 0x2F), (0x31, 0x7E), (0x100, 0x17F)]
+
+
+def test_extract_font_metadata(font_data: bytes):
+    font = SfntFont.parse(font_data)
+    with StreamProfiler() as profiler:
+        metadata = extract_font_metadata(font, 'test.ttf')
+    assert set(profiler.table_calls) == {'OS/2', 'cmap', 'head', 'name'}
+
+    assert metadata == FontMetadata(
+        'test.ttf',
+        0,
+        'Test Sans',
+        'Regular',
+        'Test Sans Regular',
+        'TestSans-Regular',
+        400,
+        5,
+        0x0040,
+        0,
+        (0x00000003, 0x02000000, 0, 0),
+        _COVERAGE,
+    )
+    assert metadata.covers(0x41)
+    assert metadata.covers(0x1F600)
+    assert not metadata.covers(0x43)
+    assert not metadata.covers(0x10)
+
+
+def test_extract_file_metadata(tmp_path: Path, font_tables: dict[str, bytes], build_sfnt: Callable[..., bytes]):
+    file_path = tmp_path.joinpath('font.ttf')
+    tables = dict(font_tables)
+    del tables['OS/2']
+    file_path.write_bytes(build_sfnt(tables))
+    metadatas = extract_file_metadata(file_path)
+    assert len(metadatas) == 1
+    assert metadatas[0].path == str(file_path)
+    assert metadatas[0].weight_class == 400
+    assert metadatas[0].unicode_ranges == (0, 0, 0, 0)
+
+    bold_tables = dict(font_tables)
+    bold_tables['OS/2'] = font_tables['OS/2'][:4] + (700).to_bytes(2, 'big') + font_tables['OS/2'][6:]
+    bold_tables['head'] = font_tables['head'][:44] + b'\x00\x01' + font_tables['head'][46:]
+    file_path = tmp_path.joinpath('font.ttc')
+    with file_path.open('wb') as file:
+        write_collection(file, [('\x00\x01\x00\x00', font_tables), ('\x00\x01\x00\x00', bold_tables)])
+    metadatas = extract_file_metadata(file_path)
+    assert [(metadata.font_index, metadata.weight_class, metadata.mac_style) for metadata in metadatas] == [(0, 400, 0), (1, 700, 1)]
+
+
+def test_metadata_index(tmp_path: Path):
+    metadatas = [
+        FontMetadata('a.ttf', 0, 'Alpha', 'Regular', None, None, 400, 5, 0x40, 0, (1, 0, 0, 0), [(0x20, 0x7E), (0x100, 0x2FF)]),
+        FontMetadata('a.ttc', 1, 'Alpha', 'Bold', 'Alpha Bold', 'Alpha-Bold', 700, 5, 0x20, 1, (1, 2, 3, 4), [(0x41, 0x5A), (0x4E00, 0x9FFF)]),
+        FontMetadata('emoji.ttf', 0, 'Émoji', None, coverage=[(0x1F600, 0x1F64F), (0x10FFFF, 0x10FFFF)]),
+        FontMetadata('empty.ttf'),
+    ]
+    data = dump_metadata_index(metadatas)
+    file_path = tmp_path.joinpath('fonts.idx')
+    file_path.write_bytes(data)
+
+    with MetadataIndex.load(file_path) as index:
+        assert len(index) == 4
+        assert [index[font_id] for font_id in range(len(index))] == metadatas
+        assert index.get_coverage(1) == [(0x41, 0x5A), (0x4E00, 0x9FFF)]
+        with pytest.raises(IndexError):
+            index[4]
+
+        assert index.find_fonts([]) == [0, 1, 2, 3]
+        assert index.find_fonts([0x41]) == [0, 1]
+        assert index.find_fonts([0x41, 0x20]) == [0]
+        assert index.find_fonts([0x41, 0x6C34]) == [1]
+        assert index.find_fonts([0x200, 0x2FF]) == [0]
+        assert index.find_fonts([0x300]) == []
+        assert index.find_fonts([0x1F60A, 0x10FFFF]) == [2]
+        assert index.find_fonts([0x41, 0x1F60A]) == []
+
+    index = MetadataIndex.parse(dump_metadata_index([]))
+    assert len(index) == 0
+    assert index.find_fonts([0x41]) == []
+
+
+def test_metadata_index_errors():
+    data = dump_metadata_index([FontMetadata('a.ttf', coverage=[(0x20, 0x7E)])])
+    with pytest.raises(ValueError):
+        MetadataIndex.parse(b'XXXX' + data[4:])
+    with pytest.raises(ValueError):
+        MetadataIndex.parse(data[:4] + b'\x00\x02' + data[6:])
+    with pytest.raises(EOFError):
+        MetadataIndex.parse(data[:-1])
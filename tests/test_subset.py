@@ -0,0 +1,53 @@
+import pytest
+
+from sfnttools.font import SfntFont
+from sfnttools.subset import calculate_glyph_closure, subset_font, subset_font_tables
+from sfnttools.tables.hmtx import parse_hmtx_table
+from sfnttools.utils.checksum import calculate_checksum
+
+
+def test_glyph_closure(font_data: bytes):
+    font = SfntFont.parse(font_data)
+    assert calculate_glyph_closure(font.glyf, [4]) == {2, 3, 4}
+    assert calculate_glyph_closure(font.glyf, [0, 1]) == {0, 1}
+    with pytest.raises(ValueError):
+        calculate_glyph_closure(font.glyf, [5])
+
+
+def test_subset_composite(font_data: bytes):
+    font = SfntFont.parse(font_data)
+    data = subset_font(font, [0xC1, 0x10FFFF])
+    assert calculate_checksum(data) == 0xB1B0AFBA
+
+    subset = SfntFont.parse(data)
+    assert subset.tags == ['OS/2', 'cmap', 'glyf', 'head', 'hhea', 'hmtx', 'loca', 'maxp', 'name', 'post']
+    assert subset.maxp.num_glyphs == 4
+    assert dict(subset.cmap.get_index().iter_mappings()) == {0xC1: 3}
+    assert subset.os2.us_first_char_index == subset.os2.us_last_char_index == 0xC1
+    assert subset.name.get_name(1) == 'Test Sans'
+
+    composite = subset.glyf.get_glyph(3)
+    assert composite.component_glyph_indices == [1, 2]
+    for new_glyph_index, old_glyph_index in enumerate([0, 2, 3]):
+        assert subset.glyf.get_glyph_data(new_glyph_index) == font.glyf.get_glyph_data(old_glyph_index)
+
+    hmtx = parse_hmtx_table(subset.get_table_data('hmtx'), 4, subset.hhea.number_of_h_metrics)
+    assert hmtx.advance_widths.tolist() == [500, 1000, 1000, 1000]
+    assert hmtx.lsbs.tolist() == [50, 0, -300, 0]
+    assert subset.hhea.number_of_h_metrics == 2
+
+
+def test_subset_glyph_indices(font_data: bytes):
+    font = SfntFont.parse(font_data)
+    tables = subset_font_tables(font, [0x41, 0x1F600], [1])
+    subset = SfntFont.parse(subset_font(font, [0x41, 0x1F600], [1]))
+    assert subset.maxp.num_glyphs == 3
+    assert dict(subset.cmap.get_index().iter_mappings()) == {0x41: 2, 0x1F600: 2}
+    assert subset.glyf.get_glyph(1) is None
+    assert tables['name'] == font.get_table_data('name')
+
+
+def test_subset_errors(font_tables: dict[str, bytes], build_sfnt):
+    del font_tables['glyf']
+    with pytest.raises(ValueError):
+        subset_font(SfntFont.parse(build_sfnt(font_tables)), [0x41])
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+from sfnttools.directory import OFFSET_TABLE_SCHEMA, TABLE_RECORD_SCHEMA, HEAD_CHECKSUM_ADJUSTMENT_OFFSET
+from sfnttools.font import SfntFont
+from sfnttools.validator import validate_sfnt, validate_sfnt_file
+
+
+def _get_record_offset(font_data: bytes, tag: str) -> int:
+    font = SfntFont.parse(font_data)
+    return OFFSET_TABLE_SCHEMA.size + TABLE_RECORD_SCHEMA.size * font.tags.index(tag)
+
+
+def _patch_record(font_data: bytes, table_tag: str, **kwargs) -> bytearray:
+    data = bytearray(font_data)
+    record_offset = _get_record_offset(font_data, table_tag)
+    table_record = TABLE_RECORD_SCHEMA.unpack_from(data, record_offset)
+    for name, value in kwargs.items():
+        setattr(table_record, name, value)
+    TABLE_RECORD_SCHEMA.pack_into(data, record_offset, table_record)
+    return data
+
+
+def test_valid(tmp_path: Path, font_data: bytes):
+    assert validate_sfnt(font_data) == []
+    file_path = tmp_path.joinpath('font.ttf')
+    file_path.write_bytes(font_data)
+    assert validate_sfnt_file(file_path) == []
+
+
+def test_truncated(font_data: bytes):
+    assert validate_sfnt(font_data[:8]) == ['offset table is truncated']
+    assert validate_sfnt(font_data[:20]) == ['table directory is truncated']
+    assert validate_sfnt(b'ABCD' + font_data[4:]) == ["unknown sfnt version: 'ABCD'"]
+
+    font = SfntFont.parse(font_data)
+    table_record = font.table_records['post']
+    problems = validate_sfnt(font_data[:table_record.offset + 4])
+    assert f"'post' range {table_record.offset}..{table_record.offset + table_record.length} is out of bounds" in problems
+
+
+def test_checksums(font_data: bytes):
+    font = SfntFont.parse(font_data)
+    table_record = font.table_records['name']
+
+    data = bytearray(font_data)
+    data[table_record.offset] ^= 0x01
+    problems = validate_sfnt(data)
+    assert len(problems) == 2
+    assert problems[0].startswith("'name' checksum mismatch")
+    assert problems[1].startswith('checkSumAdjustment mismatch')
+
+    data = bytearray(font_data)
+    offset = font.table_records['head'].offset + HEAD_CHECKSUM_ADJUSTMENT_OFFSET
+    data[offset:offset + 4] = bytes(4)
+    problems = validate_sfnt(data)
+    assert len(problems) == 1
+    assert problems[0].startswith('checkSumAdjustment mismatch')
+
+
+def test_layout(font_data: bytes):
+    font = SfntFont.parse(font_data)
+    name_record = font.table_records['name']
+    post_record = font.table_records['post']
+
+    problems = validate_sfnt(_patch_record(font_data, 'post', offset=name_record.offset + 2))
+    assert f"'post' offset {name_record.offset + 2} is not 4-byte aligned" in problems
+    assert any(problem.endswith("overlaps 'name'") or problem.startswith("'name' overlaps") for problem in problems)
+    assert not any(problem.startswith('checkSumAdjustment') for problem in problems)
+
+    problems = validate_sfnt(_patch_record(font_data, 'post', offset=4))
+    assert problems[0] == f"'post' range 4..{4 + post_record.length} is out of bounds"
+
+    problems = validate_sfnt(_patch_record(font_data, 'post', tag='cmap'))
+    assert 'table directory contains duplicate tags' in problems
+    assert 'table records are not sorted by tag' in problems
+    assert problems[-1].startswith('checkSumAdjustment mismatch')
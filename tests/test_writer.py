@@ -0,0 +1,46 @@
+from collections.abc import Callable
+
+import pytest
+
+from sfnttools.writer import SfntWriter, write_sfnt, dump_sfnt
+
+
+def test_dump_sfnt(font_tables: dict[str, bytes], font_data: bytes):
+    assert dump_sfnt(font_tables, '\x00\x01\x00\x00') == font_data
+
+
+def test_write_sfnt(font_tables: dict[str, bytes], font_data: bytes, tmp_path):
+    file_path = tmp_path.joinpath('font.ttf')
+    with file_path.open('wb') as file:
+        file.write(b'prefix')
+        write_sfnt(file, font_tables, '\x00\x01\x00\x00')
+    assert file_path.read_bytes() == b'prefix' + font_data
+
+
+def test_writer_flushed_patches(font_tables: dict[str, bytes], font_data: bytes, tmp_path):
+    file_path = tmp_path.joinpath('font.ttf')
+    with file_path.open('wb') as file:
+        with SfntWriter(file, '\x00\x01\x00\x00', len(font_tables)) as writer:
+            writer.stream.flush_size = 16
+            for tag in sorted(font_tables):
+                writer.write_table(tag, font_tables[tag])
+    assert file_path.read_bytes() == font_data
+
+
+def test_writer_without_head(font_tables: dict[str, bytes], build_sfnt: Callable[..., bytes]):
+    del font_tables['head']
+    assert dump_sfnt(font_tables, 'OTTO') == build_sfnt(font_tables, 'OTTO')
+
+
+def test_writer_errors(font_tables: dict[str, bytes], tmp_path):
+    with tmp_path.joinpath('font.ttf').open('wb') as file:
+        writer = SfntWriter(file, '\x00\x01\x00\x00', 2)
+        writer.write_table('head', font_tables['head'])
+        with pytest.raises(ValueError):
+            writer.write_table('head', font_tables['head'])
+        with pytest.raises(ValueError):
+            writer.close()
+        writer.write_table('maxp', font_tables['maxp'])
+        with pytest.raises(ValueError):
+            writer.write_table('post', font_tables['post'])
+        writer.close()
@@ -0,0 +1,186 @@
+import asyncio
+import threading
+from io import BytesIO, UnsupportedOperation
+
+import pytest
+
+from sfnttools.utils.async_stream import AsyncStream
+from sfnttools.utils.stream import Stream
+
+
+class AsyncBytesIO:
+    file: BytesIO
+    read_sizes: list[int]
+
+    def __init__(self, data: bytes = b''):
+        self.file = BytesIO(data)
+        self.read_sizes = []
+
+    async def read(self, size: int) -> bytes:
+        self.read_sizes.append(size)
+        return self.file.read(min(size, 3))
+
+    async def write(self, values: bytes) -> int:
+        return self.file.write(values)
+
+    async def seek(self, offset: int) -> int:
+        return self.file.seek(offset)
+
+
+def _record_thread(method, threads: list[threading.Thread]):
+    def wrapper(*args):
+        threads.append(threading.current_thread())
+        return method(*args)
+
+    return wrapper
+
+
+def _new_stream_reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+def _build_data() -> bytes:
+    stream = Stream()
+    stream.write_uint8(0xFF)
+    stream.write_int16(-2)
+    stream.write_uint24(0x123456)
+    stream.write_fixed(1.5)
+    stream.write_f2dot14(-0.5)
+    stream.write_long_datetime(3600)
+    stream.write_tag('glyf')
+    stream.write_version_16dot16((1, 5))
+    stream.write_255uint16_many([0, 252, 253, 506, 65535])
+    stream.write_uint_base128(0x7FFFFFFF)
+    stream.write_int16_array([-1, 0, 1])
+    stream.write_f2dot14_array([0.25, -1.0])
+    stream.write_binary_string('0100100001101001')
+    return stream.get_value()
+
+
+async def _read_values(stream: AsyncStream) -> list:
+    return [
+        await stream.read_uint8(),
+        await stream.read_int16(),
+        await stream.read_uint24(),
+        await stream.read_fixed(),
+        await stream.read_f2dot14(),
+        await stream.read_long_datetime(),
+        await stream.read_tag(),
+        await stream.read_version_16dot16(),
+        await stream.read_255uint16_many(5),
+        await stream.read_uint_base128(),
+        await stream.read_int16_array(3, as_tuple=True),
+        await stream.read_f2dot14_array(2, as_tuple=True),
+        await stream.read_binary_string(2),
+    ]
+
+
+EXPECTED_VALUES = [0xFF, -2, 0x123456, 1.5, -0.5, 3600, 'glyf', (1, 5), [0, 252, 253, 506, 65535], 0x7FFFFFFF, (-1, 0, 1), (0.25, -1.0), '0100100001101001']
+
+
+def test_read_async_file():
+    data = _build_data()
+    stream = AsyncStream(AsyncBytesIO(data))
+    assert asyncio.run(_read_values(stream)) == EXPECTED_VALUES
+    assert stream.tell() == len(data)
+
+
+def test_read_stream_reader():
+    async def read() -> tuple[list, int]:
+        stream = AsyncStream(_new_stream_reader(data))
+        return await _read_values(stream), stream.tell()
+
+    data = _build_data()
+    assert asyncio.run(read()) == (EXPECTED_VALUES, len(data))
+
+
+def test_read_sync_file():
+    data = _build_data()
+    stream = AsyncStream(BytesIO(data))
+    assert asyncio.run(_read_values(stream)) == EXPECTED_VALUES
+    assert stream.tell() == len(data)
+
+
+def test_write():
+    async def write(stream: AsyncStream):
+        await stream.write_uint8(0xFF)
+        await stream.write_int16(-2)
+        await stream.write_uint24(0x123456)
+        await stream.write_fixed(1.5)
+        await stream.write_f2dot14(-0.5)
+        await stream.write_long_datetime(3600)
+        await stream.write_tag('glyf')
+        await stream.write_version_16dot16((1, 5))
+        await stream.write_255uint16_many([0, 252, 253, 506, 65535])
+        await stream.write_uint_base128(0x7FFFFFFF)
+        await stream.write_int16_array([-1, 0, 1])
+        await stream.write_f2dot14_array([0.25, -1.0])
+        await stream.write_binary_string('0100100001101001')
+        await stream.align_to_4_byte_with_nulls()
+
+    source = AsyncBytesIO()
+    stream = AsyncStream(source)
+    asyncio.run(write(stream))
+    data = _build_data()
+    assert source.file.getvalue() == data + bytes(stream.tell() - len(data))
+    assert stream.tell() % 4 == 0
+
+
+def test_write_file(tmp_path):
+    async def write(file) -> int:
+        stream = AsyncStream(file)
+        await stream.write_uint32(0x12345678)
+        await stream.write(b'ABC')
+        return stream.tell()
+
+    threads = []
+    file_path = tmp_path.joinpath('data.bin')
+    with file_path.open('wb') as file:
+        file.write = _record_thread(file.write, threads)
+        assert asyncio.run(write(file)) == 7
+    assert file_path.read_bytes() == bytes.fromhex('12345678') + b'ABC'
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+
+
+def test_eof():
+    async def read(stream: AsyncStream) -> bytes:
+        with pytest.raises(EOFError):
+            await stream.read(4)
+        await stream.seek(0)
+        return await stream.read(4, ignore_eof=True)
+
+    assert asyncio.run(read(AsyncStream(AsyncBytesIO(b'ABC')))) == b'ABC'
+
+    async def read_reader():
+        stream = AsyncStream(_new_stream_reader(b'ABC'))
+        with pytest.raises(EOFError):
+            await stream.read_uint32()
+
+    asyncio.run(read_reader())
+
+
+def test_seek():
+    async def seek(stream: AsyncStream) -> list[int]:
+        await stream.seek(4)
+        value = await stream.read_uint8()
+        await stream.seek(2)
+        return [value, await stream.read_uint8()]
+
+    source = AsyncBytesIO(bytes(range(8)))
+    assert asyncio.run(seek(AsyncStream(source))) == [4, 2]
+    assert source.read_sizes == [1, 1]
+
+    async def seek_forward():
+        stream = AsyncStream(_new_stream_reader(bytes(range(8))))
+        await stream.seek(4)
+        assert await stream.read_uint8() == 4
+        await stream.seek(1, 1)
+        assert await stream.read_uint8() == 6
+        with pytest.raises(UnsupportedOperation):
+            await stream.seek(2)
+
+    asyncio.run(seek_forward())
@@ -1,4 +1,17 @@
-from sfnttools.utils.checksum import calculate_checksum, calculate_checksum_adjustment
+import mmap
+import random
+
+import pytest
+
+from sfnttools.utils import checksum
+from sfnttools.utils.checksum import calculate_checksum, calculate_checksum_adjustment, ChecksumAccumulator
+
+
+def _calculate_checksum_by_words(data: bytes) -> int:
+    value = 0
+    for i in range(0, len(data), 4):
+        value += int.from_bytes(data[i:i + 4].ljust(4, b'\x00'), 'big', signed=False)
+    return value & 0xFFFFFFFF
 
 
 def test_calculate_checksum():
@@ -7,6 +20,67 @@ def test_calculate_checksum():
     assert calculate_checksum(b'Hello World!') == 703735804
 
 
+def test_calculate_checksum_buffers(tmp_path):
+    data = b'Hello World!' * 1000 + b'abc'
+    value = _calculate_checksum_by_words(data)
+    assert calculate_checksum(bytearray(data)) == value
+    assert calculate_checksum(memoryview(data)) == value
+    assert calculate_checksum(memoryview(data).cast('B', (len(data),))) == value
+    assert calculate_checksum(memoryview(data)[12:]) == _calculate_checksum_by_words(data[12:])
+    assert calculate_checksum(b'') == 0
+
+    file_path = tmp_path.joinpath('data.bin')
+    file_path.write_bytes(data)
+    with file_path.open('rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        assert calculate_checksum(mm) == value
+
+
+@pytest.mark.parametrize('size', [0, 1, 2, 3, 4, 5, 1024 * 64 - 1, 1024 * 64, 1024 * 64 + 3, 1024 * 200 + 1])
+def test_calculate_checksum_sizes(size: int, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(checksum, 'numpy', None)
+    data = random.Random(size).randbytes(size)
+    assert calculate_checksum(data) == _calculate_checksum_by_words(data)
+
+
+def test_calculate_checksum_numpy():
+    pytest.importorskip('numpy')
+    data = random.Random(0).randbytes(1024 * 200 + 3)
+    assert calculate_checksum(data) == _calculate_checksum_by_words(data)
+
+
+def test_checksum_accumulator():
+    data = random.Random(1).randbytes(1000 * 13 + 7)
+    for chunk_size in [1, 3, 4, 5, 13, 4096, len(data)]:
+        accumulator = ChecksumAccumulator()
+        for i in range(0, len(data), chunk_size):
+            accumulator.update(data[i:i + chunk_size])
+        assert accumulator.checksum == calculate_checksum(data)
+        assert accumulator.size == len(data)
+    assert ChecksumAccumulator().checksum == 0
+    assert ChecksumAccumulator(b'abcdxyz').checksum == 3655064932
+
+
+def test_checksum_accumulator_copy():
+    accumulator = ChecksumAccumulator(b'abcdx')
+    copied = accumulator.copy()
+    copied.update(b'yz')
+    assert accumulator.checksum == calculate_checksum(b'abcdx')
+    assert copied.checksum == calculate_checksum(b'abcdxyz')
+
+
+def test_checksum_accumulator_merge():
+    accumulator = ChecksumAccumulator(b'abcdxyz')
+    accumulator.merge(ChecksumAccumulator(b'Hello World!'))
+    accumulator.merge(ChecksumAccumulator(b'abc'))
+    assert accumulator.checksum == calculate_checksum(b'abcdxyz\x00Hello World!abc')
+    assert accumulator.size == 8 + 12 + 3
+    assert calculate_checksum_adjustment([accumulator.checksum]) == calculate_checksum_adjustment([
+        calculate_checksum(b'abcdxyz'),
+        calculate_checksum(b'Hello World!'),
+        calculate_checksum(b'abc'),
+    ])
+
+
 def test_calculate_checksum_adjustment():
     assert calculate_checksum_adjustment([
         1633837924,
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from sfnttools.utils.fixed import decode_f2dot14_many, decode_fixed_many, encode_f2dot14_many, encode_fixed_many
+from sfnttools.utils.math import round_half_up
+
+
+def _random_values() -> list[float]:
+    rng = random.Random(0)
+    return [rng.uniform(-1.99, 1.99) for _ in range(1000)] + [i / (1 << 15) for i in range(-65000, 65000, 7)] + [-0.0, -2.0, 1.9999]
+
+
+def test_fixed():
+    values = _random_values()
+    encoded = encode_fixed_many(values)
+    assert encoded.itemsize == 4
+    assert encoded.tolist() == [round_half_up(value * (2 ** 16)) for value in values]
+    assert decode_fixed_many(encoded).tolist() == [value / (2 ** 16) for value in encoded]
+    assert encode_fixed_many([32767.99999, -32768.0]).tolist() == [0x7FFFFFFF, -0x80000000]
+    with pytest.raises(OverflowError):
+        encode_fixed_many([32768.0])
+
+
+def test_f2dot14():
+    values = _random_values()
+    encoded = encode_f2dot14_many(values)
+    assert encoded.typecode == 'h'
+    assert encoded.tolist() == [round_half_up(value * (2 ** 14)) for value in values]
+    assert decode_f2dot14_many(encoded).tolist() == [value / (2 ** 14) for value in encoded]
+    assert encode_f2dot14_many([0.5, -0.5, 3 / (2 ** 15), -3 / (2 ** 15)]).tolist() == [8192, -8192, 2, -2]
+    with pytest.raises(OverflowError):
+        encode_f2dot14_many([2.0])
+    with pytest.raises(ValueError):
+        encode_f2dot14_many([float('nan')])
+
+
+def test_numpy():
+    numpy = pytest.importorskip('numpy')
+    values = _random_values()
+    assert encode_fixed_many(numpy.array(values)) == encode_fixed_many(values)
+    assert encode_f2dot14_many(numpy.array(values)) == encode_f2dot14_many(values)
+    encoded = encode_f2dot14_many(values)
+    assert decode_f2dot14_many(numpy.array(encoded, dtype=numpy.int16)) == decode_f2dot14_many(encoded)
+    with pytest.raises(OverflowError):
+        encode_f2dot14_many(numpy.array([2.0]))
+    with pytest.raises(ValueError):
+        encode_fixed_many(numpy.array([float('nan')]))
@@ -1,4 +1,6 @@
-from sfnttools.utils.math import round_half_up
+import pytest
+
+from sfnttools.utils.math import round_half_up, round_half_up_integer, round_half_up_many
 
 
 def test_round_half_up():
@@ -35,3 +37,16 @@ def test_round_half_up():
     assert round_half_up(-1.2445, 2) == -1.24
     assert round_half_up(-1.2455, 2) == -1.25
     assert round_half_up(-1.2465, 2) == -1.25
+
+
+def test_round_half_up_integer():
+    values = [i / 4 for i in range(-40, 41)] + [1.4999999999999998, -1.4999999999999998, 0.49999999999999994, -0.0, 1e15 + 0.5]
+    for value in values:
+        assert round_half_up_integer(value) == round_half_up(value)
+    assert round_half_up_many(values) == [round_half_up(value) for value in values]
+    assert round_half_up_many(range(-3, 3)) == [-3, -2, -1, 0, 1, 2]
+
+    with pytest.raises(ValueError):
+        round_half_up_integer(float('nan'))
+    with pytest.raises(OverflowError):
+        round_half_up_many([float('-inf')])
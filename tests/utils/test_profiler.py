@@ -0,0 +1,105 @@
+import json
+import threading
+
+import pytest
+
+from sfnttools.font import SfntFont
+from sfnttools.utils.profiler import StreamProfiler, profile_table
+from sfnttools.utils.stream import Stream, BufferStream, BufferedStream
+
+
+def test_primitives():
+    original_read_uint16 = BufferStream.read_uint16
+    original_write_nulls = Stream.write_nulls
+
+    profiler = StreamProfiler()
+    with profiler:
+        assert profiler.enabled
+        assert BufferStream.read_uint16 is not original_read_uint16
+        stream = BufferedStream()
+        stream.write_uint16(1)
+        stream.write_uint16_array([2, 3, 4])
+        stream.write_nulls(2)
+        stream = BufferStream(stream.get_value())
+        assert stream.read_uint16() == 1
+        assert stream.read_uint16_array(3, as_tuple=True) == (2, 3, 4)
+        assert stream.read_255uint16() == 0
+
+    assert not profiler.enabled
+    assert BufferStream.read_uint16 is original_read_uint16
+    assert Stream.write_nulls is original_write_nulls
+    assert profiler.primitive_calls == {
+        'write_uint16': 1,
+        'write_uint16_array': 1,
+        'write_nulls': 1,
+        'read_uint16': 1,
+        'read_uint16_array': 1,
+        'read_255uint16': 1,
+    }
+    assert profiler.primitive_bytes == {
+        'write_uint16': 2,
+        'write_uint16_array': 6,
+        'write_nulls': 2,
+        'read_uint16': 2,
+        'read_uint16_array': 6,
+        'read_255uint16': 1,
+    }
+
+    stream = BufferStream(b'\x00\x01')
+    stream.read_uint16()
+    assert profiler.primitive_calls['read_uint16'] == 1
+
+
+def test_tables(font_data: bytes):
+    with StreamProfiler() as profiler:
+        font = SfntFont.parse(font_data)
+        font.name
+        font.cmap
+        font.glyf
+        font.name
+        with profile_table('test'):
+            BufferStream(b'ABCD').read_tag()
+
+    assert profile_table('test') is profile_table('name')
+    assert sorted(profiler.table_calls) == ['cmap', 'glyf', 'head', 'maxp', 'name', 'test']
+    assert profiler.table_calls['name'] == 1
+    assert profiler.table_bytes['test'] == 0
+    assert profiler.table_primitive_bytes['test'] == 4
+    for tag in ('head', 'maxp', 'name', 'glyf'):
+        assert profiler.table_bytes[tag] == len(font.get_table_data(tag))
+    assert profiler.table_primitive_bytes['head'] == 0
+    assert all(value >= 0 for value in profiler.table_time.values())
+
+    data = json.loads(profiler.to_json())
+    assert data['tables']['test'] == {'calls': 1, 'bytes': 0, 'primitive_bytes': 4, 'time': profiler.table_time['test']}
+    assert data['primitives']['read_tag']['calls'] == profiler.primitive_calls['read_tag']
+
+    report = profiler.format_report()
+    assert report.splitlines()[0].split() == ['table', 'calls', 'bytes', 'primitive', 'time', '(ms)']
+    assert "'test'" in report
+
+    profiler.reset()
+    assert profiler.to_dict() == {'primitives': {}, 'tables': {}}
+
+
+def test_threads():
+    def read():
+        with profile_table('thread', 8):
+            BufferStream(bytes(8)).read_uint32_array(2)
+
+    with StreamProfiler() as profiler:
+        with profile_table('main', 4):
+            thread = threading.Thread(target=read)
+            thread.start()
+            thread.join()
+            BufferStream(bytes(2)).read_uint16()
+
+    assert profiler.table_bytes == {'main': 4, 'thread': 8}
+    assert profiler.table_primitive_bytes == {'main': 2, 'thread': 8}
+    assert profiler.primitive_calls == {'read_uint32_array': 1, 'read_uint16': 1}
+
+
+def test_single_profiler():
+    with StreamProfiler():
+        with pytest.raises(ValueError):
+            StreamProfiler().enable()
@@ -0,0 +1,132 @@
+import pytest
+
+from sfnttools.utils.math import round_half_up
+from sfnttools.utils.record import RecordSchema
+from sfnttools.utils.stream import Stream
+
+_TABLE_RECORD_SCHEMA = RecordSchema('TableRecord', [
+    ('tag', 'tag'),
+    ('checksum', 'uint32'),
+    ('offset', 'offset32'),
+    ('length', 'uint32'),
+])
+
+_ALL_TYPES_SCHEMA = RecordSchema('AllTypes', [
+    ('uint8', 'uint8'),
+    ('int8', 'int8'),
+    ('uint16', 'uint16'),
+    ('int16', 'int16'),
+    ('uint24', 'uint24'),
+    ('uint32', 'uint32'),
+    ('int32', 'int32'),
+    ('fixed', 'fixed'),
+    ('fword', 'fword'),
+    ('ufword', 'ufword'),
+    ('f2dot14', 'f2dot14'),
+    ('long_datetime', 'long_datetime'),
+    ('tag', 'tag'),
+    ('offset8', 'offset8'),
+    ('offset16', 'offset16'),
+    ('offset24', 'offset24'),
+    ('offset32', 'offset32'),
+    ('version', 'version_16dot16'),
+])
+
+
+def test_unpack():
+    stream = Stream()
+    stream.write_tag('head')
+    stream.write_uint32(0x12345678)
+    stream.write_offset32(0x100)
+    stream.write_uint32(54)
+    data = stream.get_value()
+
+    assert _TABLE_RECORD_SCHEMA.size == 16
+    record = _TABLE_RECORD_SCHEMA.unpack(data)
+    assert record.tag == 'head'
+    assert record.checksum == 0x12345678
+    assert record.offset == 0x100
+    assert record.length == 54
+    assert _TABLE_RECORD_SCHEMA.pack(record) == data
+    assert not hasattr(record, '__dict__')
+
+
+def test_unpack_many():
+    records = [_TABLE_RECORD_SCHEMA.new_record(tag, i, i * 16, i * 3) for i, tag in enumerate(['cmap', 'glyf', 'head', 'loca'])]
+    data = b'\x00\x00' + _TABLE_RECORD_SCHEMA.pack_many(records)
+    assert _TABLE_RECORD_SCHEMA.unpack_many(data, 2, 4) == records
+    assert _TABLE_RECORD_SCHEMA.unpack_many(data, 2, 0) == []
+    assert _TABLE_RECORD_SCHEMA.unpack_from(data, 2 + 16) == records[1]
+    with pytest.raises(EOFError):
+        _TABLE_RECORD_SCHEMA.unpack_many(data, 2, 5)
+
+    buffer = bytearray(len(data))
+    for i, record in enumerate(records):
+        _TABLE_RECORD_SCHEMA.pack_into(buffer, 2 + i * 16, record)
+    assert buffer == data
+
+
+def test_all_types():
+    values = [
+        0xFF, -0x80, 0xFFFF, -0x8000, 0xFFFFFF, 0xFFFFFFFF, -0x80000000, 1.5, -0x8000, 0xFFFF, -2.0,
+        0x7FFFFFFFFFFFFFFF, 'OS/2', 0xFF, 0xFFFF, 0xFFFFFF, 0xFFFFFFFF, (1, 5),
+    ]
+    stream = Stream()
+    stream.write_uint8(values[0])
+    stream.write_int8(values[1])
+    stream.write_uint16(values[2])
+    stream.write_int16(values[3])
+    stream.write_uint24(values[4])
+    stream.write_uint32(values[5])
+    stream.write_int32(values[6])
+    stream.write_fixed(values[7])
+    stream.write_fword(values[8])
+    stream.write_ufword(values[9])
+    stream.write_f2dot14(values[10])
+    stream.write_long_datetime(values[11])
+    stream.write_tag(values[12])
+    stream.write_offset8(values[13])
+    stream.write_offset16(values[14])
+    stream.write_offset24(values[15])
+    stream.write_offset32(values[16])
+    stream.write_version_16dot16(values[17])
+    data = stream.get_value()
+
+    assert _ALL_TYPES_SCHEMA.size == len(data)
+    record = _ALL_TYPES_SCHEMA.new_record(*values)
+    assert _ALL_TYPES_SCHEMA.pack(record) == data
+    assert _ALL_TYPES_SCHEMA.unpack(data) == record
+
+
+def test_rounding():
+    schema = RecordSchema('Values', [('fixed', 'fixed'), ('f2dot14', 'f2dot14')])
+    for value in [1.999939, 0.000061, -0.000061, 0.5 / (2 ** 14), -0.5 / (2 ** 14), 1.5 / (2 ** 16), -1.5 / (2 ** 16)]:
+        stream = Stream()
+        stream.write_fixed(value)
+        stream.write_f2dot14(value)
+        assert schema.pack(schema.new_record(value, value)) == stream.get_value()
+    record = schema.unpack(schema.pack(schema.new_record(1.75, 1.999939)))
+    assert record.fixed == 1.75
+    assert round_half_up(record.f2dot14, 6) == 1.999939
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        RecordSchema('Unknown', [('value', 'uint64')])
+    with pytest.raises(ValueError):
+        _TABLE_RECORD_SCHEMA.pack(_TABLE_RECORD_SCHEMA.new_record('abc', 0, 0, 0))
+    schema = RecordSchema('Version', [('version', 'version_16dot16')])
+    with pytest.raises(ValueError):
+        schema.pack(schema.new_record((1, 10)))
+
+
+def test_stream():
+    records = [_TABLE_RECORD_SCHEMA.new_record('glyf', 1, 2, 3), _TABLE_RECORD_SCHEMA.new_record('loca', 4, 5, 6)]
+    stream = Stream()
+    assert stream.write_record(_TABLE_RECORD_SCHEMA, records[0]) == 16
+    assert stream.write_records(_TABLE_RECORD_SCHEMA, records) == 32
+    assert stream.tell() == 48
+    stream.seek(0)
+    assert stream.read_record(_TABLE_RECORD_SCHEMA) == records[0]
+    assert stream.read_records(_TABLE_RECORD_SCHEMA, 2) == records
+    assert stream.tell() == 48
@@ -1,7 +1,11 @@
+import os
+from array import array
+from io import BytesIO, UnsupportedOperation
+
 import pytest
 
 from sfnttools.utils.math import round_half_up
-from sfnttools.utils.stream import Stream
+from sfnttools.utils.stream import Stream, BufferStream, BufferedStream
 
 
 def test_bytes():
@@ -278,6 +282,97 @@ def test_uint_base128():
     assert stream.tell() == 12
 
 
+def test_uint8_array():
+    stream = Stream()
+    assert stream.write_uint8_array([0x00, 0x7F, 0xFF]) == 3
+    assert stream.tell() == 3
+    stream.seek(0)
+    assert stream.read_uint8_array(3) == array('B', [0x00, 0x7F, 0xFF])
+    stream.seek(0)
+    assert stream.read_uint8_array(3, as_tuple=True) == (0x00, 0x7F, 0xFF)
+    assert stream.tell() == 3
+
+
+def test_int8_array():
+    stream = Stream()
+    assert stream.write_int8_array([-0x80, 0x00, 0x7F]) == 3
+    assert stream.tell() == 3
+    stream.seek(0)
+    assert stream.read_int8_array(3, as_tuple=True) == (-0x80, 0x00, 0x7F)
+    assert stream.tell() == 3
+
+
+def test_uint16_array():
+    stream = Stream()
+    assert stream.write_uint16_array([0x0000, 0x1234, 0xFFFF]) == 6
+    assert stream.get_value() == b'\x00\x00\x12\x34\xff\xff'
+    stream.seek(0)
+    assert list(stream.read_uint16_array(3)) == [0x0000, 0x1234, 0xFFFF]
+    stream.seek(0)
+    assert stream.read_uint16_array(3, as_tuple=True) == (0x0000, 0x1234, 0xFFFF)
+    assert stream.tell() == 6
+    with pytest.raises(OverflowError):
+        stream.write_uint16_array([0x10000])
+
+
+def test_int16_array():
+    stream = Stream()
+    assert stream.write_int16_array([-0x8000, -1, 0x7FFF]) == 6
+    stream.seek(0)
+    assert stream.read_uint16_array(3, as_tuple=True) == (0x8000, 0xFFFF, 0x7FFF)
+    stream.seek(0)
+    assert stream.read_int16_array(3, as_tuple=True) == (-0x8000, -1, 0x7FFF)
+    assert stream.tell() == 6
+
+
+def test_uint32_array():
+    stream = Stream()
+    assert stream.write_uint32_array([0x00000000, 0x12345678, 0xFFFFFFFF]) == 12
+    assert stream.get_value() == b'\x00\x00\x00\x00\x12\x34\x56\x78\xff\xff\xff\xff'
+    stream.seek(0)
+    assert stream.read_uint32_array(3, as_tuple=True) == (0x00000000, 0x12345678, 0xFFFFFFFF)
+    assert stream.tell() == 12
+
+
+def test_int32_array():
+    stream = Stream()
+    assert stream.write_int32_array([-0x80000000, -1, 0x7FFFFFFF]) == 12
+    stream.seek(0)
+    assert stream.read_int32_array(3, as_tuple=True) == (-0x80000000, -1, 0x7FFFFFFF)
+    assert stream.tell() == 12
+
+
+def test_fixed_array():
+    stream = Stream()
+    assert stream.write_fixed_array([-0x8000 / (2 ** 16), 1.5, 0x7FFF / (2 ** 16)]) == 12
+    stream.seek(0)
+    assert stream.read_fixed() == -0x8000 / (2 ** 16)
+    assert stream.read_fixed() == 1.5
+    assert stream.read_fixed() == 0x7FFF / (2 ** 16)
+    stream.seek(0)
+    assert stream.read_fixed_array(3, as_tuple=True) == (-0x8000 / (2 ** 16), 1.5, 0x7FFF / (2 ** 16))
+    assert stream.tell() == 12
+
+
+def test_f2dot14_array():
+    values = [-2.0, -0.5, 0.000030517578125, 0.000091552734375, 1.99993896484375]
+    stream = Stream()
+    assert stream.write_f2dot14_array(values) == 10
+    for value in values:
+        stream.write_f2dot14(value)
+    assert stream.get_value()[:10] == stream.get_value()[10:]
+    assert stream.get_value()[4:8] == b'\x00\x01\x00\x02'
+    stream.seek(0)
+    assert stream.read_f2dot14_array(5, as_tuple=True) == (-2.0, -0.5, 2 ** -14, 2 ** -13, 1.99993896484375)
+    assert [stream.read_f2dot14() for _ in range(5)] == [-2.0, -0.5, 2 ** -14, 2 ** -13, 1.99993896484375]
+
+
+def test_array_eof():
+    stream = Stream(b'\x00\x01\x00')
+    with pytest.raises(EOFError):
+        stream.read_uint16_array(2)
+
+
 def test_binary_string():
     stream = Stream()
     assert stream.write_binary_string('00000000111111110000111101010101') == 4
@@ -311,3 +406,185 @@ def test_align_to_4_byte():
 def test_get_value():
     stream = Stream(b'Hello World')
     assert stream.get_value() == b'Hello World'
+
+
+def test_buffer_stream():
+    stream = Stream()
+    stream.write_uint8(0xFF)
+    stream.write_int8(-0x80)
+    stream.write_uint16(0xFFFF)
+    stream.write_int16(-0x8000)
+    stream.write_uint24(0xFFFFFF)
+    stream.write_uint32(0xFFFFFFFF)
+    stream.write_int32(-0x80000000)
+    stream.write_fixed(1.5)
+    stream.write_tag('head')
+    stream.write_version_16dot16((1, 5))
+    stream.write_uint16_array([1, 2, 3])
+    data = stream.get_value()
+
+    stream = BufferStream(data)
+    assert len(stream) == len(data)
+    assert stream.read_uint8() == 0xFF
+    assert stream.read_int8() == -0x80
+    assert stream.read_uint16() == 0xFFFF
+    assert stream.read_int16() == -0x8000
+    assert stream.read_uint24() == 0xFFFFFF
+    assert stream.read_uint32() == 0xFFFFFFFF
+    assert stream.read_int32() == -0x80000000
+    assert stream.read_fixed() == 1.5
+    assert stream.read_tag() == 'head'
+    assert stream.read_version_16dot16() == (1, 5)
+    assert stream.read_uint16_array(3, as_tuple=True) == (1, 2, 3)
+    assert stream.tell() == len(data)
+    with pytest.raises(EOFError):
+        stream.read_uint8()
+    assert stream.get_value() == data
+
+
+def test_buffer_stream_view():
+    data = b'Hello World'
+    stream = BufferStream(data)
+    view = stream.read_view(5)
+    assert view.obj is data
+    assert view == b'Hello'
+    assert stream.read(1) == b' '
+    assert stream.read(10, ignore_eof=True) == b'World'
+    stream.seek(-5, os.SEEK_END)
+    with pytest.raises(EOFError):
+        stream.read_view(6)
+    stream.seek(-2, os.SEEK_CUR)
+    assert stream.tell() == 4
+
+    sub_stream = stream.slice(6, 5)
+    assert sub_stream.buffer.obj is data
+    assert sub_stream.tell() == 0
+    assert sub_stream.read(5) == b'World'
+    assert sub_stream.slice(1, 3).read(3) == b'orl'
+    with pytest.raises(EOFError):
+        stream.slice(6, 6)
+
+
+def test_buffer_stream_write():
+    data = bytearray(b'Hello World')
+    stream = BufferStream(data)
+    stream.seek(6)
+    assert stream.write_tag('Wolf') == 4
+    assert data == b'Hello Wolfd'
+    with pytest.raises(EOFError):
+        stream.write_uint16(0)
+    with pytest.raises(ValueError):
+        BufferStream(b'Hello World').write(b'a')
+
+
+def test_buffer_stream_mmap(tmp_path):
+    file_path = tmp_path.joinpath('data.bin')
+    file_path.write_bytes(b'\x00\x01\x00\x02')
+    with BufferStream.from_file(file_path) as stream:
+        assert stream.read_uint16_array(2, as_tuple=True) == (1, 2)
+
+    file_path.write_bytes(b'')
+    with BufferStream.from_file(file_path) as stream:
+        assert len(stream) == 0
+
+
+def test_buffer_stream_read_bounds():
+    stream = BufferStream(b'ABCD')
+    stream.seek(10)
+    assert stream.read(2, ignore_eof=True) == b''
+    assert stream.tell() == 10
+    with pytest.raises(EOFError):
+        stream.read(2)
+    assert stream.read(-1) == b''
+    assert stream.tell() == 10
+
+    stream.seek(1)
+    assert stream.read(-1) == b'BCD'
+    assert stream.tell() == 4
+    assert stream.read(-1) == b''
+    assert stream.tell() == 4
+
+
+def test_buffer_stream_mmap_close_with_views(tmp_path):
+    file_path = tmp_path.joinpath('data.bin')
+    file_path.write_bytes(b'\x00\x01\x00\x02')
+    stream = BufferStream.from_file(file_path)
+    view = stream.read_view(2)
+    table_stream = stream.slice(2, 2)
+    stream.close()
+    assert stream._mmap is None
+    assert view.tobytes() == b'\x00\x01'
+    assert table_stream.read_uint16() == 2
+    stream.close()
+    view.release()
+    table_stream.close()
+
+
+def test_write_nulls():
+    stream = Stream()
+    assert stream.write_nulls(0) == 0
+    assert stream.write_nulls(5) == 5
+    assert stream.get_value() == b'\x00' * 5
+
+
+def test_buffered_stream():
+    stream = BufferedStream()
+    assert stream.write_uint8(0xFF) == 1
+    assert stream.write_int8(-0x80) == 1
+    assert stream.write_uint16(0xFFFF) == 2
+    assert stream.write_int16(-0x8000) == 2
+    assert stream.write_uint24(0xFFFFFF) == 3
+    assert stream.write_uint32(0xFFFFFFFF) == 4
+    assert stream.write_int32(-0x80000000) == 4
+    assert stream.write_tag('head') == 4
+    assert stream.align_to_4_byte_with_nulls() == 3
+    assert stream.tell() == 24
+
+    expected = Stream()
+    expected.write_uint8(0xFF)
+    expected.write_int8(-0x80)
+    expected.write_uint16(0xFFFF)
+    expected.write_int16(-0x8000)
+    expected.write_uint24(0xFFFFFF)
+    expected.write_uint32(0xFFFFFFFF)
+    expected.write_int32(-0x80000000)
+    expected.write_tag('head')
+    expected.align_to_4_byte_with_nulls()
+    assert stream.get_value() == expected.get_value()
+
+    with pytest.raises(OverflowError):
+        stream.write_uint16(0x10000)
+    with pytest.raises(UnsupportedOperation):
+        stream.read(1)
+    with pytest.raises(UnsupportedOperation):
+        stream.seek(0)
+
+
+def test_buffered_stream_patch():
+    stream = BufferedStream()
+    stream.write_tag('head')
+    offset = stream.reserve(4)
+    assert offset == 4
+    stream.write(b'abcd')
+    stream.patch_uint32(offset, 0x12345678)
+    stream.patch_uint16(8, 0x4142)
+    assert stream.get_value() == b'head\x12\x34\x56\x78ABcd'
+    with pytest.raises(ValueError):
+        stream.patch_uint32(10, 0)
+
+
+def test_buffered_stream_flush():
+    target = BytesIO()
+    target.write(b'xx')
+    with BufferedStream(target, flush_size=8) as stream:
+        offset = stream.reserve(4)
+        stream.write(b'abcdefgh')
+        assert stream.flushed_size == 12
+        stream.write(b'ij')
+        assert target.getvalue() == b'xx\x00\x00\x00\x00abcdefgh'
+        stream.patch(10, b'ABCD')
+        stream.patch_uint32(offset, 0x31323334)
+        assert stream.tell() == 14
+        with pytest.raises(ValueError):
+            stream.get_value()
+    assert target.getvalue() == b'xx1234abcdefABCD'
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from sfnttools.utils.stream import Stream, BufferStream
+from sfnttools.utils.varint import decode_255uint16_many, encode_255uint16_many, decode_uint_base128_many, encode_uint_base128_many
+
+
+def test_255uint16_many():
+    values = [0, 252, 253, 505, 506, 761, 762, 0xFFFF, *random.Random(0).choices(range(0x10000), k=1000)]
+    stream = Stream()
+    for value in values:
+        stream.write_255uint16(value)
+    data = stream.get_value()
+
+    assert encode_255uint16_many(values) == data
+    assert decode_255uint16_many(b'\x00' + data, 1, len(values)) == (values, len(data) + 1)
+    assert decode_255uint16_many(b'\xfd\x02\xfa\xfe\x00\xff\xfd', 0, 3) == ([762, 506, 506], 7)
+    with pytest.raises(EOFError):
+        decode_255uint16_many(b'\xfd\x02', 0, 1)
+    with pytest.raises(ValueError):
+        encode_255uint16_many([0x10000])
+
+
+def test_uint_base128_many():
+    values = [0, 63, 0x7F, 0x80, 0x3FFF, 0x4000, 2 ** 32 - 1, *random.Random(0).choices(range(2 ** 32), k=1000)]
+    stream = Stream()
+    for value in values:
+        stream.write_uint_base128(value)
+    data = stream.get_value()
+
+    assert encode_uint_base128_many(values) == data
+    assert decode_uint_base128_many(data, 0, len(values)) == (values, len(data))
+    with pytest.raises(ValueError, match='leading zeros'):
+        decode_uint_base128_many(b'\x80\x01', 0, 1)
+    with pytest.raises(ValueError, match='exceeds 2 \\*\\* 32 - 1'):
+        decode_uint_base128_many(b'\x90\x80\x80\x80\x00', 0, 1)
+    with pytest.raises(ValueError, match='exceeds 5 bytes'):
+        decode_uint_base128_many(b'\x81\x80\x80\x80\x80\x00', 0, 1)
+    with pytest.raises(EOFError):
+        decode_uint_base128_many(b'\x81\x80', 0, 1)
+    with pytest.raises(ValueError):
+        encode_uint_base128_many([2 ** 32])
+
+
+def test_stream_many():
+    stream = Stream()
+    assert stream.write_255uint16_many([252, 506, 762]) == 6
+    assert stream.write_uint_base128_many([63, 2 ** 32 - 1]) == 6
+    data = stream.get_value()
+
+    stream.seek(0)
+    assert stream.read_255uint16_many(3) == [252, 506, 762]
+    assert stream.read_uint_base128_many(2) == [63, 2 ** 32 - 1]
+    assert stream.tell() == 12
+
+    stream = BufferStream(data)
+    assert stream.read_255uint16_many(3) == [252, 506, 762]
+    assert stream.read_uint_base128_many(2) == [63, 2 ** 32 - 1]
+    assert stream.tell() == 12
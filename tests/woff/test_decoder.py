@@ -0,0 +1,34 @@
+import pytest
+
+from sfnttools.utils.stream import BufferStream
+from sfnttools.woff.decoder import WoffDecoder
+from sfnttools.woff.encoder import WoffEncoder
+
+
+def test_lazy_tables(font_tables: dict[str, bytes], font_data: bytes):
+    decoder = WoffDecoder(BufferStream(WoffEncoder().encode(font_data)))
+    assert 'glyf' in decoder
+    assert decoder.read_metadata() is None
+    assert decoder.read_private_data() is None
+    assert decoder._tables == {}
+    assert decoder.get_table_data('glyf') == font_tables['glyf']
+    assert list(decoder._tables) == ['glyf']
+    assert decoder.get_table_data('glyf') is decoder.get_table_data('glyf')
+    for tag, data in decoder.iter_tables():
+        if tag != 'head':
+            assert data == font_tables[tag]
+
+
+def test_errors(font_data: bytes):
+    with pytest.raises(ValueError):
+        WoffDecoder(BufferStream(font_data))
+
+    woff_data = bytearray(WoffEncoder().encode(font_data))
+    decoder = WoffDecoder(BufferStream(woff_data))
+    table_entry = decoder.table_entries['glyf']
+    table_entry.orig_length += 1
+    with pytest.raises(ValueError):
+        decoder.get_table_data('glyf')
+    table_entry.comp_length = table_entry.orig_length + 1
+    with pytest.raises(ValueError):
+        decoder.get_table_data('glyf')
@@ -0,0 +1,36 @@
+import pytest
+
+from sfnttools.utils.stream import BufferStream
+from sfnttools.woff.decoder import WoffDecoder, decode_woff
+from sfnttools.woff.encoder import WoffEncoder
+
+
+def test_encode(font_tables: dict[str, bytes], font_data: bytes):
+    woff_data = WoffEncoder(max_workers=2).encode(font_data, metadata=b'<metadata/>' * 10, private_data=b'private')
+    assert WoffEncoder(max_workers=1).encode(font_data, metadata=b'<metadata/>' * 10, private_data=b'private') == woff_data
+    assert len(woff_data) < len(font_data)
+
+    decoder = WoffDecoder(BufferStream(woff_data))
+    assert decoder.header.length == len(woff_data)
+    assert decoder.header.total_sfnt_size == len(font_data)
+    assert (decoder.header.major_version, decoder.header.minor_version) == (1, 0x8000)
+    assert decoder.table_entries['glyf'].comp_length < decoder.table_entries['glyf'].orig_length
+    assert decoder.table_entries['hmtx'].comp_length == decoder.table_entries['hmtx'].orig_length
+    for table_entry in decoder.table_entries.values():
+        assert table_entry.offset % 4 == 0
+        assert table_entry.orig_checksum == int.from_bytes(font_data[12 + 16 * decoder.tags.index(table_entry.tag) + 4:][:4], 'big')
+    assert decoder.read_metadata() == b'<metadata/>' * 10
+    assert decoder.read_private_data() == b'private'
+    assert decode_woff(woff_data) == font_data
+
+
+def test_encode_level(font_data: bytes, tmp_path):
+    assert len(WoffEncoder(level=0).encode(font_data)) > len(WoffEncoder(level=9).encode(font_data))
+    with pytest.raises(ValueError):
+        WoffEncoder(level=10)
+
+    input_file_path = tmp_path.joinpath('font.ttf')
+    input_file_path.write_bytes(font_data)
+    output_file_path = tmp_path.joinpath('font.woff')
+    WoffEncoder().encode_file(input_file_path, output_file_path)
+    assert decode_woff(output_file_path.read_bytes()) == font_data
@@ -0,0 +1,95 @@
+import brotli
+import pytest
+
+from sfnttools.utils.stream import Stream, BufferStream
+from sfnttools.woff2.decoder import Woff2Decoder, decode_woff2
+from sfnttools.woff2.directory import WOFF2_HEADER_SCHEMA, Woff2TableEntry, read_table_entries, write_table_entries
+
+
+def _build_woff2(tables: dict[str, bytes], metadata: bytes | None = None, private_data: bytes | None = None) -> bytes:
+    entries = [Woff2TableEntry(tag, len(data), 3 if tag in ('glyf', 'loca') else 0) for tag, data in tables.items()]
+    directory = Stream()
+    write_table_entries(directory, entries)
+    compressed_data = brotli.compress(b''.join(tables.values()))
+
+    stream = Stream()
+    stream.write(bytes(WOFF2_HEADER_SCHEMA.size))
+    stream.write(directory.get_value())
+    stream.write(compressed_data)
+    meta_offset = 0
+    if metadata is not None:
+        stream.align_to_4_byte_with_nulls()
+        meta_offset = stream.tell()
+        stream.write(brotli.compress(metadata))
+    meta_length = stream.tell() - meta_offset if metadata is not None else 0
+    priv_offset = 0
+    if private_data is not None:
+        stream.align_to_4_byte_with_nulls()
+        priv_offset = stream.tell()
+        stream.write(private_data)
+
+    header = WOFF2_HEADER_SCHEMA.new_record(
+        'wOF2',
+        '\x00\x01\x00\x00',
+        stream.tell(),
+        len(entries),
+        0,
+        0,
+        len(compressed_data),
+        1,
+        0,
+        meta_offset,
+        meta_length,
+        0 if metadata is None else len(metadata),
+        priv_offset,
+        0 if private_data is None else len(private_data),
+    )
+    stream.seek(0)
+    stream.write_record(WOFF2_HEADER_SCHEMA, header)
+    return stream.get_value()
+
+
+def test_decode(font_tables: dict[str, bytes], font_data: bytes):
+    woff2_data = _build_woff2(dict(sorted(font_tables.items())))
+    assert decode_woff2(woff2_data) == font_data
+
+
+def test_iter_tables(font_tables: dict[str, bytes]):
+    decoder = Woff2Decoder(BufferStream(_build_woff2(font_tables)), chunk_size=16)
+    assert [entry.tag for entry in decoder.table_entries] == list(font_tables)
+    assert dict(decoder.iter_tables()) == font_tables
+    assert dict(decoder.iter_tables()) == font_tables
+    assert decoder.read_metadata() is None
+    assert decoder.read_private_data() is None
+
+
+def test_metadata(font_tables: dict[str, bytes]):
+    decoder = Woff2Decoder(Stream(_build_woff2(font_tables, b'<metadata/>', b'private')))
+    assert decoder.read_metadata() == b'<metadata/>'
+    assert decoder.read_private_data() == b'private'
+
+
+def test_errors(font_tables: dict[str, bytes]):
+    woff2_data = _build_woff2(font_tables)
+    with pytest.raises(ValueError):
+        Woff2Decoder(Stream(b'wOFF' + woff2_data[4:]))
+    with pytest.raises(ValueError):
+        Woff2Decoder(Stream(woff2_data[:4] + b'ttcf' + woff2_data[8:]))
+    with pytest.raises(EOFError):
+        decode_woff2(woff2_data[:-20])
+
+
+def test_table_entries():
+    entries = [
+        Woff2TableEntry('glyf', 100, 0, 80),
+        Woff2TableEntry('loca', 12, 0, 0),
+        Woff2TableEntry('hmtx', 20, 1, 8),
+        Woff2TableEntry('head', 54),
+        Woff2TableEntry('TEST', 4),
+    ]
+    stream = Stream()
+    write_table_entries(stream, entries)
+    assert stream.get_value() == bytes.fromhex('0a 64 50 0b 0c 00 43 14 08 01 36 3f 54455354 04')
+    stream.seek(0)
+    assert read_table_entries(stream, len(entries)) == entries
+    assert [entry.data_length for entry in entries] == [80, 0, 8, 54, 4]
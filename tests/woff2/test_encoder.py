@@ -0,0 +1,74 @@
+import pytest
+
+from sfnttools.utils.stream import BufferStream
+from sfnttools.woff2.decoder import Woff2Decoder, decode_woff2
+from sfnttools.woff2.encoder import Woff2Encoder
+from sfnttools.woff2.glyf import transform_glyf_loca
+
+
+def _decode_tables(woff2_data: bytes) -> dict[str, bytes]:
+    return dict(Woff2Decoder(BufferStream(woff2_data)).iter_tables())
+
+
+def test_encode_without_transform(font_tables: dict[str, bytes], font_data: bytes):
+    woff2_data = Woff2Encoder(quality=5, transform_glyf=False).encode(font_data)
+    assert len(woff2_data) < len(font_data)
+    decoder = Woff2Decoder(BufferStream(woff2_data))
+    assert not any(entry.transformed for entry in decoder.table_entries)
+    assert decode_woff2(woff2_data) == font_data
+
+
+def test_encode_with_transform(font_tables: dict[str, bytes], font_data: bytes):
+    woff2_data = Woff2Encoder().encode(font_data, metadata=b'<metadata/>', private_data=b'private')
+    decoder = Woff2Decoder(BufferStream(woff2_data))
+    assert {entry.tag: entry.transform_version for entry in decoder.table_entries if entry.transformed} == {'glyf': 0, 'loca': 0, 'hmtx': 1}
+    assert decoder.header.total_sfnt_size == len(font_data)
+    assert decoder.read_metadata() == b'<metadata/>'
+    assert decoder.read_private_data() == b'private'
+
+    tables = _decode_tables(woff2_data)
+    assert tables.keys() == font_tables.keys()
+    for tag in font_tables:
+        if tag not in ('glyf', 'loca', 'head'):
+            assert tables[tag] == font_tables[tag]
+    assert tables['head'][:8] == font_tables['head'][:8]
+    assert tables['head'][12:16] == font_tables['head'][12:16]
+    assert tables['head'][16:18] == b'\x08\x0b'
+    assert tables['head'][18:] == font_tables['head'][18:]
+    assert transform_glyf_loca(tables['glyf'], tables['loca'], 0, 5) == transform_glyf_loca(font_tables['glyf'], font_tables['loca'], 0, 5)
+    assert len(tables['glyf']) < len(font_tables['glyf'])
+
+    sfnt_data = decode_woff2(Woff2Encoder().encode(font_data))
+    assert decode_woff2(Woff2Encoder().encode(sfnt_data)) == sfnt_data
+
+
+def test_table_order(font_tables: dict[str, bytes], font_data: bytes):
+    decoder = Woff2Decoder(BufferStream(Woff2Encoder(quality=5).encode(font_data)))
+    assert [entry.tag for entry in decoder.table_entries] == ['OS/2', 'cmap', 'glyf', 'loca', 'head', 'hhea', 'hmtx', 'maxp', 'name', 'post']
+
+    decoder = Woff2Decoder(BufferStream(Woff2Encoder(quality=5, transform_glyf=False).encode(font_data)))
+    assert [entry.tag for entry in decoder.table_entries] == sorted(font_tables)
+
+
+def test_encode_many(font_data: bytes, tmp_path):
+    encoder = Woff2Encoder(quality=4, window_bits=16)
+    expected = encoder.encode(font_data)
+    assert encoder.encode_many([font_data, font_data], max_workers=1) == [expected, expected]
+    assert encoder.encode_many([font_data, font_data], max_workers=2) == [expected, expected]
+
+    file_paths = []
+    for i in range(3):
+        input_file_path = tmp_path.joinpath(f'font-{i}.ttf')
+        input_file_path.write_bytes(font_data)
+        file_paths.append((input_file_path, tmp_path.joinpath(f'font-{i}.woff2')))
+    encoder.encode_files(file_paths, max_workers=2)
+    encoder.encode_files([], max_workers=2)
+    for _, output_file_path in file_paths:
+        assert output_file_path.read_bytes() == expected
+
+
+def test_options():
+    with pytest.raises(ValueError):
+        Woff2Encoder(quality=12)
+    with pytest.raises(ValueError):
+        Woff2Encoder(window_bits=25)
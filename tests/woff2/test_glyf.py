@@ -0,0 +1,62 @@
+from sfnttools.tables.glyf import encode_simple_glyph_data
+from sfnttools.utils.stream import Stream
+from sfnttools.woff2.glyf import GLYF_TRANSFORM_HEADER_SCHEMA, reconstruct_glyf_loca
+from sfnttools.woff2.hmtx import reconstruct_hmtx
+
+
+def _build_transformed_glyf(overlap_simple_bitmap: bytes | None = None) -> bytes:
+    n_contour_stream = b'\x00\x00\x00\x01\xff\xff'
+    n_points_stream = b'\x03'
+    flag_stream = bytes([1, 107, 105])
+    glyph_stream = b'\x00\xf3\xbb\xf3\xbb\x02'
+    composite_stream = b'\x00\x02\x00\x01\x0a\x14'
+    bbox_stream = b'\x20\x00\x00\x00\x00\x0a\x00\x14\x03\xf2\x02\xd0'
+    instruction_stream = b'\xb0\x01'
+
+    stream = Stream()
+    stream.write_record(GLYF_TRANSFORM_HEADER_SCHEMA, GLYF_TRANSFORM_HEADER_SCHEMA.new_record(
+        0,
+        0 if overlap_simple_bitmap is None else 1,
+        3,
+        0,
+        len(n_contour_stream),
+        len(n_points_stream),
+        len(flag_stream),
+        len(glyph_stream),
+        len(composite_stream),
+        len(bbox_stream),
+        len(instruction_stream),
+    ))
+    stream.write(n_contour_stream)
+    stream.write(n_points_stream)
+    stream.write(flag_stream)
+    stream.write(glyph_stream)
+    stream.write(composite_stream)
+    stream.write(bbox_stream)
+    stream.write(instruction_stream)
+    if overlap_simple_bitmap is not None:
+        stream.write(overlap_simple_bitmap)
+    return stream.get_value()
+
+
+def test_encode_simple_glyph_data():
+    assert encode_simple_glyph_data([2], b'\xb0\x01', b'\x01\x01\x01', [0, 500, 1000], [0, 700, 0]) == bytes.fromhex('0002 0002 b001 310901 01f401f4 02bcfd44')
+    assert encode_simple_glyph_data([3], b'', b'\x01\x00\x00\x01', [0, 10, 20, 30], [0, 0, 0, 0], overlap_simple=True) == bytes.fromhex('0003 0000 71 3a01 33 0a0a0a')
+    assert encode_simple_glyph_data([299], b'', b'\x00' * 300, [0] * 300, [0] * 300) == bytes.fromhex('012b 0000 38ff 38 2b')
+
+
+def test_reconstruct_glyf_loca():
+    glyf, loca, x_mins = reconstruct_glyf_loca(_build_transformed_glyf())
+    assert glyf == bytes.fromhex('0001 0000 0000 03e8 02bc 0002 0002 b001 310901 01f401f4 02bcfd44 00') + bytes.fromhex('ffff 000a 0014 03f2 02d0 0002 0001 0a14')
+    assert loca == bytes.fromhex('0000 0000 000e 0016')
+    assert list(x_mins) == [0, 0, 10]
+
+    glyf, _, _ = reconstruct_glyf_loca(_build_transformed_glyf(b'\x40'))
+    assert glyf[16] == 0x31 | 0x40
+
+
+def test_reconstruct_hmtx():
+    data = b'\x03\x01\xf4\x00\xfa'
+    assert reconstruct_hmtx(data, 3, 2, [10, 20, 30]) == bytes.fromhex('01f4 000a 00fa 0014 001e')
+    data = b'\x02\x01\xf4\x00\xfa\xff\xf6\x00\x05'
+    assert reconstruct_hmtx(data, 3, 2, [10, 20, 30]) == bytes.fromhex('01f4 fff6 00fa 0005 001e')